@@ -0,0 +1,347 @@
+"""
+Record / replay of real AWS responses for the benchmarks.
+
+record() wraps the real boto3 clients in the shared client registry with
+RecordingClient: every call the handlers make goes to AWS as usual, and the
+request, response (or error) and measured latency are kept in a Recording.
+Recording.save() writes them as one gzipped JSON fixture, with each distinct
+request stored once together with all latencies observed for it.
+
+replay() registers ReplayClients that answer from a fixture with no network:
+
+- a request recorded before gets its recorded response; if some of its
+  calls failed (throttling, 5xx, timeouts), the same share of replayed
+  calls raise the recorded error
+- any other request gets a recorded response of the same shape: same
+  operation, same short parameters (languages, MaxLabels) and the same
+  list lengths, so batch results still line up with their inputs. With
+  strict=True it fails instead.
+- the delay is drawn from all latencies recorded for the operation,
+  multiplied by latency_scale. The draw depends only on the request and
+  how often it has been seen, so a run is repeatable regardless of thread
+  interleaving.
+
+Binary request fields (Image.Bytes) are stored as hashes; binary response
+fields (Polly's AudioStream) are stored base64-encoded.
+
+    python benchmarks/record_aws.py --out benchmarks/fixtures/aws.json.gz
+    python benchmarks/bench_handlers.py --replay benchmarks/fixtures/aws.json.gz --latency-scale 0.5
+"""
+
+import base64
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import sys
+import threading
+import time
+import types
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common.clients import client_registry
+from lambda_common.resilience import LOCAL_METHODS
+
+# Services record() wraps by default
+SERVICES = ("translate", "comprehend", "rekognition", "s3", "polly")
+FORMAT_VERSION = 1
+# Strings up to this length are part of a request's shape (language codes, voice ids, formats)
+SHAPE_MAX_CHARS = 16
+SUMMARY_MAX_CHARS = 120
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _request_value(value):
+    """Request parameters as JSON, with bytes replaced by their hash."""
+    if isinstance(value, dict):
+        return {k: _request_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_request_value(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": _digest(value), "size": len(value)}
+    return value
+
+
+def request_key(params):
+    return _digest(json.dumps(_request_value(params), sort_keys=True, default=str).encode("utf-8"))
+
+
+def request_shape(params):
+    """Parameters that decide the form of a response: short strings and numbers as-is, lists by length."""
+    def shape(value):
+        if isinstance(value, dict):
+            return {k: shape(v) for k, v in sorted(value.items())}
+        if isinstance(value, (list, tuple)):
+            return ["list", len(value)]
+        if isinstance(value, str):
+            return value if len(value) <= SHAPE_MAX_CHARS else "str"
+        if isinstance(value, (bytes, bytearray)):
+            return "bytes"
+        return value
+    return json.dumps(shape(params), sort_keys=True, default=str)
+
+
+def _summary(value):
+    """Readable, size-capped copy of the request for the fixture file."""
+    if isinstance(value, dict):
+        return {k: _summary(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_summary(v) for v in value[:5]] + ([f"... {len(value) - 5} more"] if len(value) > 5 else [])
+    if isinstance(value, str) and len(value) > SUMMARY_MAX_CHARS:
+        return value[:SUMMARY_MAX_CHARS] + f"... ({len(value)} chars)"
+    return value
+
+
+def encode_response(value):
+    """A boto3 response as JSON. Streams are read (see RecordingClient, which hands out a fresh one)."""
+    if isinstance(value, dict):
+        return {k: encode_response(v) for k, v in value.items() if k != "ResponseMetadata"}
+    if isinstance(value, list):
+        return [encode_response(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if hasattr(value, "read"):
+        return {"__stream__": base64.b64encode(value.read()).decode("ascii")}
+    return value
+
+
+def decode_response(value):
+    if isinstance(value, dict):
+        if "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        if "__stream__" in value:
+            return io.BytesIO(base64.b64decode(value["__stream__"]))
+        if "__datetime__" in value:
+            return datetime.datetime.fromisoformat(value["__datetime__"])
+        return {k: decode_response(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_response(v) for v in value]
+    return value
+
+
+def _error_record(error):
+    record = {"type": type(error).__name__, "message": str(error)}
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        record["code"] = response.get("Error", {}).get("Code")
+        record["status"] = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return record
+
+
+def _raise_recorded(error, operation):
+    if error.get("code") is not None:
+        response = {
+            "Error": {"Code": error["code"], "Message": error["message"]},
+            "ResponseMetadata": {"HTTPStatusCode": error.get("status") or 400},
+        }
+        try:
+            from botocore.exceptions import ClientError
+        except ImportError:  # pragma: no cover - depends on the environment
+            exception = type("ClientError", (Exception,), {})(error["message"])
+            exception.response = response
+            raise exception from None
+        raise ClientError(response, operation) from None
+    # Timeouts and connection errors: lambda_common.resilience classifies them by class name
+    raise type(error["type"], (Exception,), {})(error["message"])
+
+
+class Recording:
+    """Recorded calls by "service.operation", then by request key."""
+
+    def __init__(self, operations=None, recorded_at=None):
+        self.operations = operations or {}
+        self.recorded_at = recorded_at
+        self._lock = threading.Lock()
+
+    def add(self, service, operation, params, latency_ms, response=None, error=None):
+        entry_key = request_key(params)
+        with self._lock:
+            entries = self.operations.setdefault(f"{service}.{operation}", {})
+            entry = entries.get(entry_key)
+            if entry is None:
+                entry = entries[entry_key] = {"request": _summary(_request_value(params)), "shape": request_shape(params), "latenciesMs": []}
+            entry["latenciesMs"].append(round(latency_ms, 2))
+            if error is not None:
+                # The latest error, and how many of the calls failed
+                entry["error"] = error
+                entry["errors"] = entry.get("errors", 0) + 1
+            else:
+                entry["response"] = response
+
+    def save(self, path):
+        data = {
+            "version": FORMAT_VERSION,
+            "recordedAt": self.recorded_at or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "operations": self.operations,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported fixture version {data.get('version')}")
+        return cls(data["operations"], data.get("recordedAt"))
+
+    def summary(self):
+        """{operation: (distinct requests, calls recorded)}"""
+        return {
+            operation: (len(entries), sum(len(e["latenciesMs"]) for e in entries.values()))
+            for operation, entries in sorted(self.operations.items())
+        }
+
+
+class RecordingClient:
+    """Passes calls through to a real client and records them."""
+
+    def __init__(self, client, service, recording):
+        self._client = client
+        self._service = service
+        self._recording = recording
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name in LOCAL_METHODS or not callable(attr):
+            return attr
+
+        def call(**params):
+            started = time.perf_counter()
+            try:
+                response = attr(**params)
+            except Exception as e:
+                self._recording.add(self._service, name, params, (time.perf_counter() - started) * 1000, error=_error_record(e))
+                raise
+            latency_ms = (time.perf_counter() - started) * 1000
+            encoded = encode_response(response)
+            self._recording.add(self._service, name, params, latency_ms, response=encoded)
+            # Streams were read for the fixture, so the caller gets a fresh copy
+            return decode_response(encoded) if any(hasattr(v, "read") for v in response.values()) else response
+
+        return call
+
+
+class ReplayClient:
+    """Answers calls from a Recording with the recorded latency distribution."""
+
+    def __init__(self, service, recording, latency_scale=1.0, strict=False, seed=0):
+        self.service = service
+        self.recording = recording
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.seed = seed
+        self.hits = 0
+        self.misses = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def _pool(self, operation):
+        """
+        (sorted latencies, one error record per failed call, successful
+        entries by shape, all entries by key) for an operation.
+        """
+        pool = self._pools.get(operation)
+        if pool is None:
+            entries = self.recording.operations.get(f"{self.service}.{operation}", {})
+            latencies = sorted(ms for entry in entries.values() for ms in entry["latenciesMs"])
+            errors = [entry["error"] for entry in entries.values() if "error" in entry for _ in range(entry["errors"])]
+            shapes = {}
+            for key in sorted(entries):
+                if "response" in entries[key]:
+                    shapes.setdefault(entries[key]["shape"], []).append(entries[key])
+            pool = self._pools[operation] = (latencies, errors, shapes, entries)
+        return pool
+
+    def _draw(self, key):
+        """Deterministic number for the nth call with this request key."""
+        with self._lock:
+            count = self._seen[key] = self._seen.get(key, 0) + 1
+        return int(_digest(f"{self.seed}:{key}:{count}".encode("ascii")), 16)
+
+    def _answer(self, operation, params):
+        latencies, errors, shapes, entries = self._pool(operation)
+        key = request_key(params)
+        draw = self._draw(key)
+        entry = entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            # A request that failed some of the time when recorded fails as often here
+            failed = entry.get("errors", 0)
+            if failed and ((draw >> 16) % len(entry["latenciesMs"]) < failed or "response" not in entry):
+                error = entry["error"]
+            else:
+                error = None
+        else:
+            self.misses += 1
+            candidates = shapes.get(request_shape(params)) or [e for same in shapes.values() for e in same]
+            if self.strict or not candidates:
+                raise LookupError(f"No recording for {self.service}.{operation} {_summary(_request_value(params))}")
+            entry = candidates[int(key, 16) % len(candidates)]
+            # Unrecorded requests fail at the operation's recorded error rate
+            index = (draw >> 16) % len(latencies)
+            error = errors[index] if index < len(errors) else None
+        if latencies and self.latency_scale:
+            time.sleep(latencies[draw % len(latencies)] * self.latency_scale / 1000.0)
+        if error is not None:
+            _raise_recorded(error, operation)
+        return decode_response(entry["response"])
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda **params: self._answer(name, params)
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600, **kwargs):
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+
+def record(services=SERVICES):
+    """Wrap real clients for `services` in the registry with RecordingClient. Returns the Recording."""
+    recording = Recording()
+    for service in services:
+        client_registry.register(service, RecordingClient(client_registry.create(service), service, recording))
+    return recording
+
+
+def replay(path, latency_scale=1.0, strict=False, seed=0):
+    """
+    Register ReplayClients for every service in the fixture at `path` and
+    patch boto3.client. Services the fixture has no calls for keep whatever
+    client was there before (e.g. the _stub_aws fakes). Returns the
+    ReplayClients by service.
+    """
+    recording = Recording.load(path)
+    services = sorted({operation.split(".", 1)[0] for operation in recording.operations})
+    clients = {service: ReplayClient(service, recording, latency_scale, strict, seed) for service in services}
+    for service, client in clients.items():
+        client_registry.register(service, client)
+
+    boto3 = sys.modules.get("boto3")
+    if boto3 is None:
+        try:
+            import boto3
+        except ImportError:
+            boto3 = types.ModuleType("boto3")
+            sys.modules["boto3"] = boto3
+    previous = getattr(boto3, "client", None)
+
+    def replay_client(service, *args, **kwargs):
+        if service in clients or previous is None:
+            return clients.setdefault(service, ReplayClient(service, recording, latency_scale, strict, seed))
+        return previous(service, *args, **kwargs)
+
+    boto3.client = replay_client
+    return clients
+
+
+def set_latency_scale(clients, latency_scale):
+    for client in clients.values():
+        client.latency_scale = latency_scale
@@ -0,0 +1,135 @@
+"""
+Stubbed AWS backends for the benchmarks.
+
+FakeAWSClient answers every call the handlers make with a canned response
+after a configurable delay, so downstream latency can be dialled up or down
+without a network. install() registers the fakes in the shared client
+registry and patches boto3.client for the standalone handler files.
+"""
+
+import io
+import sys
+import time
+import types
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common.clients import client_registry
+
+SERVICES = ("translate", "comprehend", "rekognition", "s3", "polly", "sqs")
+
+
+class _Stream(io.BytesIO):
+    pass
+
+
+class FakeAWSClient:
+    def __init__(self, service, latency_ms=0.0):
+        self.service = service
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+    # Translate
+    def translate_text(self, Text, SourceLanguageCode, TargetLanguageCode, **kwargs):
+        self._wait()
+        return {
+            "TranslatedText": f"[{TargetLanguageCode}] {Text}",
+            "SourceLanguageCode": "en" if SourceLanguageCode == "auto" else SourceLanguageCode,
+            "TargetLanguageCode": TargetLanguageCode,
+        }
+
+    # Comprehend
+    def detect_sentiment(self, Text, LanguageCode, **kwargs):
+        self._wait()
+        return {"Sentiment": "POSITIVE", "SentimentScore": {"Positive": 0.9, "Negative": 0.02, "Neutral": 0.07, "Mixed": 0.01}}
+
+    def detect_dominant_language(self, Text, **kwargs):
+        self._wait()
+        return {"Languages": [{"LanguageCode": "en", "Score": 0.99}]}
+
+    def batch_detect_sentiment(self, TextList, LanguageCode, **kwargs):
+        self._wait()
+        score = {"Positive": 0.9, "Negative": 0.02, "Neutral": 0.07, "Mixed": 0.01}
+        return {
+            "ResultList": [{"Index": i, "Sentiment": "POSITIVE", "SentimentScore": score} for i, _ in enumerate(TextList)],
+            "ErrorList": [],
+        }
+
+    def batch_detect_dominant_language(self, TextList, **kwargs):
+        self._wait()
+        return {
+            "ResultList": [{"Index": i, "Languages": [{"LanguageCode": "en", "Score": 0.99}]} for i, _ in enumerate(TextList)],
+            "ErrorList": [],
+        }
+
+    # Rekognition
+    def detect_labels(self, Image, MaxLabels=10, MinConfidence=70, **kwargs):
+        self._wait()
+        return {"Labels": [{"Name": f"Label {i}", "Confidence": 99.0 - i} for i in range(MaxLabels)]}
+
+    def detect_text(self, Image, **kwargs):
+        self._wait()
+        return {"TextDetections": [{"DetectedText": "TODO", "Type": "LINE", "Confidence": 98.5}]}
+
+    def detect_moderation_labels(self, Image, **kwargs):
+        self._wait()
+        return {"ModerationLabels": []}
+
+    # S3
+    def head_object(self, Bucket, Key, **kwargs):
+        self._wait()
+        return {"ETag": f'"{abs(hash((Bucket, Key))):x}"', "ContentLength": 1024}
+
+    def put_object(self, **kwargs):
+        self._wait()
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600, **kwargs):
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+    # Polly
+    def synthesize_speech(self, Text, **kwargs):
+        self._wait()
+        return {"AudioStream": _Stream(Text.encode("utf-8")), "ContentType": "audio/mpeg"}
+
+
+class FakeContext:
+    aws_request_id = "bench-request"
+    function_name = "bench"
+
+    def __init__(self, timeout_ms=30000):
+        self._deadline = time.monotonic() + timeout_ms / 1000.0
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def install(latency_ms=0.0):
+    """Register fake clients for every service and patch boto3.client. Returns the fakes by service."""
+    fakes = {service: FakeAWSClient(service, latency_ms) for service in SERVICES}
+    for service, client in fakes.items():
+        client_registry.register(service, client)
+
+    def fake_client(service, *args, **kwargs):
+        return fakes.setdefault(service, FakeAWSClient(service, latency_ms))
+
+    boto3 = sys.modules.get("boto3")
+    if boto3 is None:
+        try:
+            import boto3
+        except ImportError:
+            # The standalone handlers import boto3 at module load; the benchmark
+            # only needs boto3.client, which is faked below anyway
+            boto3 = types.ModuleType("boto3")
+            sys.modules["boto3"] = boto3
+    boto3.client = fake_client
+    return fakes
+
+
+def set_latency(fakes, latency_ms):
+    for client in fakes.values():
+        client.latency_ms = latency_ms
@@ -0,0 +1,115 @@
+"""
+CPU versus bytes for response compression (lambda_common.compression).
+
+Builds response bodies shaped like the large API responses (a page of image
+job results, a translation batch, a pipeline result, a single label list)
+and, for each gzip level and brotli quality, measures:
+
+- compress + base64 time in the Lambda (what compress_response adds)
+- bytes on the wire and the compression ratio
+- time saved sending the body to a client at --mbps, minus the CPU spent
+
+Brotli rows need the brotli package (pip install brotli); without it only
+gzip is measured, as in a deployment without brotli.
+
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --mbps 1.5 --gzip-levels 1 6 9
+"""
+
+import argparse
+import binascii
+import json
+import random
+import sys
+import time
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common import compression
+from lambda_common.responses import dumps
+
+WORDS = (
+    "report team meeting invoice deadline client review draft budget update schedule design "
+    "release customer feedback contract launch office travel plan sprint backlog estimate"
+).split()
+LABELS = ("Person", "Document", "Text", "Paper", "Laptop", "Computer", "Table", "Furniture", "Indoors", "Office")
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def bodies():
+    rng = random.Random(7)
+    labels = lambda count: [{"Name": rng.choice(LABELS), "Confidence": f"{rng.uniform(70, 99.9):.2f}%"} for _ in range(count)]
+    return {
+        "labels (5)": dumps({"labels": labels(5)}),
+        "job page (100)": dumps({
+            "jobId": "f3b1c2d4e5", "status": "RUNNING", "cursor": "100",
+            "results": [{"bucket": "tasks", "key": f"uploads/2024/img-{i:05d}.jpg", "labels": labels(10)} for i in range(100)],
+        }),
+        "translate (25)": dumps({"results": [
+            {"translatedText": sentence(rng, 30), "targetLanguage": "es"} for _ in range(25)
+        ]}),
+        "pipeline": dumps({
+            "language": {"languageCode": "en", "score": 0.99}, "translatedText": sentence(rng, 400),
+            "sentiment": "NEUTRAL", "sentimentScore": {"Positive": 0.1, "Negative": 0.05, "Neutral": 0.8, "Mixed": 0.05},
+            "timingsMs": {"detect-language": 0.4, "translate": 212.0, "sentiment": 98.1}, "errors": {},
+        }),
+    }
+
+
+def median_ms(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 4, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 6, 11])
+    parser.add_argument("--mbps", type=float, default=5.0, help="client downlink used to value saved bytes")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    settings = [("gzip", level) for level in args.gzip_levels]
+    if compression.brotli() is not None:
+        settings += [("br", quality) for quality in args.brotli_qualities]
+
+    results = []
+    for name, body in bodies().items():
+        data = body.encode("utf-8")
+        for encoding, level in settings:
+            def run():
+                compressed = compression.compress(data, encoding, gzip_level=level, brotli_quality=level)
+                binascii.b2a_base64(compressed, newline=False)
+                return compressed
+            cpu_ms, compressed = median_ms(run, args.repeat)
+            saved_ms = (len(data) - len(compressed)) * 8 / (args.mbps * 1000) - cpu_ms
+            results.append({
+                "body": name, "bytes": len(data), "encoding": f"{encoding}-{level}", "cpuMs": round(cpu_ms, 3),
+                "wireBytes": len(compressed), "ratio": round(len(data) / len(compressed), 2), "netSavedMs": round(saved_ms, 2),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"client downlink {args.mbps} Mbps; brotli {'available' if compression.brotli() else 'not installed'}\n")
+    print(f"{'body':<16} {'bytes':>8} {'encoding':>9} {'cpu ms':>8} {'wire':>8} {'ratio':>6} {'net saved ms':>13}")
+    for r in results:
+        print(f"{r['body']:<16} {r['bytes']:>8} {r['encoding']:>9} {r['cpuMs']:>8.3f} {r['wireBytes']:>8}"
+              f" {r['ratio']:>6.1f} {r['netSavedMs']:>13.2f}")
+    print("\nnet saved ms = transfer time of the saved bytes at --mbps - compress and base64 time")
+    print(f"bodies under COMPRESSION_MIN_BYTES (currently {compression.settings()[1]}) are sent uncompressed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
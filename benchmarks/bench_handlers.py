@@ -0,0 +1,301 @@
+"""
+In-process benchmark suite for the Lambda handlers.
+
+Calls fixed-lambda.lambda_handler and the standalone handlers directly with
+boto3 stubbed (see _stub_aws.py), so it runs offline. For every route it
+measures:
+
+- cold import time of the handler module (median of fresh interpreters)
+- warm per-invocation overhead (median; stubbed services answer instantly)
+- p50 / p95 / p99 latency and throughput with the configured service latency
+
+Results are written as JSON; with --check the run fails when a route
+regresses past the stored baselines (see check_baselines), or has no
+baseline at all. Commits that add a route or change cold-start cost
+refresh benchmarks/baselines.json with --update-baselines.
+
+With --replay FIXTURE the services in a fixture recorded by record_aws.py
+answer with their recorded responses, errors and latency distribution
+(scaled by --latency-scale) instead of the fixed --latency-ms; see
+_replay_aws.py. Replay runs are not comparable with the baselines.
+
+    python benchmarks/bench_handlers.py                     # run and write report
+    python benchmarks/bench_handlers.py --check             # also compare with baselines
+    python benchmarks/bench_handlers.py --update-baselines  # store this run as the baseline
+    python benchmarks/bench_handlers.py --replay benchmarks/fixtures/aws.json.gz --latency-scale 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Measure handler work, not cache hits or sampled payload logging
+os.environ.setdefault("AI_CACHE_ENABLED", "false")
+os.environ.setdefault("IMAGE_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_PAYLOAD_SAMPLE_RATE", "0")
+os.environ.setdefault("POLLY_BUCKET", "bench-audio")
+os.environ.setdefault("JOBS_DB_PATH", ":memory:")
+
+import _util
+import _replay_aws
+import _stub_aws
+from lambda_common.metrics import metrics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINES = os.path.join(BENCH_DIR, "baselines.json")
+DEFAULT_REPORT = os.path.join(BENCH_DIR, "report.json")
+
+TEXT = "Finish the quarterly report and send it to the project team before Friday's meeting."
+# 32x24 JPEG, already within the inline size limits so it is passed through
+SMALL_JPEG = (
+    "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYn"
+    "KSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgo"
+    "KCgoKCgoKCj/wAARCAAYACADASIAAhEBAxEB/8QAHwAAAQUBAQEBAQEAAAAAAAAAAAECAwQFBgcICQoL/8QAtRAAAgEDAwIEAwUF"
+    "BAQAAAF9AQIDAAQRBRIhMUEGE1FhByJxFDKBkaEII0KxwRVS0fAkM2JyggkKFhcYGRolJicoKSo0NTY3ODk6Q0RFRkdISUpTVFVW"
+    "V1hZWmNkZWZnaGlqc3R1dnd4eXqDhIWGh4iJipKTlJWWl5iZmqKjpKWmp6ipqrKztLW2t7i5usLDxMXGx8jJytLT1NXW19jZ2uHi"
+    "4+Tl5ufo6erx8vP09fb3+Pn6/8QAHwEAAwEBAQEBAQEBAQAAAAAAAAECAwQFBgcICQoL/8QAtREAAgECBAQDBAcFBAQAAQJ3AAEC"
+    "AxEEBSExBhJBUQdhcRMiMoEIFEKRobHBCSMzUvAVYnLRChYkNOEl8RcYGRomJygpKjU2Nzg5OkNERUZHSElKU1RVVldYWVpjZGVm"
+    "Z2hpanN0dXZ3eHl6goOEhYaHiImKkpOUlZaXmJmaoqOkpaanqKmqsrO0tba3uLm6wsPExcbHyMnK0tPU1dbX2Nna4uPk5ebn6Onq"
+    "8vP09fb3+Pn6/9oADAMBAAIRAxEAPwDAooor70+JCiiigAooooAKKKKAP//Z"
+)
+
+# (name, handler file, entry point, event builder)
+ROUTES = [
+    ("fixed/analyze", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/analyze", {"text": f"{TEXT} #{i}"})),
+    ("fixed/translate", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/translate", {"text": f"{TEXT} #{i}", "targetLanguage": "es"})),
+    ("fixed/translate-get", "fixed-lambda.py", "lambda_handler", lambda i: get("/ai/translate", {"text": f"{TEXT} #{i}", "targetLanguage": "es"})),
+    # If-None-Match: * matches whatever tag the response gets, so every request is answered with 304
+    ("fixed/translate-304", "fixed-lambda.py", "lambda_handler", lambda i: get("/ai/translate", {"text": TEXT, "targetLanguage": "es"}, {"If-None-Match": "*"})),
+    ("fixed/detect-language", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/detect-language", {"text": f"{TEXT} #{i}"})),
+    ("fixed/image-analyze", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/image-analyze", {"bucket": "tasks", "key": f"img-{i}.jpg"})),
+    ("fixed/image-analyze-all", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/image-analyze", {"bucket": "tasks", "key": f"img-{i}.jpg", "features": ["labels", "text", "moderation"]})),
+    ("fixed/image-analyze-inline", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/image-analyze", {"image": SMALL_JPEG, "features": ["labels", "text"]})),
+    ("fixed/polly", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/polly", {"text": f"{TEXT} #{i}"})),
+    ("fixed/translate-multi", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/translate", {"text": f"{TEXT} #{i}", "targetLanguages": ["es", "fr", "de", "en"]})),
+    ("fixed/translate-batch", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/translate/batch", {"texts": [f"{TEXT} #{i}-{j}" for j in range(20)]})),
+    ("fixed/analyze-batch", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/analyze/batch", {"texts": [f"{TEXT} #{i}-{j}" for j in range(50)]})),
+    ("fixed/pipeline", "fixed-lambda.py", "lambda_handler", lambda i: post("/ai/pipeline", {"text": f"{TEXT} #{i}", "targetLanguage": "es"})),
+    ("fixed/preflight", "fixed-lambda.py", "lambda_handler", lambda i: {"httpMethod": "OPTIONS", "path": "/ai/translate"}),
+    ("translate-fixed", "lambda-translate-fixed.py", "lambda_handler", lambda i: post("/ai/translate", {"text": f"{TEXT} #{i}"})),
+    ("image-analyze", "lambda-image-analyze.py", "lambda_handler", lambda i: post("/ai/image-analyze", {"bucket": "tasks", "key": f"img-{i}.jpg"})),
+    ("cors-fix", "lambda-cors-fix.py", "lambda_handler", lambda i: post("/ai/image-analyze", {"bucket": "tasks", "key": f"img-{i}.jpg"})),
+]
+
+
+def post(path, body):
+    return {"httpMethod": "POST", "path": path, "resource": path, "body": json.dumps(body)}
+
+
+def get(path, query, headers=None):
+    return {"httpMethod": "GET", "path": path, "resource": path, "queryStringParameters": query, "headers": headers or {}}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+# Runs in a fresh interpreter so nothing from this process is already imported.
+# Real boto3 is used when installed (its import is part of a real cold start);
+# otherwise a placeholder module is inserted so the handler can load at all.
+IMPORT_PROBE = """
+import importlib.util, os, sys, time, types
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, {repo_root!r})
+if importlib.util.find_spec("boto3") is None:
+    sys.modules["boto3"] = types.ModuleType("boto3")
+    sys.modules["boto3"].client = lambda *args, **kwargs: None
+spec = importlib.util.spec_from_file_location("handler", {path!r})
+start = time.perf_counter()
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure_import(filename, samples):
+    """Median import time (ms) of a handler file in fresh interpreters."""
+    code = IMPORT_PROBE.format(repo_root=_util.REPO_ROOT, path=os.path.join(_util.REPO_ROOT, filename))
+    timings = []
+    for _ in range(samples):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    timings.sort()
+    return round(timings[len(timings) // 2], 3)
+
+
+def run_route(handler, make_event, iterations, warmup):
+    for i in range(warmup):
+        handler(make_event(-1 - i), _stub_aws.FakeContext())
+
+    timings = []
+    statuses = {}
+    started = time.perf_counter()
+    for i in range(iterations):
+        event = make_event(i)
+        t0 = time.perf_counter()
+        response = handler(event, _stub_aws.FakeContext())
+        timings.append((time.perf_counter() - t0) * 1000)
+        statuses[response["statusCode"]] = statuses.get(response["statusCode"], 0) + 1
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return timings, elapsed, statuses
+
+
+def set_latency(fakes, replayed, args, enabled):
+    """Service latency off (for the overhead run) or as configured."""
+    _stub_aws.set_latency(fakes, args.latency_ms if enabled else 0)
+    _replay_aws.set_latency_scale(replayed, args.latency_scale if enabled else 0)
+
+
+def run(args):
+    fakes = _stub_aws.install(latency_ms=0)
+    replayed = _replay_aws.replay(args.replay, args.latency_scale) if args.replay else {}
+    # Keep EMF metrics on (their cost is part of the handler) but drop the lines
+    metrics.sink = lambda line: None
+    modules = {}
+    import_ms = {}
+
+    report = {
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "serviceLatencyMs": f"replay {os.path.basename(args.replay)} x{args.latency_scale}" if args.replay else args.latency_ms,
+        "iterations": args.iterations,
+        "routes": {},
+    }
+
+    for name, filename, entry, make_event in ROUTES:
+        if args.routes and not any(r in name for r in args.routes):
+            continue
+        if filename not in modules:
+            modules[filename] = _util.load_handler_module(filename)
+            import_ms[filename] = measure_import(filename, args.import_samples) if args.import_samples else None
+        handler = getattr(modules[filename], entry)
+
+        set_latency(fakes, replayed, args, False)
+        overhead, _, _ = run_route(handler, make_event, args.iterations, args.warmup)
+
+        set_latency(fakes, replayed, args, True)
+        timings, elapsed, statuses = run_route(handler, make_event, args.iterations, args.warmup)
+
+        report["routes"][name] = {
+            "coldImportMs": import_ms[filename],
+            "warmOverheadMs": round(overhead[len(overhead) // 2], 4),
+            "p50Ms": round(percentile(timings, 50), 4),
+            "p95Ms": round(percentile(timings, 95), 4),
+            "p99Ms": round(percentile(timings, 99), 4),
+            "throughputRps": round(len(timings) / elapsed, 1),
+            "statusCodes": {str(k): v for k, v in sorted(statuses.items())},
+        }
+    if replayed:
+        report["replay"] = {service: {"hits": c.hits, "misses": c.misses} for service, c in replayed.items()}
+    return report
+
+
+def print_report(report):
+    latency = report["serviceLatencyMs"]
+    latency = f"{latency} ms" if isinstance(latency, (int, float)) else latency
+    print(f"service latency {latency}, {report['iterations']} iterations per route\n")
+    print(f"{'route':<28} {'import ms':>10} {'overhead ms':>12} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8}  status")
+    for name, r in report["routes"].items():
+        cold = "-" if r["coldImportMs"] is None else f"{r['coldImportMs']:.1f}"
+        print(
+            f"{name:<28} {cold:>10} {r['warmOverheadMs']:>12.3f} {r['p50Ms']:>8.2f} {r['p95Ms']:>8.2f}"
+            f" {r['p99Ms']:>8.2f} {r['throughputRps']:>8.1f}  {r['statusCodes']}"
+        )
+    if "replay" in report:
+        print("\nreplayed calls (hit = request recorded as-is, miss = answered by a recording of the same shape):")
+        for service, counts in report["replay"].items():
+            print(f"  {service:<12} {counts['hits']:>7} hits {counts['misses']:>7} misses")
+
+
+CHECKED_METRICS = ("coldImportMs", "warmOverheadMs", "p95Ms")
+# Fractions of a millisecond: any absolute slack would be larger than the metric itself
+RELATIVE_METRICS = ("warmOverheadMs",)
+
+
+def check_baselines(report, baselines, tolerance, slack_ms, overhead_tolerance):
+    """
+    List of regression messages. A millisecond-scale metric regresses when it
+    exceeds baseline * (1 + tolerance) + slack_ms; the warm overhead when it
+    exceeds baseline * (1 + overhead_tolerance), with no absolute slack.
+    """
+    regressions = []
+    if baselines.get("serviceLatencyMs") != report["serviceLatencyMs"]:
+        regressions.append(
+            f"baseline was recorded with {baselines.get('serviceLatencyMs')} ms service latency, "
+            f"this run used {report['serviceLatencyMs']} ms"
+        )
+        return regressions
+    for name, result in report["routes"].items():
+        baseline = baselines.get("routes", {}).get(name)
+        if baseline is None:
+            regressions.append(f"{name}: no baseline; run with --update-baselines")
+            continue
+        for metric in CHECKED_METRICS:
+            current, expected = result.get(metric), baseline.get(metric)
+            if current is None or expected is None:
+                continue
+            if metric in RELATIVE_METRICS:
+                limit = expected * (1 + overhead_tolerance)
+            else:
+                limit = expected * (1 + tolerance) + slack_ms
+            if current > limit:
+                regressions.append(f"{name} {metric}: {current:.3f} ms > {limit:.3f} ms (baseline {expected:.3f} ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated AWS service latency per call")
+    parser.add_argument("--replay", metavar="FIXTURE", help="answer from a record_aws.py fixture instead of fixed-latency fakes")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for replayed latencies")
+    parser.add_argument("--import-samples", type=int, default=5, help="fresh interpreters per cold-import measurement (0 to skip)")
+    parser.add_argument("--routes", nargs="*", help="only run routes whose name contains one of these strings")
+    parser.add_argument("--output", default=DEFAULT_REPORT)
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--check", action="store_true", help="fail if any route regresses past the baselines")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression of cold import and p95 (0.5 = +50%%)")
+    parser.add_argument("--slack-ms", type=float, default=1.0, help="absolute slack added to the cold import and p95 limits")
+    parser.add_argument("--overhead-tolerance", type=float, default=1.0,
+                        help="allowed relative regression of the sub-millisecond warm overhead, with no slack (1.0 = 2x)")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nreport written to {args.output}")
+
+    if args.update_baselines:
+        with open(args.baselines, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baselines updated: {args.baselines}")
+        return 0
+
+    if args.check:
+        if not os.path.exists(args.baselines):
+            print(f"no baselines at {args.baselines}; run with --update-baselines first")
+            return 1
+        with open(args.baselines) as f:
+            regressions = check_baselines(report, json.load(f), args.tolerance, args.slack_ms, args.overhead_tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("no regressions against baselines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Cost / benefit benchmark for inline image uploads (lambda_common.imaging).
+
+Generates photo-like JPEGs at typical phone resolutions, then measures for
+each source and IMAGE_MAX_DIMENSION setting:
+
+- base64 decode time (what /ai/image-analyze does with { image })
+- prepare_image time (draft decode, downscale, JPEG re-encode)
+- bytes sent to Rekognition before and after
+
+and sets the processing cost against what it saves: the S3 upload hop the
+client no longer makes (--s3-put-ms) plus the Rekognition time for the
+smaller payload. Offline, Rekognition time is modelled as
+--rekognition-base-ms + --rekognition-ms-per-mb per MB sent; with --live the
+real detect_labels latency is measured for both payloads (AWS credentials
+needed).
+
+Needs Pillow (pip install pillow); without it the handler passes images
+through unchanged and there is nothing to measure.
+
+    python benchmarks/bench_imaging.py
+    python benchmarks/bench_imaging.py --dimensions 1024 1600 2048 --live
+"""
+
+import argparse
+import base64
+import binascii
+import io
+import os
+import sys
+import time
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common import imaging
+
+# (name, width, height)
+SOURCES = [
+    ("12MP phone", 4032, 3024),
+    ("8MP phone", 3264, 2448),
+    ("2MP", 1600, 1200),
+]
+
+
+def photo(width, height, quality=92):
+    """JPEG bytes with smooth structure plus sensor-like noise, so it compresses like a photo."""
+    Image, _ = imaging.pillow()
+    seed = Image.frombytes("RGB", (48, 36), os.urandom(48 * 36 * 3))
+    base = seed.resize((width, height), Image.BICUBIC)
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    image = Image.blend(base, noise, 0.12)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+def median_ms(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def rekognition_ms(data, args, client=None):
+    if client is None:
+        return args.rekognition_base_ms + args.rekognition_ms_per_mb * len(data) / 1e6
+    timings = []
+    for _ in range(args.live_repeat):
+        started = time.perf_counter()
+        client.detect_labels(Image={"Bytes": data}, MaxLabels=5, MinConfidence=70)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1024, 1600, 2048])
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--s3-put-ms", type=float, default=150.0, help="client-side S3 upload hop saved per request")
+    parser.add_argument("--rekognition-base-ms", type=float, default=250.0, help="modelled detect_labels latency at 0 bytes")
+    parser.add_argument("--rekognition-ms-per-mb", type=float, default=120.0, help="modelled extra latency per MB sent")
+    parser.add_argument("--live", action="store_true", help="measure Rekognition for real")
+    parser.add_argument("--live-repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if imaging.pillow() is None:
+        print("Pillow is not installed (pip install pillow); images would be passed through unchanged")
+        return 1
+
+    client = None
+    if args.live:
+        from lambda_common.clients import client_registry
+        client = client_registry.get("rekognition")
+
+    model = "live Rekognition" if client else (
+        f"modelled Rekognition {args.rekognition_base_ms:.0f} ms + {args.rekognition_ms_per_mb:.0f} ms/MB"
+    )
+    print(f"{model}; S3 hop {args.s3_put_ms:.0f} ms; max bytes {args.max_bytes}\n")
+    print(f"{'source':<12} {'in KB':>7} {'max px':>7} {'decode':>8} {'prepare':>8} {'out KB':>7} {'out px':>11}"
+          f" {'rekog in':>9} {'rekog out':>10} {'saved ms':>9}")
+
+    for name, width, height in SOURCES:
+        data = photo(width, height)
+        encoded = base64.b64encode(data).decode("ascii")
+        decode_ms, _ = median_ms(lambda: binascii.a2b_base64(encoded), args.repeat)
+        original_ms = rekognition_ms(data, args, client)
+        for dimension in args.dimensions:
+            prepare_ms, (prepared, info) = median_ms(
+                lambda: imaging.prepare_image(data, max_dimension=dimension, max_bytes=args.max_bytes), args.repeat
+            )
+            prepared_ms = rekognition_ms(prepared, args, client)
+            saved = args.s3_put_ms + original_ms - prepared_ms - decode_ms - prepare_ms
+            size = f"{info.get('width')}x{info.get('height')}"
+            print(
+                f"{name:<12} {len(data) / 1024:>7.0f} {dimension:>7} {decode_ms:>8.2f} {prepare_ms:>8.2f}"
+                f" {len(prepared) / 1024:>7.0f} {size:>11} {original_ms:>9.0f} {prepared_ms:>10.0f} {saved:>9.0f}"
+            )
+
+    print("\nsaved ms = S3 hop + Rekognition(original) - Rekognition(prepared) - decode - prepare")
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Cold-start benchmark for the Lambda entry points.
+
+Every sample runs in a fresh interpreter, like a new Lambda container. Two
+probes are run per entry point:
+
+- import: loading the handler file with the real boto3 (if installed),
+  dummy credentials and no network. Also reports whether boto3 / botocore
+  were loaded and how many modules the import pulled in.
+- first request: import plus one request with the AWS clients stubbed
+  (_stub_aws.py) and a placeholder boto3, so the handler modules a route
+  loads on first use are counted but boto3 and client creation are left
+  out on both sides.
+
+--compare REV runs the same probes against the tree at a git revision
+(extracted with git archive into a temporary directory) and prints both.
+
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py --compare HEAD~1 --samples 9
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import _util
+
+TEXT = "Finish the quarterly report and send it to the project team before Friday's meeting."
+IMAGE = {"bucket": "tasks", "key": "img-1.jpg"}
+
+# (handler file, entry point, request path, request body)
+ENTRY_POINTS = [
+    ("fixed-lambda.py", "lambda_handler", "/ai/translate", {"text": TEXT, "targetLanguage": "es"}),
+    ("fixed-lambda.py", "lambda_handler", "/ai/detect-language", {"text": TEXT}),
+    ("fixed-lambda.py", "lambda_handler", "/ai/image-analyze", IMAGE),
+    ("lambda-cors-fix.py", "lambda_handler", "/ai/image-analyze", IMAGE),
+    ("lambda-image-analyze.py", "lambda_handler", "/ai/image-analyze", IMAGE),
+    ("lambda-translate-fixed.py", "lambda_handler", "/ai/translate", {"text": TEXT}),
+    ("lambda-fix-example.py", "lambda_handler", "/ai/analyze", {"text": TEXT}),
+]
+
+PROBE_SETUP = """
+import importlib.util, json, os, sys, time
+os.environ.update(AWS_DEFAULT_REGION="us-east-1", AWS_ACCESS_KEY_ID="bench", AWS_SECRET_ACCESS_KEY="bench",
+                  AWS_EC2_METADATA_DISABLED="true", METRICS_ENABLED="false", AI_CACHE_ENABLED="false",
+                  IMAGE_CACHE_ENABLED="false", LOG_PAYLOAD_SAMPLE_RATE="0", POLLY_BUCKET="bench-audio")
+sys.path.insert(0, {repo_root!r})
+spec = importlib.util.spec_from_file_location("handler", {path!r})
+"""
+
+IMPORT_PROBE = PROBE_SETUP + """
+before = len(sys.modules)
+start = time.perf_counter()
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "boto3": "boto3" in sys.modules, "botocore": "botocore" in sys.modules,
+                  "modules": len(sys.modules) - before}}))
+"""
+
+FIRST_REQUEST_PROBE = PROBE_SETUP + """
+import logging, types
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, os.path.join({repo_root!r}, "benchmarks"))
+sys.modules["boto3"] = types.ModuleType("boto3")
+event = {{"httpMethod": "POST", "path": {request_path!r}, "resource": {request_path!r}, "body": {body!r}}}
+start = time.perf_counter()
+import _stub_aws
+_stub_aws.install(latency_ms=0)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+response = getattr(module, {entry!r})(event, _stub_aws.FakeContext())
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "status": response["statusCode"]}}))
+"""
+
+
+def run_probe(code):
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def measure(repo_root, filename, entry, request_path, body, samples):
+    path = os.path.join(repo_root, filename)
+    if not os.path.exists(path):
+        return None
+    fields = dict(repo_root=repo_root, path=path, entry=entry, request_path=request_path, body=json.dumps(body))
+    imports = [run_probe(IMPORT_PROBE.format(**fields)) for _ in range(samples)]
+    first = [run_probe(FIRST_REQUEST_PROBE.format(**fields)) for _ in range(samples)]
+    return {
+        "importMs": round(median(i["ms"] for i in imports), 2),
+        "boto3AtImport": imports[0]["boto3"] or imports[0]["botocore"],
+        "modulesAtImport": imports[0]["modules"],
+        "firstRequestMs": round(median(f["ms"] for f in first), 2),
+        "firstRequestStatus": first[0]["status"],
+    }
+
+
+def extract_revision(rev, directory):
+    archive = subprocess.run(["git", "-C", _util.REPO_ROOT, "archive", rev], capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+
+
+def format_row(result):
+    if result is None:
+        return f"{'-':>9} {'-':>6} {'-':>8} {'-':>10}"
+    boto = "yes" if result["boto3AtImport"] else "no"
+    return f"{result['importMs']:>9.1f} {boto:>6} {result['modulesAtImport']:>8} {result['firstRequestMs']:>10.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=5, help="fresh interpreters per probe (median is reported)")
+    parser.add_argument("--compare", metavar="REV", help="also measure the tree at this git revision")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as baseline_root:
+        if args.compare:
+            extract_revision(args.compare, baseline_root)
+        for filename, entry, request_path, body in ENTRY_POINTS:
+            current = measure(_util.REPO_ROOT, filename, entry, request_path, body, args.samples)
+            baseline = measure(baseline_root, filename, entry, request_path, body, args.samples) if args.compare else None
+            results.append({"file": filename, "path": request_path, "current": current, "baseline": baseline})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    columns = f"{'import ms':>9} {'boto3':>6} {'modules':>8} {'1st req ms':>10}"
+    print(f"{'entry point':<28} {'route':<22} {columns}" + (f"   | {args.compare}: {columns}" if args.compare else ""))
+    for r in results:
+        line = f"{r['file']:<28} {r['path']:<22} {format_row(r['current'])}"
+        if args.compare:
+            line += f"   | {' ' * len(args.compare)}  {format_row(r['baseline'])}"
+        print(line)
+    print("\nboto3: boto3/botocore loaded by the import itself. 1st req: import + first request with stubbed AWS clients.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Accuracy / latency benchmark for the local language identifier.
+
+Runs a held-out set of task-style texts (none of them in the training
+samples) through lambda_common.langid and reports, per threshold:
+
+- coverage: share of texts answered locally
+- accuracy of the local answers
+- accuracy overall when the rest falls back to the service
+- local latency (p50 / p95 per text)
+
+The service side is Comprehend detect_dominant_language: with --live it is
+called for real (AWS credentials needed) for accuracy and latency; offline
+it is assumed correct with --service-latency-ms per call, which is about
+what a warm Comprehend call costs from Lambda.
+
+    python benchmarks/bench_langid.py
+    python benchmarks/bench_langid.py --live --thresholds 0.8 0.9 0.95
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common import langid
+
+# (expected language, text). Languages outside langid.identifier.supported
+# must fall back to the service to count as correct: "xx" marks distant ones,
+# and ro, af, ca, gl and tl are close neighbours of supported languages that
+# a local answer would otherwise mistake for it, nl, es, pt and it/en.
+EVALUATION = [
+    ("en", "Send the invoice to the accounting department"),
+    ("en", "Fix typo on the landing page"),
+    ("en", "Follow up with Sarah about the contract renewal"),
+    ("en", "Order new chairs for the office and ask facilities when they can be delivered"),
+    ("en", "Water the tomatoes"),
+    ("en", "Renew passport before the summer holidays"),
+    ("en", "Migrate the database to the new server this weekend"),
+    ("en", "Ask the landlord about the broken heating"),
+    ("es", "Enviar la factura al departamento de contabilidad"),
+    ("es", "Corregir la errata en la página principal"),
+    ("es", "Hablar con Sara sobre la renovación del contrato"),
+    ("es", "Pedir sillas nuevas para la oficina y preguntar cuándo las pueden entregar"),
+    ("es", "Regar los tomates"),
+    ("es", "Renovar el pasaporte antes de las vacaciones de verano"),
+    ("es", "Migrar la base de datos al servidor nuevo este fin de semana"),
+    ("es", "Preguntar al casero por la calefacción rota"),
+    ("fr", "Envoyer la facture au service comptabilité"),
+    ("fr", "Corriger la faute de frappe sur la page d'accueil"),
+    ("fr", "Relancer Sarah au sujet du renouvellement du contrat"),
+    ("fr", "Commander de nouvelles chaises pour le bureau et demander quand elles seront livrées"),
+    ("fr", "Arroser les tomates"),
+    ("fr", "Renouveler le passeport avant les vacances d'été"),
+    ("fr", "Migrer la base de données vers le nouveau serveur ce week-end"),
+    ("fr", "Demander au propriétaire pour le chauffage en panne"),
+    ("de", "Die Rechnung an die Buchhaltung schicken"),
+    ("de", "Tippfehler auf der Startseite korrigieren"),
+    ("de", "Bei Sarah wegen der Vertragsverlängerung nachfragen"),
+    ("de", "Neue Stühle für das Büro bestellen und fragen, wann sie geliefert werden"),
+    ("de", "Die Tomaten gießen"),
+    ("de", "Reisepass vor den Sommerferien verlängern"),
+    ("de", "Die Datenbank am Wochenende auf den neuen Server umziehen"),
+    ("de", "Den Vermieter wegen der kaputten Heizung fragen"),
+    ("it", "Inviare la fattura all'ufficio contabilità"),
+    ("it", "Correggere l'errore di battitura nella pagina principale"),
+    ("it", "Sentire Sara per il rinnovo del contratto"),
+    ("it", "Ordinare sedie nuove per l'ufficio e chiedere quando possono essere consegnate"),
+    ("it", "Annaffiare i pomodori"),
+    ("it", "Rinnovare il passaporto prima delle vacanze estive"),
+    ("it", "Migrare il database sul nuovo server questo fine settimana"),
+    ("it", "Chiedere al padrone di casa del riscaldamento rotto"),
+    ("pt", "Enviar a fatura para o departamento de contabilidade"),
+    ("pt", "Corrigir o erro de digitação na página inicial"),
+    ("pt", "Falar com a Sara sobre a renovação do contrato"),
+    ("pt", "Encomendar cadeiras novas para o escritório e perguntar quando podem ser entregues"),
+    ("pt", "Regar os tomates"),
+    ("pt", "Renovar o passaporte antes das férias de verão"),
+    ("pt", "Migrar o banco de dados para o servidor novo neste fim de semana"),
+    ("pt", "Perguntar ao senhorio sobre o aquecimento quebrado"),
+    ("nl", "De factuur naar de boekhouding sturen"),
+    ("nl", "Typfout op de startpagina verbeteren"),
+    ("nl", "Bij Sarah navragen over de verlenging van het contract"),
+    ("nl", "Nieuwe stoelen voor het kantoor bestellen en vragen wanneer ze geleverd worden"),
+    ("nl", "De tomaten water geven"),
+    ("nl", "Paspoort verlengen voor de zomervakantie"),
+    ("nl", "De database dit weekend naar de nieuwe server verhuizen"),
+    ("nl", "De verhuurder vragen naar de kapotte verwarming"),
+    ("xx", "Skicka fakturan till ekonomiavdelningen innan fredag"),
+    ("xx", "Wyślij fakturę do działu księgowości przed piątkiem"),
+    ("xx", "Lähetä lasku kirjanpitoon ennen perjantaita"),
+    ("xx", "請在星期五之前把發票寄給會計部門"),
+    ("xx", "Отправить счёт в бухгалтерию до пятницы"),
+    ("ro", "Trimite factura la departamentul de contabilitate înainte de vineri."),
+    ("ro", "Trimite factura la departamentul de contabilitate inainte de vineri."),
+    ("ro", "Corectează greșeala de scriere de pe pagina principală"),
+    ("ro", "Vorbește cu Sara despre reînnoirea contractului"),
+    ("ro", "Comandă scaune noi pentru birou și întreabă când pot fi livrate"),
+    ("ro", "Mută baza de date pe serverul nou în acest weekend"),
+    ("af", "Stuur die faktuur na die rekeningafdeling voor Vrydag"),
+    ("af", "Maak die tikfout op die tuisblad reg"),
+    ("af", "Bestel nuwe stoele vir die kantoor en vra wanneer hulle afgelewer kan word"),
+    ("af", "Hernu die paspoort voor die somervakansie"),
+    ("af", "Vra die verhuurder oor die stukkende verwarming"),
+    ("af", "Skuif die databasis hierdie naweek na die nuwe bediener"),
+    ("ca", "Envia la factura al departament de comptabilitat abans de divendres"),
+    ("ca", "Corregeix l'errada de la pàgina principal"),
+    ("ca", "Parla amb la Sara sobre la renovació del contracte"),
+    ("ca", "Demana cadires noves per a l'oficina i pregunta quan les poden lliurar"),
+    ("ca", "Renova el passaport abans de les vacances d'estiu"),
+    ("ca", "Migra la base de dades al servidor nou aquest cap de setmana"),
+    ("gl", "Enviar a factura ao departamento de contabilidade antes do venres"),
+    ("gl", "Corrixir o erro de escritura na páxina principal"),
+    ("gl", "Falar coa Sara sobre a renovación do contrato"),
+    ("gl", "Encargar cadeiras novas para a oficina e preguntar cando as poden entregar"),
+    ("gl", "Renovar o pasaporte antes das vacacións de verán"),
+    ("gl", "Migrar a base de datos ao servidor novo esta fin de semana"),
+    ("tl", "Ipadala ang invoice sa departamento ng accounting bago mag-Biyernes"),
+    ("tl", "Ayusin ang maling baybay sa pangunahing pahina"),
+    ("tl", "Kausapin si Sara tungkol sa pag-renew ng kontrata"),
+    ("tl", "Mag-order ng mga bagong upuan para sa opisina at itanong kung kailan maihahatid"),
+    ("tl", "I-renew ang pasaporte bago ang bakasyon sa tag-init"),
+    ("tl", "Ilipat ang database sa bagong server ngayong katapusan ng linggo"),
+]
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def service_answers(live):
+    """{text: (language, latency ms)} from Comprehend, or None offline."""
+    if not live:
+        return None
+    from lambda_common.clients import client_registry
+    comprehend = client_registry.get("comprehend")
+    answers = {}
+    for _, text in EVALUATION:
+        started = time.perf_counter()
+        response = comprehend.detect_dominant_language(Text=text)
+        latency = (time.perf_counter() - started) * 1000
+        languages = response.get("Languages") or [{"LanguageCode": "en"}]
+        answers[text] = (languages[0]["LanguageCode"], latency)
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions per text")
+    parser.add_argument("--live", action="store_true", help="call Comprehend for the service column")
+    parser.add_argument("--service-latency-ms", type=float, default=40.0, help="assumed service latency offline")
+    parser.add_argument("--verbose", action="store_true", help="print every local answer")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    langid.identifier.profiles
+    build_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    ranked = {}
+    for _, text in EVALUATION:
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            ranked[text] = langid.identifier.identify(text)
+            timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+
+    service = service_answers(args.live)
+    if service:
+        service_latencies = sorted(latency for _, latency in service.values())
+        service_p50 = percentile(service_latencies, 50)
+        service_correct = sum(1 for lang, text in EVALUATION if service[text][0] == lang or lang == "xx")
+        service_note = "Comprehend (live)"
+    else:
+        service_p50 = args.service_latency_ms
+        service_correct = len(EVALUATION)
+        service_note = f"Comprehend (assumed correct, {service_p50:.0f} ms)"
+
+    if args.verbose:
+        for lang, text in EVALUATION:
+            candidates, coverage, margin = ranked[text]
+            best = candidates[0] if candidates else ("-", 0.0)
+            print(f"{lang}  {best[0]} {best[1]:.3f} coverage {coverage:.2f} margin {margin:.3f}  {text}")
+        print()
+
+    print(f"profiles built in {build_ms:.1f} ms ({len(langid.identifier.profiles.rows)} n-grams, "
+          f"{len(langid.identifier.supported)} supported + "
+          f"{len(langid.identifier.profiles.languages) - len(langid.identifier.supported)} rejected languages)")
+    print(f"local identify: p50 {percentile(timings, 50):.3f} ms, p95 {percentile(timings, 95):.3f} ms per text")
+    print(f"service: {service_note}, {service_correct}/{len(EVALUATION)} correct\n")
+
+    print(f"{'threshold':>9} {'coverage':>9} {'local acc':>10} {'overall acc':>12} {'mean latency ms':>16}")
+    for threshold in args.thresholds:
+        local, local_correct, overall_correct, latency = 0, 0, 0, 0.0
+        for lang, text in EVALUATION:
+            answer = langid.detect_language_locally(text, threshold=threshold)
+            if answer is not None:
+                local += 1
+                hit = answer["languageCode"] == lang
+                local_correct += hit
+                overall_correct += hit
+                latency += percentile(timings, 50)
+            else:
+                overall_correct += (service[text][0] == lang or lang == "xx") if service else 1
+                latency += service[text][1] if service else service_p50
+        print(
+            f"{threshold:>9.2f} {local / len(EVALUATION):>9.0%} "
+            f"{(local_correct / local if local else 0):>10.0%} {overall_correct / len(EVALUATION):>12.0%}"
+            f" {latency / len(EVALUATION):>16.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    sys.exit(main())
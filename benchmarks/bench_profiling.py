@@ -0,0 +1,67 @@
+"""
+Per-invocation cost of lambda_common.profiling.
+
+Calls fixed-lambda.lambda_handler in-process with stubbed AWS clients (no
+service latency) for a few routes, with the profiler off and in each mode,
+and reports the mean time per invocation. "no hook" calls Api._invoke
+directly, as if the hook did not exist; "off" is the normal path; the
+others show what a profiled invocation costs (.prof dumps go to a
+temporary directory).
+
+    python benchmarks/bench_profiling.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("AI_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_PAYLOAD_SAMPLE_RATE", "0")
+
+import _util
+import _stub_aws
+from lambda_common import api
+from lambda_common.profiling import Profiler
+
+ITERATIONS = 300
+TEXT = "Finish the quarterly report and send it to the project team before Friday's meeting."
+ROUTES = {
+    "analyze": ("/ai/analyze", {"text": TEXT}),
+    "translate": ("/ai/translate", {"text": TEXT, "targetLanguage": "es"}),
+    "pipeline": ("/ai/pipeline", {"text": TEXT, "targetLanguage": "es"}),
+}
+
+
+def mean_ms(handler, event, iterations):
+    for _ in range(10):
+        handler(event, _stub_aws.FakeContext())
+    started = time.perf_counter()
+    for _ in range(iterations):
+        handler(event, _stub_aws.FakeContext())
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    _stub_aws.install(latency_ms=0)
+    handler = _util.load_handler_module("fixed-lambda.py").lambda_handler
+    modes = ("off", "cpu", "memory", "all")
+
+    print(f"{'route':<12} {'no hook ms':>10}" + "".join(f" {mode + ' ms':>10}" for mode in modes))
+    with tempfile.TemporaryDirectory() as dump_dir:
+        for name, (path, body) in ROUTES.items():
+            event = {"httpMethod": "POST", "path": path, "body": json.dumps(body)}
+            row = [mean_ms(handler._invoke, event, ITERATIONS)]
+            for mode in modes:
+                api.profiler = Profiler(mode=mode, sample_rate=1.0, dump_dir=dump_dir)
+                row.append(mean_ms(handler, event, ITERATIONS if mode == "off" else ITERATIONS // 10))
+            print(f"{name:<12}" + "".join(f" {ms:>10.3f}" for ms in row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Per-response overhead before and after lambda_common.responses.
+
+"before" rebuilds the CORS header dict and calls json.dumps for every
+response, as the handlers used to. Run with:
+
+    python benchmarks/bench_responses.py
+"""
+
+import json
+import timeit
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common import responses
+
+ITERATIONS = 200_000
+
+LABELS = {"labels": [{"Name": f"Label {i}", "Confidence": f"{90 - i:.2f}%"} for i in range(10)]}
+
+
+def before_success(data):
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": "POST, OPTIONS",
+            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Amz-Date, X-Api-Key, X-Amz-Security-Token",
+        },
+        "body": json.dumps(data),
+    }
+
+
+def before_error(message):
+    return before_success({"error": message})
+
+
+def before_preflight():
+    return before_success({"message": "CORS preflight successful"})
+
+
+CASES = [
+    ("preflight", before_preflight, responses.PREFLIGHT),
+    ("constant 400", lambda: before_error("Missing text parameter"), responses.MISSING_TEXT),
+    ("success (10 labels)", lambda: before_success(LABELS), lambda: responses.json_response(200, LABELS)),
+    ("dynamic 500", lambda: before_error("Service unavailable"), lambda: responses.error_response(500, "Service unavailable")),
+]
+
+
+def main():
+    print(f"JSON encoder: {responses.JSON_ENCODER}")
+    print(f"{'case':<22} {'before (ns)':>12} {'after (ns)':>12} {'speedup':>9}")
+    ns = 1e9 / ITERATIONS
+    for name, before, after in CASES:
+        t_before = timeit.timeit(before, number=ITERATIONS) * ns
+        t_after = timeit.timeit(after, number=ITERATIONS) * ns
+        print(f"{name:<22} {t_before:>12.0f} {t_after:>12.0f} {t_before / t_after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Router micro-benchmark.
+
+Compares lambda_common.router.Router with the old substring if/elif chain as
+the number of routes grows. Run with:
+
+    python benchmarks/bench_router.py
+"""
+
+import timeit
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common.router import Router
+
+ROUTE_COUNTS = (8, 32, 128, 512)
+ITERATIONS = 200_000
+
+
+def handler(body, **params):
+    return body
+
+
+def build_routes(count):
+    routes = [("POST", f"/ai/service-{i}", handler) for i in range(count - 2)]
+    routes.append(("POST", "/ai/translate", handler))
+    routes.append(("GET", "/ai/jobs/{jobId}", handler))
+    return routes
+
+
+def substring_chain(routes):
+    """Emulates the previous dispatch: test each route name in order."""
+    names = [template.rsplit("/", 1)[-1] for _, template, _ in routes]
+
+    def dispatch(path):
+        for name in names:
+            if name in path:
+                return handler
+        return None
+
+    return dispatch
+
+
+def main():
+    print(f"{'routes':>8} {'router static':>15} {'router template':>17} {'substring chain':>17}   (ns per dispatch)")
+    for count in ROUTE_COUNTS:
+        routes = build_routes(count)
+        router = Router(routes)
+        chain = substring_chain(routes)
+
+        static = timeit.timeit(lambda: router.match("POST", "/ai/translate"), number=ITERATIONS)
+        templated = timeit.timeit(lambda: router.match("GET", "/ai/jobs/abc123"), number=ITERATIONS)
+        # Worst case for the chain is the last route; /ai/translate is appended near the end
+        substring = timeit.timeit(lambda: chain("/ai/translate"), number=ITERATIONS)
+
+        ns = 1e9 / ITERATIONS
+        print(f"{count:>8} {static * ns:>15.0f} {templated * ns:>17.0f} {substring * ns:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Request validation micro-benchmark.
+
+Compares the compiled route schemas (lambda_common.schemas, enforced by
+lambda_common.api) with the hand-written checks the handlers used to do
+after json.loads, for the /ai/pipeline body:
+
+- valid: parse + validate a well-formed request
+- invalid: parse + validate a request with three bad fields (the hand
+  checks stop at the first one; the schema reports all three)
+- oversized: a 1 MB body, parsed then rejected by hand vs rejected by the
+  length check before parsing
+- nested: 50,000 levels of [ ... ], which json.loads walks before failing
+
+    python benchmarks/bench_validation.py
+"""
+
+import json
+import timeit
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common import schemas
+from lambda_common.api import body_too_large, parse_body
+
+TEXT = "Finish the quarterly report and send it to the project team before Friday's meeting."
+STAGES = ("detect-language", "translate", "sentiment")
+
+BODIES = {
+    "valid": json.dumps({"text": TEXT, "stages": list(STAGES), "targetLanguage": "es"}),
+    "invalid": json.dumps({"text": TEXT, "stages": ["translate", "bogus"], "targetLanguage": 5, "sourceLanguage": "??"}),
+    "oversized": json.dumps({"text": "x" * (1024 * 1024), "targetLanguage": "es"}),
+    "nested": "[" * 50_000 + "]" * 50_000,
+}
+
+
+def hand_written(raw):
+    """Emulates the previous handler code: parse everything, then check fields one at a time."""
+    try:
+        body = json.loads(raw)
+    except (ValueError, RecursionError):
+        return 400
+    if not isinstance(body, dict):
+        return 400
+    text = body.get("text")
+    if not text:
+        return 400
+    if len(text.encode("utf-8")) > schemas.TRANSLATE_MAX_TEXT_BYTES:
+        return 400
+    stages = body.get("stages", list(STAGES))
+    if not isinstance(stages, list) or any(stage not in STAGES for stage in stages):
+        return 400
+    for name in ("targetLanguage", "sourceLanguage"):
+        value = body.get(name)
+        if value is not None and (not isinstance(value, str) or len(value) > 10):
+            return 400
+    return 200
+
+
+def compiled(raw):
+    schema = schemas.PIPELINE
+    event = {"body": raw}
+    if body_too_large(event, schema.max_body_bytes):
+        return 413
+    body, error = parse_body(event)
+    if error is not None:
+        return error["statusCode"]
+    return 400 if schema.validate(body) else 200
+
+
+def main():
+    print(f"{'body':<10} {'bytes':>9} {'hand status':>12} {'hand us':>10} {'schema status':>14} {'schema us':>10}")
+    for name, raw in BODIES.items():
+        number = 20 if len(raw) > 10_000 else 20_000
+        hand = timeit.timeit(lambda: hand_written(raw), number=number) / number * 1e6
+        schema = timeit.timeit(lambda: compiled(raw), number=number) / number * 1e6
+        print(f"{name:<10} {len(raw):>9} {hand_written(raw):>12} {hand:>10.2f} {compiled(raw):>14} {schema:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
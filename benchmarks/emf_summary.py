@@ -0,0 +1,53 @@
+"""
+Summarize the EMF metric lines written by lambda_common.metrics.
+
+Reads log output (files or stdin), keeps the lines that carry an "_aws"
+block, and prints count / mean / p50 / p95 / p99 / max per route and metric,
+i.e. what CloudWatch would graph for the same records.
+
+    python local-api-gateway.py --stub-aws > gateway.log   # then send traffic
+    python benchmarks/emf_summary.py gateway.log
+    python benchmarks/emf_summary.py --json < gateway.log
+"""
+
+import argparse
+import fileinput
+import json
+import sys
+
+import _util  # noqa: F401  (puts the repo root on sys.path)
+from lambda_common.metrics import parse_emf, summarize
+
+
+def print_summary(summary):
+    for group, metrics in sorted(summary.items()):
+        print(group)
+        print(f"  {'metric':<18} {'count':>7} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+        for name, s in sorted(metrics.items()):
+            print(
+                f"  {name:<18} {s['count']:>7} {s['mean']:>10.3f} {s['p50']:>10.3f} {s['p95']:>10.3f}"
+                f" {s['p99']:>10.3f} {s['max']:>10.3f}"
+            )
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="log files (default: stdin)")
+    parser.add_argument("--group-by", nargs="+", default=["Route"], help="record fields to group by")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize(parse_emf(fileinput.input(args.files)), group_by=args.group_by)
+    if not summary:
+        print("no EMF records found", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Record real AWS responses and latencies for offline replay (_replay_aws.py).
+
+Sends a fixed set of requests through fixed-lambda.lambda_handler in-process
+with the real boto3 clients wrapped by _replay_aws.RecordingClient, and
+writes the calls the handlers made to a gzipped JSON fixture. AWS
+credentials are needed; the calls are billed as usual.
+
+The scenario covers the routes the replay is for: text analysis,
+translation (to one and to several languages) and language detection for
+the bench_langid texts plus the bench_handlers text (single and batch, in
+the batch sizes bench_handlers uses), and image analysis for the S3
+objects given with --bucket/--key and the files given with --image. Each
+request is sent --repeat times so the fixture holds a latency distribution
+rather than single samples.
+Response caches and the local language identifier are turned off, so
+every request reaches AWS.
+
+    python benchmarks/record_aws.py --out benchmarks/fixtures/aws.json.gz --repeat 5
+    python benchmarks/record_aws.py --bucket my-tasks --key img/1.jpg --key img/2.jpg --image photo.jpg
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+os.environ.update(AI_CACHE_ENABLED="false", IMAGE_CACHE_ENABLED="false", LANGID_ENABLED="false", LOG_PAYLOAD_SAMPLE_RATE="0")
+
+import _util
+import _replay_aws
+from _stub_aws import FakeContext
+from bench_handlers import TEXT
+from bench_langid import EVALUATION
+from lambda_common.metrics import metrics
+
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "aws.json.gz")
+TARGET_LANGUAGES = ("es", "fr")
+
+
+def post(path, body):
+    return {"httpMethod": "POST", "path": path, "resource": path, "body": json.dumps(body)}
+
+
+def scenario(args):
+    """(label, event) pairs for one pass."""
+    texts = [TEXT] + [text for _, text in EVALUATION]
+    events = []
+    for text in texts:
+        events.append(("analyze", post("/ai/analyze", {"text": text})))
+        events.append(("detect-language", post("/ai/detect-language", {"text": text})))
+        for language in TARGET_LANGUAGES:
+            events.append(("translate", post("/ai/translate", {"text": text, "targetLanguage": language})))
+        events.append(("translate-multi", post("/ai/translate", {"text": text, "targetLanguages": list(TARGET_LANGUAGES)})))
+    events.append(("analyze-batch", post("/ai/analyze/batch", {"texts": [f"{TEXT} #{j}" for j in range(50)]})))
+    events.append(("detect-language-batch", post("/ai/detect-language/batch", {"texts": texts})))
+    events.append(("translate-batch", post("/ai/translate/batch", {"texts": [f"{TEXT} #{j}" for j in range(20)]})))
+    features = ["labels", "text", "moderation"]
+    for key in args.key:
+        events.append(("image-analyze", post("/ai/image-analyze", {"bucket": args.bucket, "key": key, "features": features})))
+    for path in args.image:
+        with open(path, "rb") as f:
+            image = base64.b64encode(f.read()).decode("ascii")
+        events.append(("image-analyze-inline", post("/ai/image-analyze", {"image": image, "features": features})))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the scenario")
+    parser.add_argument("--bucket", help="S3 bucket of the --key images")
+    parser.add_argument("--key", action="append", default=[], help="S3 key of an image to analyse (repeatable)")
+    parser.add_argument("--image", action="append", default=[], help="local image file to send inline (repeatable)")
+    args = parser.parse_args()
+    if args.key and not args.bucket:
+        parser.error("--key needs --bucket")
+
+    metrics.sink = lambda line: None
+    recording = _replay_aws.record()
+    handler = _util.load_handler_module("fixed-lambda.py").lambda_handler
+    events = scenario(args)
+
+    statuses = {}
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for label, event in events:
+            status = handler(event, FakeContext())["statusCode"]
+            statuses.setdefault(label, {}).setdefault(status, 0)
+            statuses[label][status] += 1
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    recording.save(args.out)
+    print(f"{len(events) * args.repeat} requests in {elapsed:.1f} s; status codes by route:")
+    for label, counts in statuses.items():
+        print(f"  {label:<22} {counts}")
+    print(f"\n{'operation':<42} {'requests':>9} {'calls':>6}")
+    for operation, (distinct, calls) in recording.summary().items():
+        print(f"{operation:<42} {distinct:>9} {calls:>6}")
+    print(f"\nwritten to {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
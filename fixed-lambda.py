@@ -1,223 +1,51 @@
-import boto3
-import json
 import logging
+import os
+
+from lambda_common import caching, schemas
+from lambda_common.api import Api
+from lambda_common.warmup import init_phase
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-CORS_HEADERS = {
-    'Content-Type': 'application/json',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'POST, OPTIONS',
-    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Amz-Date, X-Api-Key, X-Amz-Security-Token'
-}
-
-def lambda_handler(event, context):
-    logger.info(f"Event received: {json.dumps(event)}")
-
-    # Handle OPTIONS preflight request for CORS
-    if event.get("httpMethod") == "OPTIONS":
-        return {
-            "statusCode": 200,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"message": "CORS preflight successful"})
-        }
-
-    # Get the path to determine which service to call
-    path = event.get("path", "")
-    resource = event.get("resource", "")
-    
-    logger.info(f"Path: {path}, Resource: {resource}")
-
-    # Parse body
-    body = event.get("body")
-    if body:
-        if isinstance(body, str):
-            try:
-                body = json.loads(body)
-            except json.JSONDecodeError:
-                return {
-                    "statusCode": 400,
-                    "headers": CORS_HEADERS,
-                    "body": json.dumps({"error": "Invalid JSON in request body"})
-                }
-    else:
-        body = event
-
-    # Route to appropriate service based on path
-    if "image-analyze" in path:
-        return handle_image_analysis(body)
-    elif "analyze" in path:
-        return handle_text_analysis(body)
-    elif "translate" in path:
-        return handle_translation(body)
-    elif "polly" in path:
-        return handle_polly(body)
-    elif "detect-language" in path:
-        return handle_language_detection(body)
-    else:
-        return {
-            "statusCode": 404,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": f"Endpoint not found: {path}"})
-        }
-
-def handle_image_analysis(body):
-    bucket = body.get("bucket")
-    key = body.get("key")
-
-    if not bucket or not key:
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": "Missing bucket or key"})
-        }
-
-    try:
-        rekognition = boto3.client("rekognition")
-        response = rekognition.detect_labels(
-            Image={"S3Object": {"Bucket": bucket, "Name": key}},
-            MaxLabels=5,
-            MinConfidence=70
-        )
-
-        labels = [
-            {"Name": label["Name"], "Confidence": f"{label['Confidence']:.2f}%"}
-            for label in response["Labels"]
-        ]
-
-        return {
-            "statusCode": 200,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"labels": labels})
-        }
-
-    except Exception as e:
-        logger.error(f"Error detecting labels: {str(e)}")
-        return {
-            "statusCode": 500,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": str(e)})
-        }
-
-def handle_text_analysis(body):
-    text = body.get("text")
-    if not text:
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": "Missing text parameter"})
-        }
-    
-    try:
-        comprehend = boto3.client("comprehend")
-        response = comprehend.detect_sentiment(Text=text, LanguageCode='en')
-        
-        return {
-            "statusCode": 200,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({
-                "sentiment": response["Sentiment"],
-                "sentimentScore": response["SentimentScore"]
-            })
-        }
-    except Exception as e:
-        logger.error(f"Error analyzing text: {str(e)}")
-        return {
-            "statusCode": 500,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": str(e)})
-        }
-
-def handle_translation(body):
-    text = body.get("text")
-    target_language = body.get("targetLanguage", "es")
-    
-    if not text:
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": "Missing text parameter"})
-        }
-    
-    try:
-        translate = boto3.client("translate")
-        response = translate.translate_text(
-            Text=text,
-            SourceLanguageCode="auto",
-            TargetLanguageCode=target_language
-        )
-        
-        return {
-            "statusCode": 200,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"translatedText": response["TranslatedText"]})
-        }
-    except Exception as e:
-        logger.error(f"Error translating text: {str(e)}")
-        return {
-            "statusCode": 500,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": str(e)})
-        }
-
-def handle_polly(body):
-    text = body.get("text")
-    language = body.get("language", "en")
-    
-    if not text:
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": "Missing text parameter"})
-        }
-    
-    # Mock response - implement actual Polly logic
-    return {
-        "statusCode": 200,
-        "headers": CORS_HEADERS,
-        "body": json.dumps({"audioUrl": "https://example.com/audio.mp3"})
-    }
-
-def handle_language_detection(body):
-    text = body.get("text")
-    
-    if not text:
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": "Missing text parameter"})
-        }
-    
-    try:
-        comprehend = boto3.client("comprehend")
-        response = comprehend.detect_dominant_language(Text=text)
-        
-        if response["Languages"]:
-            lang = response["Languages"][0]
-            return {
-                "statusCode": 200,
-                "headers": CORS_HEADERS,
-                "body": json.dumps({
-                    "language": lang["LanguageCode"],
-                    "languageCode": lang["LanguageCode"],
-                    "confidence": lang["Score"]
-                })
-            }
-        
-        return {
-            "statusCode": 200,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({
-                "language": "en",
-                "languageCode": "en", 
-                "confidence": 0.5
-            })
-        }
-    except Exception as e:
-        logger.error(f"Error detecting language: {str(e)}")
-        return {
-            "statusCode": 500,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"error": str(e)})
-        }
\ No newline at end of file
+HANDLERS = "lambda_common.handlers"
+
+# Route table, request schemas and cache policies, compiled once per
+# container. Handler modules (and the boto3 clients they use) are imported on
+# the first request to each route. The GET variants of the text routes take
+# their parameters from the query string so that browsers and API Gateway can
+# cache them.
+CACHEABLE = caching.public()
+
+ROUTES = [
+    ("POST", "/ai/image-analyze", f"{HANDLERS}.image:handle_image_analysis", schemas.IMAGE_ANALYSIS, caching.NO_STORE),
+    ("POST", "/ai/image-analyze/jobs", f"{HANDLERS}.jobs:handle_image_job_submit", schemas.IMAGE_JOB, caching.NO_STORE),
+    ("GET", "/ai/image-analyze/jobs/{jobId}", f"{HANDLERS}.jobs:handle_image_job_status", None, caching.REVALIDATE),
+    ("GET", "/ai/analyze", f"{HANDLERS}.text:handle_text_analysis", schemas.TEXT_ANALYSIS, CACHEABLE),
+    ("POST", "/ai/analyze", f"{HANDLERS}.text:handle_text_analysis", schemas.TEXT_ANALYSIS, caching.NO_STORE),
+    ("POST", "/ai/analyze/batch", f"{HANDLERS}.text:handle_text_analysis_batch", schemas.COMPREHEND_BATCH, caching.NO_STORE),
+    ("GET", "/ai/translate", f"{HANDLERS}.translate:handle_translation", schemas.TRANSLATION, CACHEABLE),
+    ("POST", "/ai/translate", f"{HANDLERS}.translate:handle_translation", schemas.TRANSLATION, caching.NO_STORE),
+    ("POST", "/ai/translate/batch", f"{HANDLERS}.translate:handle_translation_batch", schemas.TRANSLATION_BATCH, caching.NO_STORE),
+    ("POST", "/ai/polly", f"{HANDLERS}.speech:handle_polly", schemas.SPEECH, caching.NO_STORE),
+    ("GET", "/ai/detect-language", f"{HANDLERS}.text:handle_language_detection", schemas.LANGUAGE_DETECTION, CACHEABLE),
+    ("POST", "/ai/detect-language", f"{HANDLERS}.text:handle_language_detection", schemas.LANGUAGE_DETECTION, caching.NO_STORE),
+    ("POST", "/ai/detect-language/batch", f"{HANDLERS}.text:handle_language_detection_batch", schemas.COMPREHEND_BATCH, caching.NO_STORE),
+    ("POST", "/ai/pipeline", f"{HANDLERS}.pipeline:handle_pipeline", schemas.PIPELINE, caching.NO_STORE),
+]
+
+lambda_handler = Api(ROUTES, base_path=os.environ.get("ROUTE_BASE_PATH", ""))
+ROUTER = lambda_handler.router
+
+
+def jobs_worker_handler(event, context):
+    """Separate Lambda entry point for bulk image-analysis job workers."""
+    from lambda_common.handlers.jobs import jobs_worker_handler as handler
+    return handler(event, context)
+
+
+init_phase(
+    lambda_handler,
+    services=("rekognition", "s3", "comprehend", "translate", "polly"),
+    warm=(f"{HANDLERS}.text:warm_up",),
+)
@@ -1,78 +1,22 @@
-import json
-import boto3
 import logging
 
+from lambda_common import schemas
+from lambda_common.api import Api
+from lambda_common.clients import client_registry
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def lambda_handler(event, context):
+client_registry.configure("rekognition", region_name="us-east-1")
+
+
+def analyze_image(body):
     """
     Image Analysis using AWS Rekognition
-    Endpoint: POST /ai/image-analyze
+    Endpoint: POST /ai/image-analyze (up to 10 labels unless maxLabels is given)
     """
-    
-    cors_headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type, Authorization'
-    }
-    
-    try:
-        logger.info(f"Received event: {json.dumps(event)}")
-        
-        # Handle different event structures
-        if 'body' in event and event['body']:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-        else:
-            body = event
-        
-        bucket = body.get('bucket', '')
-        key = body.get('key', '')
-        
-        if not bucket or not key:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': 'Missing bucket or key parameter'})
-            }
-        
-        # Initialize AWS Rekognition client
-        rekognition = boto3.client('rekognition', region_name='us-east-1')
-        
-        # Detect labels in image
-        response = rekognition.detect_labels(
-            Image={
-                'S3Object': {
-                    'Bucket': bucket,
-                    'Name': key
-                }
-            },
-            MaxLabels=10,
-            MinConfidence=70
-        )
-        
-        labels = []
-        for label in response['Labels']:
-            labels.append({
-                'Name': label['Name'],
-                'Confidence': f"{label['Confidence']:.2f}%"
-            })
-        
-        result = {'labels': labels}
-        
-        logger.info(f"Image analysis successful: {json.dumps(result)}")
-        
-        return {
-            'statusCode': 200,
-            'headers': cors_headers,
-            'body': json.dumps(result)
-        }
-        
-    except Exception as e:
-        logger.error(f"Image analysis error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': cors_headers,
-            'body': json.dumps({'error': f'Image analysis failed: {str(e)}'})
-        }
\ No newline at end of file
+    from lambda_common.handlers.image import handle_image_analysis
+    return handle_image_analysis(body, default_max_labels=10)
+
+
+lambda_handler = Api(default=analyze_image, schema=schemas.IMAGE_ANALYSIS)
@@ -0,0 +1,14 @@
+"""
+Shared helpers for the CloudyOnce Tasks Lambda functions.
+
+Deploy this package alongside the handler file (e.g. fixed-lambda.py) so
+that `import lambda_common` resolves from the Lambda task root.
+"""
+
+from .clients import ClientRegistry, client_registry, get_client
+
+__all__ = [
+    "ClientRegistry",
+    "client_registry",
+    "get_client",
+]
@@ -0,0 +1,261 @@
+"""
+Shared API Gateway entry point for the Lambda functions.
+
+Api(routes) builds the callable that every handler file exposes as
+lambda_handler. It does the work each file used to copy by hand: request
+logging, EMF metrics, the invocation deadline, CORS preflight, routing,
+body parsing (including isBase64Encoded bodies), request validation,
+turning unexpected exceptions into error responses, per-route HTTP caching
+(lambda_common.caching) and, when enabled, compressing large responses for
+clients that accept it (lambda_common.compression). Opt-in profiling of
+selected invocations is in lambda_common.profiling.
+
+A route may carry a lambda_common.validation.Schema: its max_body_bytes is
+checked before the body is decoded or parsed (413), and the parsed body is
+validated before the handler runs (structured 400).
+
+Route targets may be "package.module:function" strings. The module is only
+imported when a request first reaches that route, so an entry point pays at
+import time for the shared plumbing only and never for services its routes
+do not use. boto3 itself is imported on the first client creation (see
+lambda_common.clients).
+
+Preloading for provisioned concurrency and SnapStart lives in
+lambda_common.warmup.
+"""
+
+import binascii
+import importlib
+import json
+
+from .clients import client_registry
+from .compression import compress_response
+from .logs import log
+from .metrics import metrics
+from .profiling import profiler
+from .resilience import deadline
+from .responses import INVALID_JSON, PREFLIGHT, error_response, exception_response, with_headers
+from .router import MethodNotAllowed, RouteNotFound, Router
+from .validation import ListOf, utf8_len_over, validation_error_response
+
+
+class LazyHandler:
+    """A "module:function" route target imported on first call."""
+
+    __slots__ = ("target", "_function")
+
+    def __init__(self, target):
+        if ":" not in target:
+            raise ValueError(f"Handler targets look like package.module:function, got {target!r}")
+        self.target = target
+        self._function = None
+
+    @property
+    def function(self):
+        if self._function is None:
+            module_name, name = self.target.split(":", 1)
+            self._function = getattr(importlib.import_module(module_name), name)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyHandler({self.target!r})"
+
+
+def resolve(target):
+    return LazyHandler(target) if isinstance(target, str) else target
+
+
+def header(event, name):
+    """Case-insensitive request header lookup."""
+    headers = event.get("headers") or {}
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if key.lower() == lowered:
+                return candidate
+    return value
+
+
+def body_too_large(event, max_bytes):
+    """True when the (decoded) request body exceeds `max_bytes`, without decoding or parsing it."""
+    body = event.get("body")
+    if not isinstance(body, str):
+        return False
+    if event.get("isBase64Encoded"):
+        return len(body) // 4 * 3 > max_bytes + 2
+    return utf8_len_over(body, max_bytes)
+
+
+def parse_body(event):
+    """
+    (body, None) for a parsed request, or (None, error response).
+
+    JSON bodies are decoded (from base64 first when API Gateway set
+    isBase64Encoded). A base64 body with a non-JSON content type is a binary
+    upload and comes back as {"bodyBytes": bytes, "contentType": ...} plus
+    the query string. Requests without a body get the raw event, which is
+    where GET handlers find queryStringParameters.
+    """
+    body = event.get("body")
+    if not body:
+        return event, None
+    if not isinstance(body, str):
+        return body, None
+
+    if event.get("isBase64Encoded"):
+        content_type = (header(event, "Content-Type") or "").split(";", 1)[0].strip().lower()
+        try:
+            with metrics.timer("ParseMs"):
+                raw = binascii.a2b_base64(body)
+        except binascii.Error:
+            return None, error_response(400, "Request body is not valid base64")
+        if content_type and not content_type.endswith("json"):
+            return {
+                "bodyBytes": raw,
+                "contentType": content_type,
+                "queryStringParameters": event.get("queryStringParameters") or {},
+            }, None
+        body = raw
+
+    try:
+        with metrics.timer("ParseMs"):
+            return json.loads(body), None
+    except ValueError:
+        # json.JSONDecodeError, or UnicodeDecodeError for undecodable bytes
+        return None, INVALID_JSON()
+    except RecursionError:
+        return None, error_response(400, "Request body is nested too deeply")
+
+
+def query_body(event, schema):
+    """
+    The query string of a GET as a request body for `schema`. List fields
+    take every value of a repeated parameter (?targetLanguages=es&targetLanguages=fr):
+    all of them from multiValueQueryStringParameters (REST APIs), or split
+    on commas, which is how HTTP APIs join them (and how a client may send
+    them, ?targetLanguages=es,fr).
+    """
+    body = dict(event.get("queryStringParameters") or {})
+    multi = event.get("multiValueQueryStringParameters") or {}
+    for name, field in schema.fields.items():
+        if not isinstance(field, ListOf) or name not in body:
+            continue
+        values = multi.get(name) or [body[name]]
+        body[name] = [item for value in values for item in value.split(",") if item]
+    return body
+
+
+class Target:
+    """A route's handler plus its optional request schema and cache policy."""
+
+    __slots__ = ("handler", "schema", "cache")
+
+    def __init__(self, handler, schema=None, cache=None):
+        self.handler = resolve(handler)
+        self.schema = schema
+        self.cache = cache
+
+
+class Api:
+    """
+    Lambda handler for a set of routes.
+
+    routes:  (method, path template, handler or "module:function"[, schema[, cache]])
+             tuples; cache is a lambda_common.caching.CachePolicy
+    default: handler for requests that match no route (single-purpose
+             functions mounted on one API Gateway resource use only this),
+             validated with `schema` and cached per `cache`
+    GET routes with a schema take their parameters from the query string.
+    Handlers are called as handler(body, **path_params).
+    """
+
+    def __init__(self, routes=(), default=None, base_path="", schema=None, cache=None):
+        self.targets = [(route[0], route[1], Target(*route[2:])) for route in routes]
+        self.router = Router(self.targets, base_path=base_path)
+        self.default = Target(default, schema, cache) if default is not None else None
+
+    @property
+    def handlers(self):
+        """Every route handler, including the default."""
+        handlers = [target.handler for _, _, target in self.targets]
+        if self.default is not None:
+            handlers.append(self.default.handler)
+        return handlers
+
+    def __call__(self, event, context):
+        if profiler.enabled:
+            return profiler.run(self._invoke, event, context)
+        return self._invoke(event, context)
+
+    def _invoke(self, event, context):
+        metrics.start(event, context)
+        response = None
+        try:
+            response = compress_response(self.handle(event, context), header(event, "Accept-Encoding"))
+            return response
+        finally:
+            metrics.finish(response)
+
+    def handle(self, event, context):
+        log.start_request(event, context)
+        deadline.start(context)
+        log.payload("Event received", event)
+        log.debug("Client registry", clients=client_registry.stats)
+
+        method = event.get("httpMethod") or "POST"
+        if method == "OPTIONS":
+            metrics.set_route("OPTIONS")
+            return PREFLIGHT()
+
+        path = event.get("path", "")
+        log.info("Request", method=method, path=path, resource=event.get("resource", ""))
+
+        params = {}
+        try:
+            with metrics.timer("RouteMs"):
+                route = self.router.match(method, path)
+            target, params = route.handler, route.params
+            metrics.set_route(f"{method} {route.template}")
+        except MethodNotAllowed as e:
+            if self.default is None:
+                return with_headers(error_response(405, f"Method not allowed: {method} {path}"), Allow=", ".join(e.allowed))
+            target = self.default
+        except RouteNotFound:
+            if self.default is None:
+                return error_response(404, f"Endpoint not found: {path}")
+            target = self.default
+        if target is self.default:
+            metrics.set_route(f"{method} {event.get('resource') or 'default'}")
+
+        schema = target.schema
+        if schema is not None and schema.max_body_bytes is not None and body_too_large(event, schema.max_body_bytes):
+            return error_response(413, f"Request body is larger than {schema.max_body_bytes} bytes")
+
+        if method == "GET" and schema is not None and not event.get("body"):
+            body = query_body(event, schema)
+        else:
+            body, error = parse_body(event)
+            if error is not None:
+                return error
+
+        try:
+            if schema is not None:
+                # A binary upload ({"bodyBytes": ...}) is checked by its handler;
+                # its options come in the query string
+                binary = isinstance(body, dict) and "bodyBytes" in body
+                with metrics.timer("ValidateMs"):
+                    errors = schema.validate(query_body(event, schema) if binary else body)
+                if errors:
+                    return validation_error_response(errors)
+
+            response = target.handler(body, **params)
+        except Exception as e:
+            log.error("Unhandled handler error", error=str(e))
+            return exception_response(e)
+        if target.cache is not None:
+            response = target.cache.apply(method, response, header(event, "If-None-Match"))
+        return response
@@ -0,0 +1,267 @@
+"""
+Two-tier memoization for the text AI handlers.
+
+Tier 1 is a bounded in-process LRU with a TTL. Tier 2 is a small SQLite file
+under /tmp, which Lambda keeps across warm invocations of the same container.
+Values must be JSON serializable (the handlers cache their response payloads).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .logs import log
+from .metrics import metrics
+
+_MISSING = object()
+
+
+# Service parameters whose case does not change the answer (language codes)
+CASE_INSENSITIVE_PARAMS = ("language_code", "source_language", "target_language")
+
+
+def make_key(operation, text, **params):
+    """
+    Hash of (text, operation, service parameters). The text is hashed exactly
+    as given: Translate keeps its line breaks and spacing, so texts that only
+    differ in whitespace must not share a result.
+    """
+    params = {
+        name: value.lower() if name in CASE_INSENSITIVE_PARAMS and isinstance(value, str) else value
+        for name, value in params.items()
+    }
+    payload = json.dumps(
+        [operation, text, params],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LRUCache:
+    """Bounded in-memory LRU with per-entry expiry."""
+
+    def __init__(self, max_entries=512, ttl_seconds=900):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FileCache:
+    """
+    SQLite-backed store under /tmp. Bounded by entry count and total bytes;
+    the least recently used rows are evicted first.
+    """
+
+    def __init__(self, path="/tmp/ai-cache.sqlite3", max_entries=5000, max_bytes=50 * 1024 * 1024, ttl_seconds=86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        return self._conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+            value, expires = row
+            if expires < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value):
+        blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + self.ttl_seconds, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        self.stats.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+
+
+class TieredCache:
+    """Looks in memory first, then the file tier; file hits are promoted to memory."""
+
+    def __init__(self, memory=None, file=None, enabled=True):
+        self.memory = memory or LRUCache()
+        self.file = file
+        self.enabled = enabled
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            metrics.increment("CacheHits")
+            return value
+        if self.file is not None:
+            try:
+                value = self.file.get(key, _MISSING)
+            except sqlite3.Error as e:
+                log.warning("File cache read failed", error=str(e))
+                value = _MISSING
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                metrics.increment("CacheHits")
+                return value
+        metrics.increment("CacheMisses")
+        return default
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        self.memory.set(key, value)
+        if self.file is not None:
+            try:
+                self.file.set(key, value)
+            except sqlite3.Error as e:
+                log.warning("File cache write failed", error=str(e))
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def stats(self):
+        stats = {"memory": self.memory.stats.as_dict()}
+        stats["memory"]["size"] = len(self.memory)
+        hits = self.memory.stats.hits
+        if self.file is not None:
+            stats["file"] = self.file.stats.as_dict()
+            hits += self.file.stats.hits
+        lookups = self.memory.stats.hits + self.memory.stats.misses
+        stats["hitRatio"] = round(hits / lookups, 4) if lookups else None
+        return stats
+
+    def log_stats(self, label):
+        log.info("AI cache stats", operation=label, cache=self.stats)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def cache_from_env(prefix="AI_CACHE", default_path="/tmp/ai-cache.sqlite3"):
+    """Build a tiered cache from <prefix>_* environment variables (AI_CACHE_* by default)."""
+    enabled = os.environ.get(f"{prefix}_ENABLED", "true").lower() not in ("0", "false", "no")
+    memory = LRUCache(
+        max_entries=_env_int(f"{prefix}_MEMORY_MAX_ENTRIES", 512),
+        ttl_seconds=_env_int(f"{prefix}_MEMORY_TTL", 900),
+    )
+    file = None
+    path = os.environ.get(f"{prefix}_FILE_PATH", default_path)
+    if path and os.environ.get(f"{prefix}_FILE_ENABLED", "true").lower() not in ("0", "false", "no"):
+        file = FileCache(
+            path=path,
+            max_entries=_env_int(f"{prefix}_FILE_MAX_ENTRIES", 5000),
+            max_bytes=_env_int(f"{prefix}_FILE_MAX_BYTES", 50 * 1024 * 1024),
+            ttl_seconds=_env_int(f"{prefix}_FILE_TTL", 86400),
+        )
+    return TieredCache(memory=memory, file=file, enabled=enabled)
+
+
+ai_cache = cache_from_env()
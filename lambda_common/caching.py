@@ -0,0 +1,108 @@
+"""
+HTTP caching for API responses: Cache-Control, strong ETags and 304s.
+
+Each route may carry a CachePolicy (see fixed-lambda.py):
+
+- deterministic GET routes (translate, detect-language, sentiment for a
+  given text) use public(max_age): browsers and caches in front of the API
+  may reuse the response, and revalidate with If-None-Match once it is
+  stale.
+- routes whose result changes over time but is polled (job status) use
+  REVALIDATE: every use is revalidated, and an unchanged page costs a 304
+  with no body.
+- POST routes and per-user results use NO_STORE.
+
+The ETag is a hash of the uncompressed JSON body, so it is cheap to compute
+and identical across containers. lambda_common.compression appends the
+content coding ("...-gzip") to the tag of compressed responses, as a strong
+ETag must differ per encoding; If-None-Match ignores that suffix, since
+the client already holds the same content.
+
+304s are only sent for GET: RFC 9110 answers a failed If-None-Match on other
+methods with 412, which is of no use to these clients, so POST responses
+carry no validators.
+
+Settings (environment):
+    CACHE_MAX_AGE   max-age in seconds for deterministic routes (default 86400)
+"""
+
+import hashlib
+import os
+
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def etag_for(body):
+    """Strong ETag (quoted) for a response body."""
+    return '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def _strip_tag(tag):
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def none_match(if_none_match, etag):
+    """
+    The tag from an If-None-Match header value that matches `etag`, without
+    any W/ prefix (weak comparison, as RFC 9110 asks for), or None. "*"
+    matches as `etag`.
+    """
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if _strip_tag(tag) == etag:
+            return tag
+    return None
+
+
+class CachePolicy:
+    """Cache-Control value for a route, and whether its successful GET responses get an ETag."""
+
+    __slots__ = ("cache_control", "etag")
+
+    def __init__(self, cache_control, etag=False):
+        self.cache_control = cache_control
+        self.etag = etag
+
+    def apply(self, method, response, if_none_match=None):
+        """
+        `response` with Cache-Control (and ETag) set, or a 304 when the
+        client's If-None-Match already names this body.
+        """
+        if not isinstance(response, dict):
+            return response
+        headers = dict(response.get("headers") or {})
+        status = response.get("statusCode")
+        # Errors are never cached: a throttled or failed call must not stick
+        headers["Cache-Control"] = self.cache_control if status == 200 else "no-store"
+        response = dict(response, headers=headers)
+        body = response.get("body")
+        if not (self.etag and status == 200 and method == "GET" and isinstance(body, str)):
+            return response
+        etag = headers["ETag"] = etag_for(body)
+        matched = none_match(if_none_match, etag)
+        if matched is None:
+            return response
+        # Echo the tag the client holds, which names the encoding it was sent with
+        headers["ETag"] = matched
+        if matched != etag:
+            headers["Vary"] = "Accept-Encoding"
+        headers.pop("Content-Type", None)
+        return {"statusCode": 304, "headers": headers, "body": ""}
+
+
+def public(max_age=None):
+    """Policy for deterministic GET routes: cacheable by browsers and shared caches for `max_age` seconds."""
+    if max_age is None:
+        max_age = int(os.environ.get("CACHE_MAX_AGE", "86400"))
+    return CachePolicy(f"public, max-age={max_age}", etag=True)
+
+
+REVALIDATE = CachePolicy("no-cache", etag=True)
+NO_STORE = CachePolicy("no-store")
@@ -0,0 +1,206 @@
+"""
+Warm-container boto3 client registry.
+
+Creating a boto3 client costs a credential lookup, endpoint resolution and
+(on first request) a TLS handshake. Lambda keeps the container alive between
+invocations, so each service client is created once on first use and reused
+for the life of the container.
+
+get_client() hands out GuardedClient proxies (lambda_common.resilience) that
+own timeouts, retries and circuit breaking, so botocore's own retries are
+off by default ({SERVICE}_MAX_ATTEMPTS re-enables them per service).
+"""
+
+import os
+import threading
+import time
+
+from .logs import log
+from .metrics import instrument_client, metrics
+from .resilience import GuardedClient
+
+# Defaults applied to every service client
+DEFAULT_CLIENT_OPTIONS = {
+    "region_name": None,  # None lets boto3 use AWS_REGION / AWS_DEFAULT_REGION
+    "max_pool_connections": 10,
+    "tcp_keepalive": True,
+    "connect_timeout": 2,
+    "read_timeout": 10,
+    "max_attempts": 1,  # retries happen in lambda_common.resilience
+}
+
+# Per-service overrides of DEFAULT_CLIENT_OPTIONS
+SERVICE_CLIENT_OPTIONS = {
+    "rekognition": {"read_timeout": 15},
+    "comprehend": {"read_timeout": 5},
+    "translate": {"read_timeout": 10},
+    "polly": {"read_timeout": 15},
+    "s3": {"max_pool_connections": 25},
+}
+
+_BOTOCORE_CONFIG_KEYS = ("max_pool_connections", "tcp_keepalive", "connect_timeout", "read_timeout")
+_INT_OPTIONS = ("max_pool_connections", "max_attempts")
+
+
+def _env_overrides(service):
+    """
+    Read per-service overrides from the environment, e.g.
+    TRANSLATE_REGION, TRANSLATE_MAX_POOL_CONNECTIONS, TRANSLATE_READ_TIMEOUT
+    """
+    prefix = service.upper().replace("-", "_")
+    overrides = {}
+    region = os.environ.get(f"{prefix}_REGION")
+    if region:
+        overrides["region_name"] = region
+    for key in ("max_pool_connections", "max_attempts", "connect_timeout", "read_timeout"):
+        value = os.environ.get(f"{prefix}_{key.upper()}")
+        if value:
+            overrides[key] = int(value) if key in _INT_OPTIONS else float(value)
+    keepalive = os.environ.get(f"{prefix}_TCP_KEEPALIVE")
+    if keepalive:
+        overrides["tcp_keepalive"] = keepalive.lower() in ("1", "true", "yes")
+    return overrides
+
+
+class ClientRegistry:
+    """Lazily creates one boto3 client per service and hands it out on every call."""
+
+    def __init__(self, service_options=None, defaults=None):
+        self._defaults = dict(DEFAULT_CLIENT_OPTIONS)
+        self._defaults.update(defaults or {})
+        self._service_options = {k: dict(v) for k, v in SERVICE_CLIENT_OPTIONS.items()}
+        for service, options in (service_options or {}).items():
+            self._service_options.setdefault(service, {}).update(options)
+        self._clients = {}
+        self._registered = set()
+        self._guarded = {}
+        self._created = {}
+        self._reused = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    def configure(self, service, **options):
+        """
+        Override options for a service. Drops any client already built for it;
+        a registered (prebuilt or stubbed) client is kept.
+        """
+        with self._lock:
+            self._service_options.setdefault(service, {}).update(options)
+            if service in self._registered:
+                return
+            for key in [k for k in self._clients if k == service or (isinstance(k, tuple) and k[0] == service)]:
+                del self._clients[key]
+
+    def options_for(self, service):
+        options = dict(self._defaults)
+        options.update(self._service_options.get(service, {}))
+        options.update(_env_overrides(service))
+        return options
+
+    def get(self, service, read_timeout=None):
+        """
+        The client for `service`. A `read_timeout` (seconds) selects a
+        variant built with that timeout; registered clients serve every variant.
+        """
+        key = service if read_timeout is None or service in self._registered else (service, read_timeout)
+        client = self._clients.get(key)
+        if client is not None:
+            self._reused[service] = self._reused.get(service, 0) + 1
+            return client
+
+        with self._lock:
+            # Another thread may have created it while we waited
+            client = self._clients.get(key)
+            if client is None:
+                client = self.create(service, read_timeout)
+                self._clients[key] = client
+                self._created[service] = self._created.get(service, 0) + 1
+                return client
+        self._reused[service] = self._reused.get(service, 0) + 1
+        return client
+
+    def any_variant(self, service):
+        """
+        A client already built for `service`, whatever its read timeout, or
+        the default one. For calls that do not hit the network (presigned
+        URLs, paginators, client.meta), which need no particular timeout.
+        """
+        client = self._clients.get(service)
+        if client is None:
+            client = next((c for k, c in list(self._clients.items()) if isinstance(k, tuple) and k[0] == service), None)
+        return client if client is not None else self.get(service)
+
+    def guarded(self, service):
+        """Deadline / retry / circuit-breaker aware proxy for `service` (see lambda_common.resilience)."""
+        proxy = self._guarded.get(service)
+        if proxy is None:
+            proxy = self._guarded.setdefault(service, GuardedClient(self, service))
+        return proxy
+
+    def register(self, service, client):
+        """Install a prebuilt (or stubbed) client for a service."""
+        with self._lock:
+            for key in [k for k in self._clients if k == service or (isinstance(k, tuple) and k[0] == service)]:
+                del self._clients[key]
+            self._clients[service] = client
+            self._registered.add(service)
+
+    def reset(self):
+        with self._lock:
+            self._clients.clear()
+            self._registered.clear()
+            self._created.clear()
+            self._reused.clear()
+            self._session = None
+
+    def stats(self):
+        services = sorted(set(self._created) | set(self._reused))
+        return {
+            "created": sum(self._created.values()),
+            "reused": sum(self._reused.values()),
+            "services": {
+                s: {"created": self._created.get(s, 0), "reused": self._reused.get(s, 0)}
+                for s in services
+            },
+        }
+
+    def create(self, service, read_timeout=None):
+        """A new instrumented client for `service` with the registry's options; not cached."""
+        # boto3 is imported here so that importing this module stays cheap
+        import boto3
+        from botocore.config import Config
+
+        options = self.options_for(service)
+        if read_timeout is not None:
+            options["read_timeout"] = read_timeout
+        config = Config(
+            retries={"total_max_attempts": options["max_attempts"], "mode": "standard"},
+            **{k: options[k] for k in _BOTOCORE_CONFIG_KEYS if options.get(k) is not None}
+        )
+
+        # The default boto3 session is not thread safe, so clients come from
+        # a dedicated session created under the registry lock
+        if self._session is None:
+            self._session = boto3.session.Session()
+
+        log.info(
+            "Creating service client",
+            service=service,
+            region=options["region_name"] or "default",
+            read_timeout=options["read_timeout"]
+        )
+        started = time.perf_counter()
+        client = self._session.client(service, region_name=options["region_name"], config=config)
+        metrics.add("ClientInitMs", (time.perf_counter() - started) * 1000)
+        return instrument_client(client, service)
+
+
+client_registry = ClientRegistry()
+
+
+def get_client(service):
+    """
+    Return the container-wide client for `service`, creating it on first use.
+    API calls go through the deadline / retry / circuit-breaker policy.
+    """
+    return client_registry.guarded(service)
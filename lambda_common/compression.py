@@ -0,0 +1,144 @@
+"""
+Accept-Encoding negotiation for API responses.
+
+Batch labels, translations and pipeline results are tens of KB of JSON that
+compress 5-10x, so bodies above COMPRESSION_MIN_BYTES are compressed with
+brotli (when the brotli package is installed and the client accepts br) or
+gzip, and returned base64-encoded with isBase64Encoded set. API Gateway
+decodes them back to the compressed bytes on the wire. Small bodies are not
+worth the CPU and go out as they are.
+
+Every response that could have been compressed carries Vary:
+Accept-Encoding, so caches keep the encodings apart.
+
+Compression is off unless COMPRESSION_ENABLED=true. REST APIs (the app's
+execute-api .../Dev stage) only pass isBase64Encoded responses through as
+binary when the request's Accept header matches one of the API's binary
+media types; without that setup the browser receives the base64 text
+instead of JSON. Add */* to the binary media types before turning it on.
+HTTP APIs and Lambda function URLs need no setup.
+
+Settings (environment):
+    COMPRESSION_ENABLED         set to true to compress (default false, see above)
+    COMPRESSION_MIN_BYTES       smallest body that is compressed (default 1024)
+    COMPRESSION_GZIP_LEVEL      zlib level 1-9 (default 6)
+    COMPRESSION_BROTLI_QUALITY  brotli quality 0-11 (default 5)
+"""
+
+import binascii
+import os
+import zlib
+from functools import lru_cache
+
+from .metrics import metrics
+
+# zlib window bits for a gzip container
+GZIP_WBITS = 31
+# Preferred order when the client weighs several encodings the same
+ENCODINGS = ("br", "gzip")
+
+_brotli = None
+
+
+def brotli():
+    """The brotli module (brotli or brotlicffi), or None when neither is installed. Imported on first use."""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli as module
+        except ImportError:
+            try:
+                import brotlicffi as module
+            except ImportError:  # pragma: no cover - depends on the deployment package
+                module = False
+        _brotli = module
+    return _brotli or None
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def settings():
+    """(enabled, min bytes, gzip level, brotli quality) from the environment."""
+    return (
+        os.environ.get("COMPRESSION_ENABLED", "false").lower() in ("1", "true", "yes"),
+        _env_int("COMPRESSION_MIN_BYTES", 1024),
+        _env_int("COMPRESSION_GZIP_LEVEL", 6),
+        _env_int("COMPRESSION_BROTLI_QUALITY", 5),
+    )
+
+
+@lru_cache(maxsize=64)
+def negotiate(accept_encoding, brotli_available=True):
+    """
+    The encoding to use for an Accept-Encoding header value: "br", "gzip" or
+    None. q-values are honoured (q=0 refuses an encoding) and "*" stands for
+    any encoding not listed.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        if encoding == "br" and not brotli_available:
+            continue
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == "br":
+        return brotli().compress(data, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_response(response, accept_encoding):
+    """
+    `response` with its body compressed for `accept_encoding` when it is
+    large enough, otherwise unchanged (plus Vary when it could have been).
+    Binary and already-encoded responses are left alone.
+    """
+    enabled, min_bytes, gzip_level, brotli_quality = settings()
+    if not enabled or not isinstance(response, dict) or response.get("isBase64Encoded"):
+        return response
+    body = response.get("body")
+    headers = response.get("headers") or {}
+    if not isinstance(body, str) or len(body) < min_bytes or "Content-Encoding" in headers:
+        return response
+
+    data = body.encode("utf-8")
+    headers = dict(headers)
+    vary = headers.get("Vary")
+    headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    updates = {"headers": headers}
+    encoding = negotiate(accept_encoding, brotli() is not None)
+    if encoding is not None:
+        with metrics.timer("CompressMs"):
+            compressed = compress(data, encoding, gzip_level, brotli_quality)
+        # Compression that does not pay for itself (already dense bodies) is dropped
+        if len(compressed) < len(data):
+            metrics.add("UncompressedBytes", len(data))
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("ETag")
+            if etag:
+                # A strong ETag names one representation, so the encoded body gets its own
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            updates.update(body=binascii.b2a_base64(compressed, newline=False).decode("ascii"), isBase64Encoded=True)
+    return dict(response, **updates)
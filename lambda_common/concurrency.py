@@ -0,0 +1,51 @@
+"""
+Bounded fan-out helpers for calling AWS services concurrently.
+
+boto3 clients are thread safe and the calls are network bound, so a small
+thread pool gives near-linear speedups up to the client's connection pool.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = int(os.environ.get("AI_MAX_WORKERS", "8"))
+
+
+class ItemResult:
+    """Outcome of one item in a fan-out: either `value` or `error` is set."""
+
+    __slots__ = ("index", "value", "error")
+
+    def __init__(self, index, value=None, error=None):
+        self.index = index
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def map_bounded(fn, items, max_workers=None):
+    """
+    Apply `fn` to every item using at most `max_workers` threads.
+
+    Returns a list of ItemResult in input order. Exceptions are captured per
+    item so one failure does not abort the rest of the batch.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(index, item):
+        try:
+            return ItemResult(index, value=fn(item))
+        except Exception as e:
+            return ItemResult(index, error=e)
+
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(items))
+    if workers <= 1:
+        return [run(i, item) for i, item in enumerate(items)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, range(len(items)), items))
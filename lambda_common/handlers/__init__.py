@@ -0,0 +1,11 @@
+"""
+Route handlers for the API Gateway functions, one module per service area.
+
+Entry points (fixed-lambda.py and the standalone handler files) name them as
+"lambda_common.handlers.<module>:<function>" route targets, so a module and
+the service clients it uses are imported only when its first request
+arrives (see lambda_common.api).
+
+Every handler takes the parsed request body (plus path parameters) and
+returns an API Gateway proxy response.
+"""
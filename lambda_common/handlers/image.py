@@ -0,0 +1,81 @@
+"""Rekognition analysis of one image: /ai/image-analyze (S3 object or inline upload)."""
+
+from ..imaging import decode_base64_image, prepare_image
+from ..logs import log
+from ..metrics import metrics
+from ..responses import MISSING_BUCKET_OR_KEY, error_response, exception_response, json_response
+from ..vision import FEATURES as IMAGE_FEATURES, analyze_image
+
+
+def handle_image_analysis(body, default_max_labels=5):
+    """
+    Rekognition features for one image, run concurrently.
+    Request body: { bucket, key } or { image: base64 }, plus
+    { features?: ("labels" | "text" | "moderation")[], maxLabels?, minConfidence? }
+    Response: { labels?, text?, textLines?, moderation?, cached, timingsMs, errors, image? }
+
+    A raw image body (API Gateway binary media type, isBase64Encoded) is
+    accepted too, with the options in the query string
+    (?features=labels,text&maxLabels=10). Inline images are downscaled
+    before they are sent (see lambda_common.imaging) and the response
+    reports their size under `image`.
+
+    features defaults to ["labels"]. A failed feature is reported under errors
+    while the others still return; the request only fails if all of them do.
+    """
+    image_bytes = None
+    if "bodyBytes" in body:
+        if not body["contentType"].startswith("image/"):
+            return error_response(415, f"Unsupported content type: {body['contentType']}")
+        image_bytes = body["bodyBytes"]
+        body = dict(body["queryStringParameters"])
+        if body.get("features"):
+            body["features"] = body["features"].split(",")
+
+    bucket = body.get("bucket")
+    key = body.get("key")
+
+    if image_bytes is None and body.get("image") is not None:
+        image_bytes = body["image"]
+    if image_bytes is None and (not bucket or not key):
+        return MISSING_BUCKET_OR_KEY()
+
+    features = body.get("features") or ["labels"]
+    if not isinstance(features, list) or any(f not in IMAGE_FEATURES for f in features):
+        return error_response(400, f"features must be a list of {', '.join(IMAGE_FEATURES)}")
+    features = list(dict.fromkeys(features))
+
+    image_info = None
+    try:
+        if image_bytes is not None:
+            if isinstance(image_bytes, str):
+                image_bytes = decode_base64_image(image_bytes)
+            with metrics.timer("ImagePrepareMs"):
+                image_bytes, image_info = prepare_image(image_bytes)
+        analysis = analyze_image(
+            bucket,
+            key,
+            features,
+            max_labels=int(body.get("maxLabels", default_max_labels)),
+            min_confidence=float(body.get("minConfidence", 70)),
+            image_bytes=image_bytes
+        )
+    except Exception as e:
+        log.error("Error analyzing image", error=str(e))
+        return exception_response(e)
+
+    if len(analysis["errors"]) == len(features):
+        return exception_response(analysis["errors"][features[0]])
+
+    result = {}
+    for feature, value in analysis["results"].items():
+        if feature == "text":
+            result.update(value)
+        else:
+            result[feature] = value
+    result["cached"] = all(analysis["cached"].values())
+    result["timingsMs"] = analysis["timingsMs"]
+    result["errors"] = {feature: str(error) for feature, error in analysis["errors"].items()}
+    if image_info is not None:
+        result["image"] = image_info
+    return json_response(200, result)
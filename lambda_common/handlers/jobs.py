@@ -0,0 +1,124 @@
+"""
+Bulk image-analysis jobs: /ai/image-analyze/jobs and the jobs worker entry
+point (see lambda_common.jobs).
+"""
+
+import os
+import threading
+
+from ..jobs import JobError, SqsTrigger, backend_from_env, list_images, process_messages, run_worker, submit_job
+from ..logs import log
+from ..metrics import metrics
+from ..profiling import profiler
+from ..resilience import deadline
+from ..responses import MISSING_BUCKET_OR_KEY, error_response, exception_response, json_response
+from ..vision import detect_labels
+
+JOBS_MAX_ITEMS = int(os.environ.get("JOBS_MAX_ITEMS", "10000"))
+JOBS_WORKERS = int(os.environ.get("JOBS_WORKERS", "8"))
+# Local development only: drain the local queue in a background thread after submit
+JOBS_INLINE_WORKER = os.environ.get("JOBS_INLINE_WORKER", "false").lower() in ("1", "true", "yes")
+
+
+def analyze_job_image(bucket, key, params):
+    """Worker task for bulk jobs: same Rekognition path as /ai/image-analyze."""
+    result = detect_labels(
+        bucket,
+        key,
+        max_labels=int(params.get("maxLabels", 5)),
+        min_confidence=float(params.get("minConfidence", 70))
+    )
+    return {"labels": result["labels"]}
+
+
+def handle_image_job_submit(body):
+    """
+    Queue a bulk image-analysis job and return immediately.
+    Request body: { objects: [{ bucket, key }] } or { bucket, prefix }, plus optional maxLabels / minConfidence
+    Response (202): { jobId, status, total }
+    """
+    objects = body.get("objects")
+    try:
+        if objects is None and body.get("bucket") and body.get("prefix") is not None:
+            objects = list_images(body["bucket"], body["prefix"], JOBS_MAX_ITEMS)
+    except JobError as e:
+        return error_response(400, str(e))
+    except Exception as e:
+        log.error("Error listing job objects", error=str(e))
+        return exception_response(e)
+
+    if not isinstance(objects, list) or not objects:
+        return error_response(400, "Missing objects (or bucket and prefix) parameter")
+    if len(objects) > JOBS_MAX_ITEMS:
+        return error_response(400, f"Too many objects (max {JOBS_MAX_ITEMS})")
+    if not all(isinstance(o, dict) and o.get("bucket") and o.get("key") for o in objects):
+        return MISSING_BUCKET_OR_KEY()
+
+    params = {k: body[k] for k in ("maxLabels", "minConfidence") if k in body}
+    store, queue = backend_from_env()
+    try:
+        job_id = submit_job(store, queue, objects, params)
+    except Exception as e:
+        log.error("Error submitting image analysis job", error=str(e))
+        return exception_response(e)
+
+    if JOBS_INLINE_WORKER:
+        threading.Thread(
+            target=run_worker,
+            args=(store, queue, analyze_job_image),
+            kwargs={"max_workers": JOBS_WORKERS},
+            daemon=True
+        ).start()
+
+    return json_response(202, {"jobId": job_id, "status": "queued", "total": len(objects)})
+
+
+def handle_image_job_status(body, jobId):
+    """
+    Job progress plus one page of results.
+    Query string: cursor (index of the last result already seen), limit (default 100, max 1000)
+    """
+    # GET requests carry no body, so `body` is the raw event here
+    query = body.get("queryStringParameters") or {}
+    try:
+        cursor = int(query.get("cursor", -1))
+        limit = max(1, min(int(query.get("limit", 100)), 1000))
+    except ValueError:
+        return error_response(400, "cursor and limit must be integers")
+
+    store, _ = backend_from_env()
+    job = store.job(jobId)
+    if job is None:
+        return error_response(404, f"Job not found: {jobId}")
+
+    results, next_cursor = store.results(jobId, cursor=cursor, limit=limit)
+    job["results"] = results
+    job["nextCursor"] = next_cursor
+    return json_response(200, job)
+
+
+@profiler.instrument
+@metrics.instrument
+def jobs_worker_handler(event, context):
+    """
+    Separate Lambda entry point for job workers.
+    - SQS trigger (JOBS_BACKEND=sqs): processes the delivered records and
+      reports retryable tasks as batchItemFailures; Lambda deletes the rest.
+    - Scheduled / manual invocation: drains the queue until it is empty or
+      the invocation is close to its timeout.
+    """
+    log.start_request(event, context)
+    deadline.start(context)
+    metrics.set_route("jobs-worker")
+    store, queue = backend_from_env()
+
+    if event.get("Records"):
+        trigger = SqsTrigger(event["Records"])
+        outcome = process_messages(store, trigger, trigger.messages, analyze_job_image, max_workers=JOBS_WORKERS)
+        log.info("Processed job messages", succeeded=outcome["succeeded"], failed=outcome["failed"])
+        return {"batchItemFailures": [{"itemIdentifier": message_id} for _, _, message_id in outcome["retry"]]}
+
+    def should_continue():
+        return context is None or context.get_remaining_time_in_millis() > 30000
+
+    return run_worker(store, queue, analyze_job_image, max_workers=JOBS_WORKERS, should_continue=should_continue)
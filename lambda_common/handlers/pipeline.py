@@ -0,0 +1,94 @@
+"""Several text stages in one invocation: /ai/pipeline."""
+
+import time
+
+from ..concurrency import map_bounded
+from ..logs import log
+from ..responses import MISSING_TEXT, error_response, exception_response, json_response
+from ..translation import translate_long_text
+from .text import SENTIMENT_LANGUAGES, analyze_sentiment, comprehend_sample, detect_source_language
+
+PIPELINE_STAGES = ("detect-language", "translate", "sentiment")
+
+
+def handle_pipeline(body):
+    """
+    Several text stages for one text in a single invocation.
+    Request body: { text, stages?: ("detect-language" | "translate" | "sentiment")[], targetLanguage?, sourceLanguage? }
+    Response: { results: { <stage>: result }, errors: { <stage>: message }, timingsMs: { <stage>: ms } }
+
+    Language detection runs first whenever a later stage needs it (unless the
+    caller passes a sourceLanguage other than "auto"); the detected code
+    becomes Translate's source language and Comprehend's LanguageCode. Only
+    Comprehend's detection is used that way: a local guess is reported under
+    "detect-language" and Translate gets "auto", and when sentiment is
+    requested detection goes to Comprehend directly.
+    Translate and sentiment then run concurrently. If Comprehend cannot score the detected language,
+    sentiment runs on the translation instead. Texts may be as long as
+    Translate accepts; detection and sentiment see only the opening
+    COMPREHEND_MAX_TEXT_BYTES, which is all Comprehend takes.
+    """
+    text = body.get("text")
+    if not text:
+        return MISSING_TEXT()
+
+    stages = body.get("stages") or list(PIPELINE_STAGES)
+    if not isinstance(stages, list) or any(stage not in PIPELINE_STAGES for stage in stages):
+        return error_response(400, f"stages must be a list of {', '.join(PIPELINE_STAGES)}")
+    target_language = body.get("targetLanguage", "es")
+
+    results, errors, timings = {}, {}, {}
+
+    def run(stage, fn):
+        started = time.perf_counter()
+        try:
+            results[stage] = fn()
+        except Exception as e:
+            log.error("Pipeline stage failed", stage=stage, error=str(e))
+            errors[stage] = e
+        timings[stage] = round((time.perf_counter() - started) * 1000, 3)
+
+    language = body.get("sourceLanguage")
+    if language == "auto":
+        language = None
+    if "detect-language" in stages or (language is None and ("translate" in stages or "sentiment" in stages)):
+        # Sentiment needs an explicit LanguageCode, which a local guess cannot be trusted with
+        local = language is not None or "sentiment" not in stages
+        run("detect-language", lambda: detect_source_language(comprehend_sample(text), local=local))
+        if "detect-language" in results:
+            results["detect-language"], from_comprehend = results["detect-language"]
+            if language is None and from_comprehend:
+                language = results["detect-language"]["languageCode"]
+
+    def translate():
+        if language == target_language:
+            return {"translatedText": text, "chunks": 1, "sourceLanguage": language, "targetLanguage": target_language}
+        result = dict(translate_long_text(text, target_language, source_language=language or "auto"))
+        result.update(sourceLanguage=language or "auto", targetLanguage=target_language)
+        return result
+
+    def sentiment():
+        if language is None or language in SENTIMENT_LANGUAGES:
+            return dict(analyze_sentiment(comprehend_sample(text), language or "en"), languageCode=language or "en")
+        translated = results.get("translate")
+        if translated and target_language in SENTIMENT_LANGUAGES:
+            return dict(analyze_sentiment(comprehend_sample(translated["translatedText"]), target_language), languageCode=target_language)
+        raise ValueError(f"Sentiment is not supported for language {language}")
+
+    concurrent = [(stage, fn) for stage, fn in (("translate", translate), ("sentiment", sentiment)) if stage in stages]
+    if language is not None and language not in SENTIMENT_LANGUAGES and len(concurrent) == 2:
+        # Sentiment needs the translation first
+        for stage, fn in concurrent:
+            run(stage, fn)
+    else:
+        map_bounded(lambda task: run(*task), concurrent, max_workers=2)
+
+    requested = [stage for stage in stages if stage in results or stage in errors]
+    if requested and all(stage in errors for stage in requested):
+        return exception_response(errors[requested[0]])
+
+    return json_response(200, {
+        "results": {stage: results[stage] for stage in requested if stage in results},
+        "errors": {stage: str(errors[stage]) for stage in requested if stage in errors},
+        "timingsMs": timings
+    })
@@ -0,0 +1,26 @@
+"""Text to speech: /ai/polly."""
+
+from ..logs import log
+from ..responses import MISSING_TEXT, exception_response, json_response
+from ..speech import text_to_speech_url
+
+
+def handle_polly(body):
+    text = body.get("text")
+    language = body.get("language", "en")
+
+    if not text:
+        return MISSING_TEXT()
+
+    try:
+        result = text_to_speech_url(
+            text,
+            language=language,
+            voice_id=body.get("voiceId"),
+            engine=body.get("engine"),
+            output_format=body.get("format")
+        )
+        return json_response(200, result)
+    except Exception as e:
+        log.error("Error synthesizing speech", error=str(e))
+        return exception_response(e)
@@ -0,0 +1,240 @@
+"""
+Comprehend text endpoints: /ai/analyze and /ai/detect-language, plus their
+batch variants.
+"""
+
+import os
+
+from ..cache import ai_cache, make_key
+from ..clients import get_client
+from ..concurrency import map_bounded
+from ..langid import detect_language_locally, identifier
+from ..logs import log
+from ..metrics import metrics
+from ..responses import MISSING_TEXT, MISSING_TEXTS, error_response, exception_response, json_response
+from ..schemas import COMPREHEND_MAX_TEXT_BYTES
+from ..validation import utf8_len_over
+
+# Comprehend batch APIs accept at most 25 documents per call
+COMPREHEND_BATCH_SIZE = 25
+COMPREHEND_BATCH_MAX_ITEMS = int(os.environ.get("COMPREHEND_BATCH_MAX_ITEMS", "250"))
+COMPREHEND_BATCH_WORKERS = int(os.environ.get("COMPREHEND_BATCH_WORKERS", "4"))
+
+# Languages Comprehend detect_sentiment accepts
+SENTIMENT_LANGUAGES = {"en", "es", "fr", "de", "it", "pt", "ar", "hi", "ja", "ko", "zh", "zh-TW"}
+
+
+def handle_text_analysis(body):
+    text = body.get("text")
+    if not text:
+        return MISSING_TEXT()
+    
+    try:
+        result = analyze_sentiment(text)
+        ai_cache.log_stats("sentiment")
+
+        return json_response(200, result)
+    except Exception as e:
+        log.error("Error analyzing text", error=str(e))
+        return exception_response(e)
+
+
+def comprehend_sample(text):
+    """The opening COMPREHEND_MAX_TEXT_BYTES of text, cut on a character boundary."""
+    return text.encode("utf-8")[:COMPREHEND_MAX_TEXT_BYTES].decode("utf-8", errors="ignore")
+
+
+def analyze_sentiment(text, language_code="en"):
+    """Memoized Comprehend detect_sentiment for one text."""
+    def analyze():
+        comprehend = get_client("comprehend")
+        return sentiment_result(comprehend.detect_sentiment(Text=text, LanguageCode=language_code))
+
+    return ai_cache.get_or_compute(make_key("sentiment", text, language_code=language_code), analyze)
+
+
+def sentiment_result(response):
+    return {
+        "sentiment": response["Sentiment"],
+        "sentimentScore": response["SentimentScore"]
+    }
+
+
+def handle_text_analysis_batch(body):
+    """
+    Sentiment for many texts via batch_detect_sentiment.
+    Request body: { texts: string[] }
+    Response: { results: [{ sentiment, sentimentScore } | { error }] } in input order
+    """
+    def call_batch(chunk):
+        comprehend = get_client("comprehend")
+        return comprehend.batch_detect_sentiment(TextList=chunk, LanguageCode='en')
+
+    return handle_comprehend_batch(
+        body,
+        operation="sentiment",
+        cache_params={"language_code": "en"},
+        call_batch=call_batch,
+        to_result=sentiment_result,
+    )
+
+
+def handle_language_detection(body):
+    text = body.get("text")
+    
+    if not text:
+        return MISSING_TEXT()
+    
+    try:
+        result = detect_language(text)
+        ai_cache.log_stats("detect-language")
+
+        return json_response(200, result)
+    except Exception as e:
+        log.error("Error detecting language", error=str(e))
+        return exception_response(e)
+
+
+def detect_language(text):
+    """Local n-gram fast path for obvious cases, memoized Comprehend otherwise."""
+    return detect_source_language(text)[0]
+
+
+def detect_source_language(text, local=True):
+    """
+    Like detect_language, but returns (result, from_comprehend).
+
+    Only a Comprehend answer should become another call's explicit language
+    (Translate's SourceLanguageCode, Comprehend's LanguageCode): the local
+    identifier knows seven languages and can be confidently wrong for one it
+    has never seen. local=False skips the fast path.
+    """
+    if local:
+        result = detect_language_locally(text)
+        if result is not None:
+            metrics.increment("LocalLanguageHits")
+            return result, False
+
+    def detect():
+        comprehend = get_client("comprehend")
+        return language_result(comprehend.detect_dominant_language(Text=text))
+
+    return ai_cache.get_or_compute(make_key("detect-language", text), detect), True
+
+
+def language_result(response):
+    if response["Languages"]:
+        lang = response["Languages"][0]
+        return {
+            "language": lang["LanguageCode"],
+            "languageCode": lang["LanguageCode"],
+            "confidence": lang["Score"]
+        }
+
+    return {
+        "language": "en",
+        "languageCode": "en",
+        "confidence": 0.5
+    }
+
+
+def handle_language_detection_batch(body):
+    """
+    Dominant language for many texts via batch_detect_dominant_language.
+    Request body: { texts: string[] }
+    Response: { results: [{ language, languageCode, confidence } | { error }] } in input order
+    """
+    def call_batch(chunk):
+        comprehend = get_client("comprehend")
+        return comprehend.batch_detect_dominant_language(TextList=chunk)
+
+    return handle_comprehend_batch(
+        body,
+        operation="detect-language",
+        cache_params={},
+        call_batch=call_batch,
+        to_result=language_result,
+        local=detect_language_locally,
+    )
+
+
+def handle_comprehend_batch(body, operation, cache_params, call_batch, to_result, local=None):
+    """
+    Shared micro-batching for the Comprehend batch endpoints.
+
+    Documents that `local(text)` can answer, or that are cached, are answered
+    locally; the rest are grouped into chunks of COMPREHEND_BATCH_SIZE, sent
+    in parallel, and mapped back to their input position using the Index
+    returned in ResultList / ErrorList. Documents over Comprehend's size
+    limit get an error in their own slot up front, as Comprehend would
+    reject the whole chunk they are in.
+    """
+    texts = body.get("texts")
+
+    if not isinstance(texts, list) or not texts:
+        return MISSING_TEXTS()
+
+    if len(texts) > COMPREHEND_BATCH_MAX_ITEMS:
+        return error_response(400, f"Too many texts (max {COMPREHEND_BATCH_MAX_ITEMS})")
+
+    results = [None] * len(texts)
+    pending = []  # (input index, text, cache key)
+    for i, text in enumerate(texts):
+        if not text or not isinstance(text, str):
+            results[i] = {"error": "Missing text parameter"}
+            continue
+        if local is not None:
+            results[i] = local(text)
+            if results[i] is not None:
+                metrics.increment("LocalLanguageHits")
+                continue
+        if utf8_len_over(text, COMPREHEND_MAX_TEXT_BYTES):
+            results[i] = {"error": f"Text is longer than {COMPREHEND_MAX_TEXT_BYTES} bytes"}
+            continue
+        key = make_key(operation, text, **cache_params)
+        cached = ai_cache.get(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, text, key))
+
+    chunks = [pending[i:i + COMPREHEND_BATCH_SIZE] for i in range(0, len(pending), COMPREHEND_BATCH_SIZE)]
+    outcomes = map_bounded(
+        lambda chunk: call_batch([text for _, text, _ in chunk]),
+        chunks,
+        max_workers=COMPREHEND_BATCH_WORKERS,
+    )
+
+    for chunk, outcome in zip(chunks, outcomes):
+        if not outcome.ok:
+            log.error("Error in Comprehend batch", operation=operation, error=str(outcome.error))
+            for i, _, _ in chunk:
+                results[i] = {"error": str(outcome.error)}
+            continue
+
+        response = outcome.value
+        for item in response.get("ResultList", []):
+            i, _, key = chunk[item["Index"]]
+            results[i] = to_result(item)
+            ai_cache.set(key, results[i])
+        for item in response.get("ErrorList", []):
+            i, _, _ = chunk[item["Index"]]
+            results[i] = {"error": item.get("ErrorMessage") or item.get("ErrorCode", "Unknown error")}
+
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = {"error": "No result returned"}
+
+    ai_cache.log_stats(f"{operation}-batch")
+    failed = sum(1 for r in results if "error" in r)
+
+    return json_response(200, {
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed
+    })
+
+
+def warm_up():
+    """Build the local language profiles ahead of the first request (see lambda_common.warmup)."""
+    identifier.profiles
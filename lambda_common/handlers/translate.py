@@ -0,0 +1,149 @@
+"""Translation: /ai/translate and /ai/translate/batch."""
+
+import os
+import time
+
+from ..cache import ai_cache
+from ..concurrency import map_bounded
+from ..logs import log
+from ..responses import MISSING_TEXT, MISSING_TEXTS, error_response, exception_response, json_response
+from ..translation import translate_long_text
+from .text import comprehend_sample, detect_source_language
+
+TRANSLATE_BATCH_MAX_ITEMS = int(os.environ.get("TRANSLATE_BATCH_MAX_ITEMS", "100"))
+TRANSLATE_BATCH_WORKERS = int(os.environ.get("TRANSLATE_BATCH_WORKERS", "8"))
+TRANSLATE_TARGET_WORKERS = int(os.environ.get("TRANSLATE_TARGET_WORKERS", "8"))
+
+
+def handle_translation(body):
+    """
+    Request body: { text, targetLanguage?: string, targetLanguages?: string[], sourceLanguage?: string }
+    Response: { translatedText, chunks } for targetLanguage (default "es"),
+    or the handle_multi_translation response when targetLanguages is given.
+    """
+    text = body.get("text")
+    target_language = body.get("targetLanguage", "es")
+
+    if not text:
+        return MISSING_TEXT()
+
+    if body.get("targetLanguages"):
+        return handle_multi_translation(text, body["targetLanguages"], body.get("sourceLanguage"))
+
+    try:
+        result = translate_long_text(text, target_language, source_language=body.get("sourceLanguage") or "auto")
+        ai_cache.log_stats("translate")
+
+        return json_response(200, result)
+    except Exception as e:
+        log.error("Error translating text", error=str(e))
+        return exception_response(e)
+
+
+def handle_multi_translation(text, target_languages, source_language=None):
+    """
+    One text into several languages.
+    Response: { sourceLanguage, translations: { <lang>: { translatedText, chunks } },
+                skipped: [<lang>], errors: { <lang>: message }, timingsMs: { <lang>: ms } }
+
+    The source language is detected once (unless the caller passes a
+    sourceLanguage other than "auto") and given to every TranslateText call,
+    so Translate does not detect it again per target. Targets equal to the source are skipped;
+    the rest are translated concurrently. If detection fails, or only the
+    local identifier answered (it can be confidently wrong for a language it
+    does not know), every call gets "auto" and nothing is skipped.
+    """
+    errors, timings = {}, {}
+
+    if source_language in (None, "auto"):
+        source_language = None
+        started = time.perf_counter()
+        try:
+            # Comprehend's document limit; the opening of a long text is enough to tell its language
+            detected, from_comprehend = detect_source_language(comprehend_sample(text))
+            if from_comprehend:
+                source_language = detected["languageCode"]
+        except Exception as e:
+            log.error("Error detecting source language", error=str(e))
+            errors["detect-language"] = str(e)
+        timings["detect-language"] = round((time.perf_counter() - started) * 1000, 3)
+
+    targets = list(dict.fromkeys(target_languages))
+    skipped = [language for language in targets if language == source_language]
+    targets = [language for language in targets if language != source_language]
+
+    def translate(target_language):
+        started = time.perf_counter()
+        try:
+            return translate_long_text(text, target_language, source_language=source_language or "auto")
+        finally:
+            timings[target_language] = round((time.perf_counter() - started) * 1000, 3)
+
+    outcomes = map_bounded(translate, targets, max_workers=TRANSLATE_TARGET_WORKERS)
+    ai_cache.log_stats("translate-multi")
+
+    translations = {}
+    for target_language, outcome in zip(targets, outcomes):
+        if outcome.ok:
+            translations[target_language] = outcome.value
+        else:
+            log.error("Error translating text", targetLanguage=target_language, error=str(outcome.error))
+            errors[target_language] = outcome.error
+
+    failed = [o.error for o in outcomes if not o.ok]
+    if failed and len(failed) == len(outcomes):
+        return exception_response(failed[0])
+
+    return json_response(200, {
+        "sourceLanguage": source_language or "auto",
+        "translations": translations,
+        "skipped": skipped,
+        "errors": {key: str(error) for key, error in errors.items()},
+        "timingsMs": timings
+    })
+
+
+def handle_translation_batch(body):
+    """
+    Translate many strings in one invocation.
+    Request body: { texts: [string | { text, targetLanguage }], targetLanguage?: string }
+    Response: { results: [{ translatedText, targetLanguage } | { error }] } in input order
+    """
+    texts = body.get("texts")
+    default_target = body.get("targetLanguage", "es")
+
+    if not isinstance(texts, list) or not texts:
+        return MISSING_TEXTS()
+
+    if len(texts) > TRANSLATE_BATCH_MAX_ITEMS:
+        return error_response(400, f"Too many texts (max {TRANSLATE_BATCH_MAX_ITEMS})")
+
+    def translate_item(item):
+        if isinstance(item, dict):
+            text = item.get("text")
+            target_language = item.get("targetLanguage") or default_target
+        else:
+            text = item
+            target_language = default_target
+        if not text or not isinstance(text, str):
+            raise ValueError("Missing text parameter")
+        result = translate_long_text(text, target_language)
+        result["targetLanguage"] = target_language
+        return result
+
+    outcomes = map_bounded(translate_item, texts, max_workers=TRANSLATE_BATCH_WORKERS)
+    ai_cache.log_stats("translate-batch")
+
+    results = []
+    for outcome in outcomes:
+        if outcome.ok:
+            results.append(outcome.value)
+        else:
+            log.error("Error translating batch item", index=outcome.index, error=str(outcome.error))
+            results.append({"error": str(outcome.error)})
+
+    return json_response(200, {
+        "results": results,
+        "succeeded": sum(1 for o in outcomes if o.ok),
+        "failed": sum(1 for o in outcomes if not o.ok)
+    })
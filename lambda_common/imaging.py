@@ -0,0 +1,155 @@
+"""
+Inline image uploads for Rekognition Image={"Bytes": ...} calls.
+
+Phone photos are often 3-6 MB at 12 MP, more than Rekognition needs for
+labels, text or moderation (and above its 5 MB inline limit). prepare_image
+downscales them to IMAGE_MAX_DIMENSION pixels on the longer side and
+re-encodes as JPEG until they fit IMAGE_MAX_BYTES. Images already inside
+both limits are passed through as-is, without decoding.
+
+JPEG sources are shrunk while decoding (Pillow's draft mode lets libjpeg
+scale by 1/2, 1/4 or 1/8 in the DCT domain), so a 12 MP photo is never fully
+decoded just to be thrown away.
+
+Pillow is optional and only imported for the first upload. Without it
+images are passed through unchanged as long as they are JPEG or PNG within
+Rekognition's limit; larger ones are rejected with 413.
+
+Settings (environment):
+    IMAGE_MAX_DIMENSION     longer side after downscaling, in pixels (default 1600)
+    IMAGE_MAX_BYTES         target size of the bytes sent to Rekognition (default 1 MB)
+    IMAGE_JPEG_QUALITY      first JPEG quality tried when re-encoding (default 85)
+    IMAGE_MAX_UPLOAD_BYTES  largest decoded upload accepted (default 8 MB)
+"""
+
+import binascii
+import io
+import math
+import os
+
+# Rekognition's limit for Image.Bytes
+REKOGNITION_MAX_BYTES = 5 * 1024 * 1024
+MIN_JPEG_QUALITY = 50
+EXIF_ORIENTATION = 0x0112
+
+_pillow = None
+
+
+def pillow():
+    """(PIL.Image, PIL.ImageOps), or None when Pillow is not installed. Imported on first use."""
+    global _pillow
+    if _pillow is None:
+        try:
+            from PIL import Image, ImageOps
+            _pillow = (Image, ImageOps)
+        except ImportError:  # pragma: no cover - depends on the deployment package
+            _pillow = ()
+    return _pillow or None
+
+
+class ImageError(ValueError):
+    status_code = 400
+
+
+class ImageTooLargeError(ImageError):
+    status_code = 413
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def decode_base64_image(data):
+    """
+    Bytes of a base64 image string. A data URL prefix
+    ("data:image/jpeg;base64,...", as produced by FileReader) is accepted.
+    """
+    if not isinstance(data, str) or not data:
+        raise ImageError("image must be a base64 string")
+    if data.startswith("data:"):
+        data = data[data.find(",") + 1:]
+    try:
+        raw = binascii.a2b_base64(data)
+    except binascii.Error:
+        raise ImageError("image is not valid base64") from None
+    if not raw:
+        raise ImageError("image is empty")
+    return raw
+
+
+def image_format(data):
+    """'jpeg', 'png' or None, from the magic bytes."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    return None
+
+
+def prepare_image(data, max_dimension=None, max_bytes=None, quality=None):
+    """
+    (bytes for Rekognition, info) for an uploaded image. info has
+    originalBytes, bytes, format, resized and, when Pillow is available,
+    width / height after preparation.
+    """
+    max_dimension = max_dimension or _env_int("IMAGE_MAX_DIMENSION", 1600)
+    max_bytes = min(max_bytes or _env_int("IMAGE_MAX_BYTES", 1024 * 1024), REKOGNITION_MAX_BYTES)
+    quality = quality or _env_int("IMAGE_JPEG_QUALITY", 85)
+    max_upload = _env_int("IMAGE_MAX_UPLOAD_BYTES", 8 * 1024 * 1024)
+
+    if len(data) > max_upload:
+        raise ImageTooLargeError(f"Image is larger than {max_upload} bytes")
+    fmt = image_format(data)
+    info = {"originalBytes": len(data), "bytes": len(data), "format": fmt, "resized": False}
+
+    modules = pillow()
+    if modules is None:
+        if fmt is None:
+            raise ImageError("Only JPEG and PNG images are supported")
+        if len(data) > REKOGNITION_MAX_BYTES:
+            raise ImageTooLargeError(f"Image is larger than {REKOGNITION_MAX_BYTES} bytes and cannot be resized here")
+        return data, info
+
+    Image, ImageOps = modules
+    try:
+        image = Image.open(io.BytesIO(data))
+        width, height = image.size
+    except Exception:
+        raise ImageError("Image could not be read") from None
+
+    if fmt is not None and max(width, height) <= max_dimension and len(data) <= max_bytes:
+        info.update(width=width, height=height)
+        return data, info
+
+    if image.format == "JPEG":
+        # draft() keeps the image at least this big, so ask for the target size, not a square box
+        scale = min(1.0, max_dimension / max(width, height))
+        image.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+    try:
+        if max(width, height) > max_dimension:
+            image.thumbnail((max_dimension, max_dimension), Image.BILINEAR, reducing_gap=2.0)
+        # Rotate after shrinking: same result on far fewer pixels. The square
+        # thumbnail box means rotation cannot break the size limit.
+        if image.getexif().get(EXIF_ORIENTATION, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+    except Exception:
+        raise ImageError("Image could not be decoded") from None
+
+    dimension = max_dimension
+    while True:
+        if max(image.size) > dimension:
+            image.thumbnail((dimension, dimension), Image.BILINEAR, reducing_gap=2.0)
+        for q in range(quality, MIN_JPEG_QUALITY - 1, -10):
+            out = io.BytesIO()
+            image.save(out, "JPEG", quality=q)
+            if out.tell() <= max_bytes:
+                prepared = out.getvalue()
+                info.update(bytes=len(prepared), format="jpeg", resized=True, width=image.width, height=image.height, quality=q)
+                return prepared, info
+        # Still too big at the lowest quality: shrink further
+        dimension = int(max(image.size) * 0.75)
+        if dimension < 64:
+            raise ImageTooLargeError("Image cannot be reduced below the size limit")
@@ -0,0 +1,342 @@
+"""
+Asynchronous bulk image-analysis jobs.
+
+A job is a list of S3 objects to label. Submitting a job stores one task per
+object and returns a job id immediately; workers then pull tasks from a queue
+and run them with bounded concurrency, writing results back to the store.
+
+Two queue backends are available (JOBS_BACKEND):
+    local  tasks are claimed straight from the SQLite store. This is the
+           default, for local development and tests only: the store is a
+           file under /tmp, which each Lambda container has to itself, so
+           the status route and a separate worker function never see the
+           same job. Set JOBS_INLINE_WORKER=true to run jobs in the
+           submitting process.
+    sqs    task references are sent to JOBS_QUEUE_URL and consumed by an
+           SQS-triggered worker. The job store must then be shared between
+           containers (point JOBS_DB_PATH at an EFS mount).
+
+Other settings: JOBS_DB_PATH (default /tmp/image-jobs.sqlite3),
+JOBS_MAX_ITEMS (default 10000), JOBS_WORKERS (default 8),
+JOBS_VISIBILITY_TIMEOUT seconds before a running task is retried (default 300),
+JOBS_MAX_ATTEMPTS (default 3).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from .clients import get_client
+from .concurrency import map_bounded
+from .logs import log
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class JobError(Exception):
+    pass
+
+
+class JobStore:
+    """SQLite-backed job and task store."""
+
+    def __init__(self, path=":memory:", visibility_timeout=300, max_attempts=3):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, params TEXT NOT NULL, total INTEGER NOT NULL, created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                job_id TEXT NOT NULL, seq INTEGER NOT NULL, bucket TEXT NOT NULL, key TEXT NOT NULL,
+                status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, claimed REAL,
+                result TEXT, error TEXT, PRIMARY KEY (job_id, seq)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, claimed);
+            """
+        )
+
+    def create_job(self, objects, params=None):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO jobs (id, params, total, created) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(params or {}), len(objects), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO tasks (job_id, seq, bucket, key, status) VALUES (?, ?, ?, ?, 'pending')",
+                [(job_id, seq, obj["bucket"], obj["key"]) for seq, obj in enumerate(objects)],
+            )
+            self._conn.execute("COMMIT")
+        return job_id
+
+    def claim(self, limit):
+        """Mark up to `limit` pending (or timed-out running) tasks as running and return their refs."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, seq FROM tasks WHERE status = 'pending'"
+                " OR (status = 'running' AND claimed < ?) ORDER BY job_id, seq LIMIT ?",
+                (now - self.visibility_timeout, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'running', claimed = ? WHERE job_id = ? AND seq = ?",
+                [(now, job_id, seq) for job_id, seq in rows],
+            )
+        return rows
+
+    def start(self, job_id, seq):
+        """Fetch a task, mark it running and count the attempt; returns None if it is already finished."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT t.bucket, t.key, t.status, j.params FROM tasks t JOIN jobs j ON j.id = t.job_id"
+                " WHERE t.job_id = ? AND t.seq = ?",
+                (job_id, seq),
+            ).fetchone()
+            if row is None or row[2] in ("done", "failed"):
+                return None
+            self._conn.execute(
+                "UPDATE tasks SET status = 'running', claimed = ?, attempts = attempts + 1 WHERE job_id = ? AND seq = ?",
+                (time.time(), job_id, seq),
+            )
+        return {"bucket": row[0], "key": row[1], "params": json.loads(row[3])}
+
+    def complete(self, job_id, seq, result=None, error=None):
+        """Record a task outcome. Returns the new status; failures go back to 'pending' until max_attempts."""
+        with self._lock:
+            if error is None:
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'done', result = ?, error = NULL WHERE job_id = ? AND seq = ?",
+                    (json.dumps(result), job_id, seq),
+                )
+                return "done"
+            attempts = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE job_id = ? AND seq = ?", (job_id, seq)
+            ).fetchone()[0]
+            status = "failed" if attempts >= self.max_attempts else "pending"
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, error = ? WHERE job_id = ? AND seq = ?",
+                (status, error, job_id, seq),
+            )
+        return status
+
+    def job(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT total, created FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        total, created = row
+        done, failed = counts.get("done", 0), counts.get("failed", 0)
+        if done + failed == total:
+            status = "completed"
+        elif counts.get("running", 0) or done or failed:
+            status = "running"
+        else:
+            status = "queued"
+        return {
+            "jobId": job_id,
+            "status": status,
+            "total": total,
+            "completed": done,
+            "failed": failed,
+            "pending": total - done - failed,
+            "createdAt": created,
+        }
+
+    def results(self, job_id, cursor=-1, limit=100):
+        """Task results after `cursor` (a seq), in submission order; unfinished tasks are listed with their status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, bucket, key, status, result, error FROM tasks"
+                " WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, cursor, limit),
+            ).fetchall()
+        results = []
+        for seq, bucket, key, status, result, error in rows:
+            item = {"index": seq, "bucket": bucket, "key": key, "status": status}
+            if status == "done":
+                item.update(json.loads(result))
+            elif status == "failed":
+                item["error"] = error
+            results.append(item)
+        next_cursor = rows[-1][0] if len(rows) == limit else None
+        return results, next_cursor
+
+
+class LocalQueue:
+    """Queue backed by the store itself: pending rows are the queue."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def put(self, job_id, count):
+        pass  # tasks are already pending in the store
+
+    def get(self, max_items):
+        return [(job_id, seq, None) for job_id, seq in self.store.claim(max_items)]
+
+    def ack(self, receipt):
+        pass
+
+
+class SqsQueue:
+    """Sends one message per task to SQS; the store keeps task data and results."""
+
+    def __init__(self, store, queue_url):
+        self.store = store
+        self.queue_url = queue_url
+
+    def put(self, job_id, count):
+        sqs = get_client("sqs")
+        for start in range(0, count, 10):
+            entries = [
+                {"Id": str(seq), "MessageBody": json.dumps({"jobId": job_id, "seq": seq})}
+                for seq in range(start, min(start + 10, count))
+            ]
+            response = sqs.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            if response.get("Failed"):
+                raise JobError(f"Failed to enqueue {len(response['Failed'])} tasks")
+
+    def get(self, max_items):
+        sqs = get_client("sqs")
+        response = sqs.receive_message(QueueUrl=self.queue_url, MaxNumberOfMessages=min(max_items, 10))
+        return [self._parse(m["Body"], m["ReceiptHandle"]) for m in response.get("Messages", [])]
+
+    def ack(self, receipt):
+        if receipt is not None:
+            get_client("sqs").delete_message(QueueUrl=self.queue_url, ReceiptHandle=receipt)
+
+    @staticmethod
+    def _parse(body, receipt):
+        message = json.loads(body)
+        return message["jobId"], message["seq"], receipt
+
+
+class SqsTrigger:
+    """
+    Messages delivered to a Lambda by an SQS event-source mapping. Lambda
+    deletes every message of the batch that is not reported in
+    batchItemFailures, so nothing is deleted here and the receipt slot
+    carries the messageId to report instead.
+    """
+
+    def __init__(self, records):
+        self.messages = [SqsQueue._parse(record["body"], record["messageId"]) for record in records]
+
+    def ack(self, receipt):
+        pass
+
+
+def list_images(bucket, prefix, limit):
+    """S3 image objects under `prefix`, at most `limit` of them."""
+    s3 = get_client("s3")
+    objects = []
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if obj["Key"].lower().endswith(IMAGE_EXTENSIONS):
+                objects.append({"bucket": bucket, "key": obj["Key"]})
+                if len(objects) > limit:
+                    raise JobError(f"Too many objects under prefix (max {limit})")
+    return objects
+
+
+def submit_job(store, queue, objects, params=None):
+    job_id = store.create_job(objects, params)
+    queue.put(job_id, len(objects))
+    log.info("Submitted image analysis job", jobId=job_id, total=len(objects))
+    return job_id
+
+
+def process_messages(store, queue, messages, analyze, max_workers=8):
+    """
+    Run `analyze(bucket, key, params)` for each task ref.
+
+    Returns {"succeeded", "failed", "retry"} where `retry` lists the messages
+    whose task went back to pending; those are not acked so the queue can
+    redeliver them.
+    """
+    def ack(receipt):
+        # The outcome is already stored: a message that cannot be deleted is
+        # redelivered and then acked as finished, not run again
+        try:
+            queue.ack(receipt)
+        except Exception as e:
+            log.warning("Could not ack job message", error=str(e))
+
+    def run(message):
+        job_id, seq, receipt = message
+        task = store.start(job_id, seq)
+        if task is None:
+            ack(receipt)
+            return "done"
+        try:
+            result = analyze(task["bucket"], task["key"], task["params"])
+            status = store.complete(job_id, seq, result=result)
+        except Exception as e:
+            log.error("Image analysis task failed", jobId=job_id, seq=seq, error=str(e))
+            status = store.complete(job_id, seq, error=str(e))
+        if status != "pending":
+            ack(receipt)
+        return status
+
+    outcomes = map_bounded(run, messages, max_workers=max_workers)
+    statuses = [o.value if o.ok else "pending" for o in outcomes]
+    return {
+        "succeeded": statuses.count("done"),
+        "failed": statuses.count("failed"),
+        "retry": [m for m, status in zip(messages, statuses) if status == "pending"],
+    }
+
+
+def run_worker(store, queue, analyze, max_workers=8, batch_size=None, should_continue=None):
+    """
+    Drain the queue until it is empty or `should_continue()` returns False
+    (e.g. when the invocation is close to its timeout).
+    """
+    batch_size = batch_size or max_workers * 4
+    totals = {"succeeded": 0, "failed": 0, "retried": 0}
+    while should_continue is None or should_continue():
+        messages = queue.get(batch_size)
+        if not messages:
+            break
+        outcome = process_messages(store, queue, messages, analyze, max_workers=max_workers)
+        totals["succeeded"] += outcome["succeeded"]
+        totals["failed"] += outcome["failed"]
+        totals["retried"] += len(outcome["retry"])
+    log.info("Image analysis worker finished", **totals)
+    return totals
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_from_env():
+    """Container-wide (store, queue) pair configured from JOBS_* environment variables."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            store = JobStore(
+                path=os.environ.get("JOBS_DB_PATH", "/tmp/image-jobs.sqlite3"),
+                visibility_timeout=int(os.environ.get("JOBS_VISIBILITY_TIMEOUT", "300")),
+                max_attempts=int(os.environ.get("JOBS_MAX_ATTEMPTS", "3")),
+            )
+            if os.environ.get("JOBS_BACKEND", "local") == "sqs":
+                queue = SqsQueue(store, os.environ["JOBS_QUEUE_URL"])
+            else:
+                if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+                    log.warning("JOBS_BACKEND=local keeps jobs in this container only; use sqs on Lambda")
+                queue = LocalQueue(store)
+            _backend = (store, queue)
+        return _backend
@@ -0,0 +1,204 @@
+"""
+Embedded character n-gram language identifier.
+
+A fast path for /ai/detect-language: obvious cases (most task titles) are
+answered in-process, and only uncertain ones go to Comprehend. Profiles are
+built from lambda_common.langid_samples on first use and kept array-backed:
+one dict maps each 1-3 character n-gram to a row, and one array('f') per
+language holds that language's smoothed log-probability for every row, so a
+text is scored with one C-level gather and sum per language.
+
+Scores are summed per language and turned into a confidence with a
+softmax scaled by 1/sqrt(n-gram count), so confidence reflects how clearly
+one language wins rather than just how long the text is. Texts in languages
+the model does not know tend to still pick *some* winner, and for a close
+neighbour of a known language (Romanian for Italian, Afrikaans for Dutch)
+that winner is confident and covers most trigrams. So a local answer needs
+all of:
+
+- a winner that is a supported language: close neighbours have profiles of
+  their own (langid_samples.REJECT_SAMPLES) and win over their look-alike,
+  which sends the text to Comprehend
+- a lead over the runner-up of at least LANGID_MIN_MARGIN in log-likelihood
+  per n-gram, the margin that still separates the closest pairs
+- enough of the text's trigrams occurring in the winner's samples (a per-row
+  bitmask of which languages saw the n-gram)
+
+Settings (environment):
+    LANGID_ENABLED       set to false to always call Comprehend (default true)
+    LANGID_THRESHOLD     minimum confidence for a local answer (default 0.9)
+    LANGID_MIN_MARGIN    minimum lead over the runner-up per n-gram (default 0.08)
+    LANGID_MIN_COVERAGE  minimum share of trigrams seen in the winning language (default 0.5)
+    LANGID_MIN_CHARS     shorter texts always go to Comprehend (default 12)
+    LANGID_MAX_CHARS     only this much of a long text is scored (default 1000)
+"""
+
+import heapq
+import math
+import operator
+import os
+import threading
+import unicodedata
+from array import array
+
+MAX_ORDER = 3
+SMOOTHING = 0.5
+TEMPERATURE = 4.0
+
+
+def _normalize(text):
+    """Lowercase letters only, words separated (and padded) by single spaces."""
+    chars = []
+    for ch in unicodedata.normalize("NFC", text.lower()):
+        chars.append(ch if ch.isalpha() or ch == "'" else " ")
+    return " " + " ".join("".join(chars).split()) + " "
+
+
+def ngrams(text, max_order=MAX_ORDER):
+    text = _normalize(text)
+    for order in range(1, max_order + 1):
+        for i in range(len(text) - order + 1):
+            gram = text[i:i + order]
+            if gram.strip():
+                yield gram
+
+
+class LanguageProfiles:
+    """Array-backed n-gram log-probabilities for a fixed set of languages."""
+
+    def __init__(self, samples, max_order=MAX_ORDER):
+        self.languages = sorted(samples)
+        self.max_order = max_order
+        counts = {lang: {} for lang in self.languages}
+        for lang, text in samples.items():
+            for gram in ngrams(text, max_order):
+                counts[lang][gram] = counts[lang].get(gram, 0) + 1
+
+        vocabulary = sorted(set().union(*counts.values()))
+        self.rows = {gram: row for row, gram in enumerate(vocabulary)}
+        self.weights = [array("f", bytes(4 * len(vocabulary))) for _ in self.languages]
+        self.seen = array("I", bytes(4 * len(vocabulary)))  # bit per language
+
+        for column, lang in enumerate(self.languages):
+            for gram in counts[lang]:
+                self.seen[self.rows[gram]] |= 1 << column
+            per_order = {}
+            for gram, count in counts[lang].items():
+                per_order[len(gram)] = per_order.get(len(gram), 0) + count
+            vocab_by_order = {}
+            for gram in vocabulary:
+                vocab_by_order[len(gram)] = vocab_by_order.get(len(gram), 0) + 1
+            for gram, row in self.rows.items():
+                total = per_order.get(len(gram), 0) + SMOOTHING * vocab_by_order[len(gram)]
+                self.weights[column][row] = math.log((counts[lang].get(gram, 0) + SMOOTHING) / total)
+
+    def scores(self, text):
+        """
+        (per-language log-likelihoods, number of known n-grams,
+        per-language count of top-order n-grams seen in its samples, number of top-order n-grams).
+        """
+        rows = self.rows
+        seen = self.seen
+        known_rows = []
+        top_masks = {}  # bitmask -> number of top-order n-grams with it
+        top = 0
+        for gram in ngrams(text, self.max_order):
+            is_top = len(gram) == self.max_order
+            top += is_top
+            row = rows.get(gram)
+            if row is None:
+                continue
+            known_rows.append(row)
+            if is_top:
+                mask = seen[row]
+                top_masks[mask] = top_masks.get(mask, 0) + 1
+        if len(known_rows) > 1:
+            pick = operator.itemgetter(*known_rows)  # one C-level gather per language
+            totals = [math.fsum(pick(column)) for column in self.weights]
+        else:
+            totals = [math.fsum(column[row] for row in known_rows) for column in self.weights]
+        covered = [
+            sum(count for mask, count in top_masks.items() if mask >> column & 1)
+            for column in range(len(self.languages))
+        ]
+        return totals, len(known_rows), covered, top
+
+
+class LanguageIdentifier:
+    """
+    `samples` are the languages it answers for; `reject_samples` get
+    profiles too, but only so that texts in those languages lose to them
+    instead of being pinned on a close supported one.
+    """
+
+    def __init__(self, samples=None, reject_samples=None):
+        self._samples = samples
+        self._reject_samples = reject_samples
+        self._profiles = None
+        self._supported = None
+        self._lock = threading.Lock()
+
+    @property
+    def profiles(self):
+        if self._profiles is None:
+            with self._lock:
+                if self._profiles is None:
+                    samples, reject_samples = self._samples, self._reject_samples
+                    if samples is None:
+                        from .langid_samples import REJECT_SAMPLES, SAMPLES
+                        samples, reject_samples = SAMPLES, REJECT_SAMPLES
+                    self._supported = frozenset(samples)
+                    self._profiles = LanguageProfiles({**(reject_samples or {}), **samples})
+        return self._profiles
+
+    @property
+    def supported(self):
+        """Languages a local answer may name."""
+        self.profiles
+        return self._supported
+
+    def identify(self, text):
+        """
+        ([(language, confidence)] most likely first, trigram coverage of the
+        winner, the winner's lead over the runner-up in log-likelihood per
+        n-gram), or ([], 0.0, 0.0) when no n-gram of the text is known.
+        """
+        profiles = self.profiles
+        totals, known, covered, top = profiles.scores(text)
+        if not known:
+            return [], 0.0, 0.0
+        scale = TEMPERATURE / math.sqrt(known)
+        best, runner_up = heapq.nlargest(2, totals)
+        exps = [math.exp((t - best) * scale) for t in totals]
+        norm = sum(exps)
+        ranked = sorted(zip(profiles.languages, (e / norm for e in exps)), key=lambda p: p[1], reverse=True)
+        winner = profiles.languages.index(ranked[0][0])
+        return ranked, covered[winner] / top if top else 0.0, (best - runner_up) / known
+
+
+identifier = LanguageIdentifier()
+
+
+def detect_language_locally(text, threshold=None, min_coverage=None, min_chars=None, min_margin=None):
+    """
+    {"language", "languageCode", "confidence"} when the local model is
+    confident enough, otherwise None (the caller falls back to Comprehend).
+    """
+    if os.environ.get("LANGID_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    min_chars = int(os.environ.get("LANGID_MIN_CHARS", "12")) if min_chars is None else min_chars
+    if len(text.strip()) < min_chars:
+        return None
+    threshold = float(os.environ.get("LANGID_THRESHOLD", "0.9")) if threshold is None else threshold
+    if min_coverage is None:
+        min_coverage = float(os.environ.get("LANGID_MIN_COVERAGE", "0.5"))
+    if min_margin is None:
+        min_margin = float(os.environ.get("LANGID_MIN_MARGIN", "0.08"))
+
+    ranked, coverage, margin = identifier.identify(text[:int(os.environ.get("LANGID_MAX_CHARS", "1000"))])
+    if not ranked or ranked[0][0] not in identifier.supported:
+        return None
+    if ranked[0][1] < threshold or coverage < min_coverage or margin < min_margin:
+        return None
+    language, confidence = ranked[0]
+    return {"language": language, "languageCode": language, "confidence": round(confidence, 4)}
@@ -0,0 +1,283 @@
+"""
+Seed text for the local language identifier (lambda_common.langid).
+
+A few hundred words per language of everyday and task-management phrasing,
+which is what /ai/detect-language mostly sees. Character n-gram profiles are
+built from this text the first time they are needed.
+
+SAMPLES are the languages the model answers for. REJECT_SAMPLES are close
+neighbours of those (Romanian and Italian, Afrikaans and Dutch, Catalan and
+Spanish, Galician and Portuguese, Tagalog and its Spanish/English loans)
+that it only knows well enough to recognise: a text that scores best for
+one of them goes to Comprehend.
+"""
+
+SAMPLES = {
+    "en": """
+        Finish the quarterly report and send it to the team before the meeting on Friday.
+        Call the dentist to reschedule my appointment for next week.
+        Buy groceries: milk, bread, eggs, cheese and some fresh vegetables.
+        Review the pull request and leave comments about the new login flow.
+        Prepare the slides for the client presentation on Monday morning.
+        Remember to pay the electricity bill before the end of the month.
+        The weather is nice today, so we should take the dog for a long walk in the park.
+        Please update the project documentation with the latest changes to the API.
+        I think this task is more important than the others because the deadline is tomorrow.
+        Schedule a call with the marketing team to discuss the new campaign.
+        Clean the kitchen, do the laundry and water the plants in the garden.
+        Book flights and a hotel for the conference in September.
+        We need to fix the bug that causes the application to crash when the user uploads a photo.
+        Write a short summary of the meeting and share it with everyone who could not attend.
+        Check the budget and make sure that all invoices have been approved.
+        It would be great if you could help me with this before the weekend.
+        Organize the files on the shared drive and delete the old backups.
+        Pick up the kids from school at three o'clock and take them to football practice.
+        Thank you for your quick response, I really appreciate your help with this issue.
+        Our new feature lets users translate their tasks into other languages.
+    """,
+    "es": """
+        Terminar el informe trimestral y enviarlo al equipo antes de la reunión del viernes.
+        Llamar al dentista para cambiar mi cita para la próxima semana.
+        Comprar comida: leche, pan, huevos, queso y algunas verduras frescas.
+        Revisar la solicitud de cambios y dejar comentarios sobre el nuevo inicio de sesión.
+        Preparar las diapositivas para la presentación del cliente el lunes por la mañana.
+        Recuerda pagar la factura de la luz antes de que termine el mes.
+        Hoy hace buen tiempo, así que deberíamos llevar al perro a dar un paseo largo por el parque.
+        Por favor, actualiza la documentación del proyecto con los últimos cambios de la API.
+        Creo que esta tarea es más importante que las otras porque la fecha límite es mañana.
+        Programar una llamada con el equipo de marketing para hablar de la nueva campaña.
+        Limpiar la cocina, lavar la ropa y regar las plantas del jardín.
+        Reservar los vuelos y un hotel para la conferencia de septiembre.
+        Tenemos que corregir el error que hace que la aplicación se cierre cuando el usuario sube una foto.
+        Escribir un resumen corto de la reunión y compartirlo con todos los que no pudieron asistir.
+        Revisar el presupuesto y asegurarse de que todas las facturas estén aprobadas.
+        Sería genial si pudieras ayudarme con esto antes del fin de semana.
+        Organizar los archivos en la carpeta compartida y borrar las copias de seguridad antiguas.
+        Recoger a los niños del colegio a las tres y llevarlos al entrenamiento de fútbol.
+        Gracias por tu respuesta rápida, de verdad agradezco tu ayuda con este problema.
+        Nuestra nueva función permite a los usuarios traducir sus tareas a otros idiomas.
+    """,
+    "fr": """
+        Terminer le rapport trimestriel et l'envoyer à l'équipe avant la réunion de vendredi.
+        Appeler le dentiste pour déplacer mon rendez-vous à la semaine prochaine.
+        Faire les courses : lait, pain, œufs, fromage et quelques légumes frais.
+        Relire la demande de fusion et laisser des commentaires sur la nouvelle connexion.
+        Préparer les diapositives pour la présentation du client lundi matin.
+        N'oublie pas de payer la facture d'électricité avant la fin du mois.
+        Il fait beau aujourd'hui, alors nous devrions emmener le chien faire une longue promenade au parc.
+        Merci de mettre à jour la documentation du projet avec les derniers changements de l'API.
+        Je pense que cette tâche est plus importante que les autres parce que l'échéance est demain.
+        Organiser un appel avec l'équipe marketing pour parler de la nouvelle campagne.
+        Nettoyer la cuisine, faire la lessive et arroser les plantes du jardin.
+        Réserver les vols et un hôtel pour la conférence en septembre.
+        Nous devons corriger le bogue qui fait planter l'application quand l'utilisateur envoie une photo.
+        Rédiger un court résumé de la réunion et le partager avec tous ceux qui n'ont pas pu venir.
+        Vérifier le budget et s'assurer que toutes les factures ont été approuvées.
+        Ce serait génial si tu pouvais m'aider avec ça avant le week-end.
+        Ranger les fichiers sur le disque partagé et supprimer les anciennes sauvegardes.
+        Aller chercher les enfants à l'école à trois heures et les emmener à l'entraînement de football.
+        Merci pour ta réponse rapide, j'apprécie vraiment ton aide pour ce problème.
+        Notre nouvelle fonctionnalité permet aux utilisateurs de traduire leurs tâches dans d'autres langues.
+    """,
+    "de": """
+        Den Quartalsbericht fertigstellen und vor dem Treffen am Freitag an das Team schicken.
+        Den Zahnarzt anrufen und meinen Termin auf nächste Woche verschieben.
+        Einkaufen: Milch, Brot, Eier, Käse und etwas frisches Gemüse.
+        Den Pull Request prüfen und Kommentare zum neuen Anmeldeablauf hinterlassen.
+        Die Folien für die Kundenpräsentation am Montagmorgen vorbereiten.
+        Denk daran, die Stromrechnung vor dem Ende des Monats zu bezahlen.
+        Heute ist schönes Wetter, also sollten wir mit dem Hund einen langen Spaziergang im Park machen.
+        Bitte aktualisiere die Projektdokumentation mit den neuesten Änderungen an der Schnittstelle.
+        Ich glaube, diese Aufgabe ist wichtiger als die anderen, weil die Frist morgen abläuft.
+        Einen Anruf mit dem Marketingteam planen, um über die neue Kampagne zu sprechen.
+        Die Küche putzen, die Wäsche waschen und die Pflanzen im Garten gießen.
+        Flüge und ein Hotel für die Konferenz im September buchen.
+        Wir müssen den Fehler beheben, durch den die Anwendung abstürzt, wenn der Benutzer ein Foto hochlädt.
+        Eine kurze Zusammenfassung der Besprechung schreiben und mit allen teilen, die nicht dabei sein konnten.
+        Das Budget überprüfen und sicherstellen, dass alle Rechnungen genehmigt wurden.
+        Es wäre toll, wenn du mir vor dem Wochenende dabei helfen könntest.
+        Die Dateien auf dem gemeinsamen Laufwerk ordnen und die alten Sicherungen löschen.
+        Die Kinder um drei Uhr von der Schule abholen und zum Fußballtraining bringen.
+        Danke für deine schnelle Antwort, ich weiß deine Hilfe bei diesem Problem wirklich zu schätzen.
+        Mit unserer neuen Funktion können Benutzer ihre Aufgaben in andere Sprachen übersetzen.
+    """,
+    "it": """
+        Finire il rapporto trimestrale e inviarlo al gruppo prima della riunione di venerdì.
+        Chiamare il dentista per spostare il mio appuntamento alla prossima settimana.
+        Fare la spesa: latte, pane, uova, formaggio e un po' di verdura fresca.
+        Controllare la richiesta di modifica e lasciare commenti sul nuovo accesso.
+        Preparare le diapositive per la presentazione al cliente lunedì mattina.
+        Ricordati di pagare la bolletta della luce prima della fine del mese.
+        Oggi è una bella giornata, quindi dovremmo portare il cane a fare una lunga passeggiata nel parco.
+        Per favore aggiorna la documentazione del progetto con le ultime modifiche all'API.
+        Penso che questo compito sia più importante degli altri perché la scadenza è domani.
+        Organizzare una chiamata con il gruppo marketing per parlare della nuova campagna.
+        Pulire la cucina, fare il bucato e innaffiare le piante del giardino.
+        Prenotare i voli e un albergo per la conferenza di settembre.
+        Dobbiamo correggere l'errore che fa chiudere l'applicazione quando l'utente carica una foto.
+        Scrivere un breve riassunto della riunione e condividerlo con tutti quelli che non sono potuti venire.
+        Controllare il bilancio e assicurarsi che tutte le fatture siano state approvate.
+        Sarebbe fantastico se potessi aiutarmi con questo prima del fine settimana.
+        Ordinare i file nella cartella condivisa e cancellare i vecchi backup.
+        Prendere i bambini a scuola alle tre e portarli all'allenamento di calcio.
+        Grazie per la tua risposta veloce, apprezzo davvero il tuo aiuto con questo problema.
+        La nostra nuova funzione permette agli utenti di tradurre le loro attività in altre lingue.
+    """,
+    "pt": """
+        Terminar o relatório trimestral e enviá-lo para a equipe antes da reunião de sexta-feira.
+        Ligar para o dentista para remarcar a minha consulta para a próxima semana.
+        Fazer compras: leite, pão, ovos, queijo e alguns legumes frescos.
+        Revisar o pedido de alteração e deixar comentários sobre o novo acesso.
+        Preparar os slides para a apresentação do cliente na segunda-feira de manhã.
+        Lembre-se de pagar a conta de luz antes do fim do mês.
+        Hoje o tempo está bom, então devíamos levar o cachorro para um passeio longo no parque.
+        Por favor, atualize a documentação do projeto com as últimas mudanças da API.
+        Acho que esta tarefa é mais importante do que as outras porque o prazo termina amanhã.
+        Marcar uma chamada com a equipe de marketing para falar sobre a nova campanha.
+        Limpar a cozinha, lavar a roupa e regar as plantas do jardim.
+        Reservar os voos e um hotel para a conferência de setembro.
+        Precisamos corrigir o erro que faz o aplicativo fechar quando o usuário envia uma foto.
+        Escrever um resumo curto da reunião e compartilhá-lo com todos que não puderam participar.
+        Verificar o orçamento e garantir que todas as faturas foram aprovadas.
+        Seria ótimo se você pudesse me ajudar com isso antes do fim de semana.
+        Organizar os arquivos na pasta compartilhada e apagar as cópias de segurança antigas.
+        Buscar as crianças na escola às três horas e levá-las ao treino de futebol.
+        Obrigado pela sua resposta rápida, agradeço muito a sua ajuda com este problema.
+        Nossa nova função permite que os usuários traduzam suas tarefas para outros idiomas.
+    """,
+    "nl": """
+        Het kwartaalrapport afmaken en voor de vergadering van vrijdag naar het team sturen.
+        De tandarts bellen om mijn afspraak naar volgende week te verzetten.
+        Boodschappen doen: melk, brood, eieren, kaas en wat verse groenten.
+        Het pull request nakijken en opmerkingen achterlaten over het nieuwe inloggen.
+        De dia's voorbereiden voor de presentatie bij de klant op maandagochtend.
+        Vergeet niet de energierekening voor het einde van de maand te betalen.
+        Het is mooi weer vandaag, dus we moeten met de hond een lange wandeling in het park maken.
+        Werk alsjeblieft de projectdocumentatie bij met de laatste wijzigingen in de API.
+        Ik denk dat deze taak belangrijker is dan de andere omdat de deadline morgen is.
+        Een gesprek plannen met het marketingteam om de nieuwe campagne te bespreken.
+        De keuken schoonmaken, de was doen en de planten in de tuin water geven.
+        Vluchten en een hotel boeken voor de conferentie in september.
+        We moeten de fout oplossen waardoor de applicatie crasht als de gebruiker een foto uploadt.
+        Een korte samenvatting van de vergadering schrijven en delen met iedereen die er niet bij kon zijn.
+        Het budget controleren en zorgen dat alle facturen zijn goedgekeurd.
+        Het zou fijn zijn als je me hiermee kunt helpen voor het weekend.
+        De bestanden op de gedeelde schijf ordenen en de oude back-ups verwijderen.
+        De kinderen om drie uur van school halen en naar de voetbaltraining brengen.
+        Bedankt voor je snelle antwoord, ik waardeer je hulp bij dit probleem echt.
+        Met onze nieuwe functie kunnen gebruikers hun taken naar andere talen vertalen.
+    """,
+}
+
+REJECT_SAMPLES = {
+    "ro": """
+        Termină raportul trimestrial și trimite-l echipei înainte de ședința de vineri.
+        Sună la dentist ca să muți programarea mea pe săptămâna viitoare.
+        Cumpără alimente: lapte, pâine, ouă, brânză și niște legume proaspete.
+        Verifică cererea de modificare și lasă comentarii despre noul flux de autentificare.
+        Pregătește prezentarea pentru client pentru luni dimineață.
+        Nu uita să plătești factura la curent înainte de sfârșitul lunii.
+        Vremea este frumoasă azi, așa că ar trebui să scoatem câinele la o plimbare lungă în parc.
+        Te rog să actualizezi documentația proiectului cu ultimele modificări ale API-ului.
+        Cred că această sarcină este mai importantă decât celelalte pentru că termenul limită este mâine.
+        Programează un apel cu echipa de marketing ca să discutăm noua campanie.
+        Curăță bucătăria, spală rufele și udă plantele din grădină.
+        Rezervă zboruri și un hotel pentru conferința din septembrie.
+        Trebuie să reparăm eroarea care face ca aplicația să se blocheze când utilizatorul încarcă o fotografie.
+        Scrie un scurt rezumat al ședinței și trimite-l tuturor celor care nu au putut participa.
+        Verifică bugetul și asigură-te că toate facturile au fost aprobate.
+        Ar fi minunat dacă m-ai putea ajuta cu asta înainte de weekend.
+        Organizează fișierele de pe discul comun și șterge copiile de rezervă vechi.
+        Ia copiii de la școală la ora trei și du-i la antrenamentul de fotbal.
+        Îți mulțumesc pentru răspunsul rapid, apreciez foarte mult ajutorul tău cu această problemă.
+        Noua noastră funcție le permite utilizatorilor să își traducă sarcinile în alte limbi.
+    """,
+    "af": """
+        Maak die kwartaalverslag klaar en stuur dit voor die vergadering op Vrydag aan die span.
+        Bel die tandarts om my afspraak na volgende week te skuif.
+        Koop kruideniersware: melk, brood, eiers, kaas en 'n paar vars groente.
+        Hersien die versoek en lewer kommentaar oor die nuwe aanmeldproses.
+        Berei die skyfies voor vir die aanbieding aan die kliënt op Maandagoggend.
+        Onthou om die elektrisiteitsrekening voor die einde van die maand te betaal.
+        Die weer is vandag mooi, so ons moet die hond vir 'n lang stap in die park neem.
+        Werk asseblief die projekdokumentasie by met die nuutste veranderinge aan die API.
+        Ek dink hierdie taak is belangriker as die ander, want die sperdatum is môre.
+        Reël 'n oproep met die bemarkingspan om die nuwe veldtog te bespreek.
+        Maak die kombuis skoon, was die wasgoed en gee die plante in die tuin water.
+        Bespreek vlugte en 'n hotel vir die konferensie in September.
+        Ons moet die fout regmaak wat veroorsaak dat die toepassing ineenstort wanneer die gebruiker 'n foto oplaai.
+        Skryf 'n kort opsomming van die vergadering en deel dit met almal wat nie kon bywoon nie.
+        Kontroleer die begroting en maak seker dat alle fakture goedgekeur is.
+        Dit sal wonderlik wees as jy my voor die naweek hiermee kan help.
+        Sorteer die lêers op die gedeelde skyf en vee die ou rugsteune uit.
+        Haal die kinders om drie-uur by die skool af en neem hulle na sokkeroefening.
+        Dankie vir jou vinnige antwoord, ek waardeer jou hulp met hierdie probleem regtig.
+        Met ons nuwe funksie kan gebruikers hul take in ander tale vertaal.
+    """,
+    "ca": """
+        Acabar l'informe trimestral i enviar-lo a l'equip abans de la reunió de divendres.
+        Trucar al dentista per canviar la meva cita per a la setmana que ve.
+        Comprar menjar: llet, pa, ous, formatge i algunes verdures fresques.
+        Revisar la sol·licitud de canvis i deixar comentaris sobre el nou inici de sessió.
+        Preparar les diapositives per a la presentació del client dilluns al matí.
+        Recorda pagar la factura de la llum abans que s'acabi el mes.
+        Avui fa bon temps, així que hauríem de portar el gos a fer una passejada llarga pel parc.
+        Si us plau, actualitza la documentació del projecte amb els últims canvis de l'API.
+        Crec que aquesta tasca és més important que les altres perquè el termini és demà.
+        Programar una trucada amb l'equip de màrqueting per parlar de la nova campanya.
+        Netejar la cuina, rentar la roba i regar les plantes del jardí.
+        Reservar vols i un hotel per a la conferència de setembre.
+        Hem d'arreglar l'error que fa que l'aplicació es tanqui quan l'usuari puja una foto.
+        Escriure un resum breu de la reunió i compartir-lo amb tothom que no hi va poder assistir.
+        Revisar el pressupost i assegurar-se que totes les factures s'han aprovat.
+        Seria genial si em poguessis ajudar amb això abans del cap de setmana.
+        Organitzar els fitxers de la unitat compartida i esborrar les còpies de seguretat antigues.
+        Recollir els nens de l'escola a les tres i portar-los a l'entrenament de futbol.
+        Gràcies per la teva resposta ràpida, t'agraeixo molt l'ajuda amb aquest problema.
+        La nostra nova funció permet als usuaris traduir les seves tasques a altres idiomes.
+    """,
+    "gl": """
+        Rematar o informe trimestral e envialo ao equipo antes da reunión do venres.
+        Chamar ao dentista para cambiar a miña cita para a semana que vén.
+        Mercar comida: leite, pan, ovos, queixo e algunhas verduras frescas.
+        Revisar a solicitude de cambios e deixar comentarios sobre o novo inicio de sesión.
+        Preparar as diapositivas para a presentación do cliente o luns pola mañá.
+        Lembra pagar a factura da luz antes de que remate o mes.
+        Hoxe vai bo tempo, así que deberiamos levar o can a dar un paseo longo polo parque.
+        Por favor, actualiza a documentación do proxecto cos últimos cambios da API.
+        Coido que esta tarefa é máis importante ca as outras porque o prazo remata mañá.
+        Programar unha chamada co equipo de márketing para falar da nova campaña.
+        Limpar a cociña, lavar a roupa e regar as plantas do xardín.
+        Reservar voos e un hotel para a conferencia de setembro.
+        Temos que arranxar o erro que fai que a aplicación se peche cando o usuario sobe unha foto.
+        Escribir un resumo breve da reunión e compartilo con todas as persoas que non puideron asistir.
+        Revisar o orzamento e asegurarse de que todas as facturas foron aprobadas.
+        Sería xenial se me puideses axudar con isto antes da fin de semana.
+        Organizar os ficheiros da unidade compartida e borrar as copias de seguridade vellas.
+        Recoller os nenos da escola ás tres e levalos ao adestramento de fútbol.
+        Grazas pola túa resposta rápida, agradezo moito a túa axuda con este problema.
+        A nosa nova función permite aos usuarios traducir as súas tarefas a outras linguas.
+    """,
+    "tl": """
+        Tapusin ang quarterly report at ipadala ito sa team bago ang pulong sa Biyernes.
+        Tawagan ang dentista para ilipat ang appointment ko sa susunod na linggo.
+        Bumili ng pagkain: gatas, tinapay, itlog, keso at ilang sariwang gulay.
+        Suriin ang pull request at mag-iwan ng mga komento tungkol sa bagong paraan ng pag-login.
+        Ihanda ang mga slide para sa presentasyon sa kliyente sa Lunes ng umaga.
+        Huwag kalimutang bayaran ang bill sa kuryente bago matapos ang buwan.
+        Maganda ang panahon ngayon, kaya dapat nating ilakad ang aso nang matagal sa parke.
+        Pakiusap, i-update ang dokumentasyon ng proyekto gamit ang mga pinakabagong pagbabago sa API.
+        Sa tingin ko mas mahalaga ang gawaing ito kaysa sa iba dahil bukas na ang deadline.
+        Mag-iskedyul ng tawag kasama ang marketing team para pag-usapan ang bagong kampanya.
+        Linisin ang kusina, maglaba at diligan ang mga halaman sa hardin.
+        Mag-book ng mga flight at hotel para sa kumperensya sa Setyembre.
+        Kailangan nating ayusin ang bug na nagpapasara sa application kapag nag-upload ng larawan ang user.
+        Sumulat ng maikling buod ng pulong at ibahagi ito sa lahat ng hindi nakadalo.
+        Suriin ang badyet at siguraduhing naaprubahan na ang lahat ng invoice.
+        Napakaganda kung matutulungan mo ako rito bago mag-weekend.
+        Ayusin ang mga file sa shared drive at burahin ang mga lumang backup.
+        Sunduin ang mga bata sa paaralan nang alas-tres at dalhin sila sa football practice.
+        Salamat sa mabilis mong sagot, talagang pinahahalagahan ko ang tulong mo sa problemang ito.
+        Sa aming bagong feature, maisasalin ng mga user ang kanilang mga gawain sa ibang wika.
+    """,
+}
@@ -0,0 +1,127 @@
+"""
+Structured, lazy logging for the Lambda handlers.
+
+Every line is one JSON object carrying the request id and elapsed time.
+Fields are only serialized when the level is enabled; callables passed as
+field values are evaluated lazily. Full payloads (events, bodies, results)
+are only logged for a sampled fraction of requests, with long strings
+truncated and sensitive keys redacted to keep CloudWatch ingestion bounded.
+
+Settings (environment):
+    LOG_PAYLOAD_SAMPLE_RATE  fraction of requests whose payloads are logged (default 0.01)
+    LOG_PAYLOAD_MAX_BYTES    byte budget for one logged payload (default 2048)
+    LOG_FIELD_MAX_BYTES      byte budget for one string inside a payload (default 256)
+    LOG_REDACT_FIELDS        comma separated keys whose values are replaced (case-insensitive)
+"""
+
+import json
+import logging
+import os
+import random
+import time
+
+DEFAULT_REDACT_FIELDS = "authorization,x-api-key,x-amz-security-token,cookie,imagebytes,image"
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def truncate_utf8(text, max_bytes):
+    """Cut `text` to at most `max_bytes` of UTF-8, marking how much was dropped."""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    kept = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}...[+{len(encoded) - len(kept.encode('utf-8'))} bytes]"
+
+
+class StructuredLogger:
+    def __init__(self, logger=None, sample_rate=None, max_payload_bytes=None, max_field_bytes=None, redact_fields=None):
+        self.logger = logger or logging.getLogger()
+        self.sample_rate = _env_float("LOG_PAYLOAD_SAMPLE_RATE", 0.01) if sample_rate is None else sample_rate
+        self.max_payload_bytes = _env_int("LOG_PAYLOAD_MAX_BYTES", 2048) if max_payload_bytes is None else max_payload_bytes
+        self.max_field_bytes = _env_int("LOG_FIELD_MAX_BYTES", 256) if max_field_bytes is None else max_field_bytes
+        if redact_fields is None:
+            redact_fields = os.environ.get("LOG_REDACT_FIELDS", DEFAULT_REDACT_FIELDS).split(",")
+        self.redact_fields = {f.strip().lower() for f in redact_fields if f.strip()}
+        self.request_id = None
+        self.sampled = False
+        self._start = time.perf_counter()
+
+    def start_request(self, event=None, context=None):
+        """Reset per-request state. Call first thing in lambda_handler."""
+        self._start = time.perf_counter()
+        request_id = getattr(context, "aws_request_id", None)
+        if request_id is None and isinstance(event, dict):
+            request_id = (event.get("requestContext") or {}).get("requestId")
+        self.request_id = request_id
+        self.sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self._start) * 1000, 3)
+
+    def debug(self, message, **fields):
+        self._emit(logging.DEBUG, message, fields)
+
+    def info(self, message, **fields):
+        self._emit(logging.INFO, message, fields)
+
+    def warning(self, message, **fields):
+        self._emit(logging.WARNING, message, fields)
+
+    def error(self, message, **fields):
+        self._emit(logging.ERROR, message, fields)
+
+    def payload(self, message, payload, level=logging.INFO, **fields):
+        """Log a (possibly large) payload for sampled requests only."""
+        if not self.sampled or not self.logger.isEnabledFor(level):
+            return
+        fields["payload"] = lambda: self.compact(payload)
+        self._emit(level, message, fields)
+
+    def compact(self, value):
+        """Redact, truncate strings, and fit the whole value into the payload budget."""
+        value = self._shrink(value)
+        encoded = json.dumps(value, default=str, separators=(",", ":"), ensure_ascii=False)
+        if len(encoded.encode("utf-8")) <= self.max_payload_bytes:
+            return value
+        return {"truncated": truncate_utf8(encoded, self.max_payload_bytes)}
+
+    def _shrink(self, value, depth=0):
+        if isinstance(value, str):
+            return truncate_utf8(value, self.max_field_bytes)
+        if depth > 6:
+            return "..."
+        if isinstance(value, dict):
+            return {
+                k: "[redacted]" if str(k).lower() in self.redact_fields else self._shrink(v, depth + 1)
+                for k, v in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._shrink(v, depth + 1) for v in value]
+        if isinstance(value, (bytes, bytearray)):
+            return f"<{len(value)} bytes>"
+        return value
+
+    def _emit(self, level, message, fields):
+        if not self.logger.isEnabledFor(level):
+            return
+        record = {
+            "level": logging.getLevelName(level),
+            "message": message,
+            "requestId": self.request_id,
+            "elapsedMs": self.elapsed_ms(),
+        }
+        for key, value in fields.items():
+            record[key] = value() if callable(value) else value
+        self.logger.log(level, json.dumps(record, default=str, separators=(",", ":"), ensure_ascii=False))
+
+
+log = StructuredLogger()
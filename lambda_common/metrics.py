@@ -0,0 +1,295 @@
+"""
+Per-invocation latency metrics emitted as CloudWatch Embedded Metric Format.
+
+One JSON line per invocation is written to stdout; CloudWatch Logs extracts
+the metrics from it, so publishing costs no extra network calls. Each record
+carries the phase durations (ParseMs, RouteMs, ServiceMs, SerializeMs,
+TotalMs), the cold-start flag, request / response sizes, cache hits and
+misses, and the remaining invocation time, dimensioned by function and route.
+
+Downstream AWS calls are timed with botocore before-call / after-call hooks
+on every client built by lambda_common.clients, so handlers need no changes.
+Per-service values are reported as e.g. TranslateMs (one value per call).
+
+Settings (environment):
+    METRICS_ENABLED    set to false to turn instrumentation off (default true)
+    METRICS_NAMESPACE  CloudWatch namespace (default CloudyOnce/AI)
+
+parse_emf / summarize aggregate captured lines locally, see
+benchmarks/emf_summary.py.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from functools import wraps
+
+UNITS = {
+    "ColdStart": "Count",
+    "CacheHits": "Count",
+    "CacheMisses": "Count",
+    "ServiceCalls": "Count",
+    "ServiceErrors": "Count",
+    "ServiceRetries": "Count",
+    "CircuitOpened": "Count",
+    "LocalLanguageHits": "Count",
+    "RequestBytes": "Bytes",
+    "ResponseBytes": "Bytes",
+    "UncompressedBytes": "Bytes",
+}
+
+
+def _stdout_sink(line):
+    sys.stdout.write(line + "\n")
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class InvocationMetrics:
+    """
+    Collects metrics for the current invocation. Lambda runs one invocation
+    per container at a time, so a single module-level instance is enough;
+    the lock only covers worker threads inside one invocation.
+    """
+
+    def __init__(self, namespace=None, enabled=None, sink=None):
+        self.namespace = namespace or os.environ.get("METRICS_NAMESPACE", "CloudyOnce/AI")
+        if enabled is None:
+            enabled = os.environ.get("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+        self.sink = sink or _stdout_sink
+        self.cold = True
+        self._lock = threading.Lock()
+        self._values = {}
+        self._properties = {}
+        self._dimensions = {}
+        self._start = None
+        self._context = None
+
+    def start(self, event=None, context=None):
+        """Reset per-invocation state. Call first thing in the handler."""
+        if not self.enabled:
+            return
+        self._start = time.perf_counter()
+        self._context = context
+        self._values = {"ColdStart": [1 if self.cold else 0]}
+        self.cold = False
+        self._dimensions = {"Function": getattr(context, "function_name", None) or os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "local")}
+        self._properties = {"requestId": getattr(context, "aws_request_id", None)}
+
+        body = event.get("body") if isinstance(event, dict) else None
+        if isinstance(body, str):
+            self._values["RequestBytes"] = [len(body.encode("utf-8"))]
+
+    def set_route(self, route):
+        if self.enabled:
+            self._dimensions["Route"] = route
+
+    def set_property(self, name, value):
+        if self.enabled:
+            self._properties[name] = value
+
+    def add(self, name, value):
+        if not self.enabled or self._start is None:
+            return
+        with self._lock:
+            self._values.setdefault(name, []).append(value)
+
+    def increment(self, name, count=1):
+        if not self.enabled or self._start is None:
+            return
+        with self._lock:
+            values = self._values.get(name)
+            if values:
+                values[0] += count
+            else:
+                self._values[name] = [count]
+
+    def timer(self, name):
+        """Context manager adding the elapsed milliseconds to metric `name`."""
+        if not self.enabled or self._start is None:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record_service_call(self, service, operation, duration_ms, error=None):
+        self.add("ServiceMs", duration_ms)
+        self.add(f"{service[:1].upper()}{service[1:]}Ms", duration_ms)
+        self.increment("ServiceCalls")
+        if error is not None:
+            self.increment("ServiceErrors")
+        with self._lock:
+            calls = self._properties.setdefault("serviceCalls", [])
+            if len(calls) < 20:
+                calls.append({"service": service, "operation": operation, "ms": round(duration_ms, 3)})
+
+    def finish(self, response=None):
+        """Emit the EMF record for this invocation and clear state."""
+        if not self.enabled or self._start is None:
+            return None
+        self.add("TotalMs", (time.perf_counter() - self._start) * 1000)
+
+        if isinstance(response, dict):
+            body = response.get("body")
+            if isinstance(body, str):
+                # Base64 bodies (compressed or binary) are decoded by API Gateway before they are sent
+                size = len(body) // 4 * 3 if response.get("isBase64Encoded") else len(body.encode("utf-8"))
+                self._values["ResponseBytes"] = [size]
+            if "statusCode" in response:
+                self._properties["statusCode"] = response["statusCode"]
+        if self._context is not None and hasattr(self._context, "get_remaining_time_in_millis"):
+            self.add("RemainingTimeMs", self._context.get_remaining_time_in_millis())
+
+        record = self.to_emf()
+        self._start = None
+        self._context = None
+        self.sink(json.dumps(record, separators=(",", ":"), default=str))
+        return record
+
+    def to_emf(self):
+        dimensions = dict(self._dimensions)
+        dimensions.setdefault("Route", "unmatched")
+        record = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": self.namespace,
+                    "Dimensions": [sorted(dimensions)],
+                    "Metrics": [
+                        {"Name": name, "Unit": UNITS.get(name, "Milliseconds")}
+                        for name in self._values
+                    ],
+                }],
+            },
+        }
+        record.update(dimensions)
+        record.update({k: v for k, v in self._properties.items() if v is not None})
+        for name, values in self._values.items():
+            if name.endswith("Ms"):
+                values = [round(v, 3) for v in values]
+            record[name] = values[0] if len(values) == 1 else values[:100]
+        return record
+
+    def instrument(self, handler):
+        """Decorator for Lambda entry points: start, run, emit."""
+        @wraps(handler)
+        def wrapper(event, context):
+            self.start(event, context)
+            response = None
+            try:
+                response = handler(event, context)
+                return response
+            finally:
+                self.finish(response)
+        return wrapper
+
+
+metrics = InvocationMetrics()
+
+
+def _before_call(context=None, **kwargs):
+    if context is not None:
+        context["metrics_start"] = time.perf_counter()
+
+
+def instrument_client(client, service):
+    """Time every API call made through a botocore client."""
+    events = getattr(getattr(client, "meta", None), "events", None)
+    if events is None:
+        return client
+
+    def after_call(model=None, context=None, http_response=None, **kwargs):
+        started = (context or {}).get("metrics_start")
+        if started is None:
+            return
+        status = getattr(http_response, "status_code", 200)
+        metrics.record_service_call(
+            service,
+            getattr(model, "name", "unknown"),
+            (time.perf_counter() - started) * 1000,
+            error=status if status >= 400 else None,
+        )
+
+    events.register("before-call.*.*", _before_call, unique_id="metrics-before-call")
+    events.register("after-call.*.*", after_call, unique_id="metrics-after-call")
+    return client
+
+
+def parse_emf(lines):
+    """Yield EMF records from log lines; other lines are skipped."""
+    for line in lines:
+        start = line.find("{")
+        if start < 0 or '"_aws"' not in line:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "_aws" in record:
+            yield record
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(records, group_by=("Route",)):
+    """
+    Aggregate EMF records into {group: {metric: {count, mean, p50, p95, p99, max}}},
+    the same statistics CloudWatch would show for each metric.
+    """
+    groups = {}
+    for record in records:
+        group = " ".join(str(record.get(d, "-")) for d in group_by)
+        values_by_metric = groups.setdefault(group, {})
+        for directive in record["_aws"]["CloudWatchMetrics"]:
+            for metric in directive["Metrics"]:
+                value = record.get(metric["Name"])
+                if value is None:
+                    continue
+                values = value if isinstance(value, list) else [value]
+                values_by_metric.setdefault(metric["Name"], []).extend(values)
+
+    summary = {}
+    for group, values_by_metric in groups.items():
+        summary[group] = {}
+        for name, values in values_by_metric.items():
+            values = sorted(values)
+            summary[group][name] = {
+                "count": len(values),
+                "mean": round(sum(values) / len(values), 3),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "p99": _percentile(values, 99),
+                "max": values[-1],
+            }
+    return summary
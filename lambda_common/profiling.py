@@ -0,0 +1,193 @@
+"""
+Opt-in per-invocation profiling.
+
+When an invocation is slow or memory-hungry in a warm container, set
+PROFILE_MODE (or PROFILE_SAMPLE_RATE) on the function and the selected
+invocations run under cProfile and/or tracemalloc. Each one produces a
+single compact log line:
+
+    {"message": "Profile", "requestId": ..., "profileMs": 41.2,
+     "cpu": [{"fn": "lambda_common/handlers/text.py:52(detect_language)",
+              "calls": 1, "selfMs": 0.4, "cumMs": 38.0}, ...],
+     "memory": {"peakKb": 812.4, "allocatedKb": 95.1,
+                "top": [{"at": "lambda_common/langid.py:88", "kb": 60.2, "blocks": 312}, ...]},
+     "dump": "/tmp/profiles/fixed-lambda-1a2b3c.prof"}
+
+and, with cProfile, a full .prof dump under PROFILE_DIR for later use
+(python -m pstats, snakeviz), pruned to the newest PROFILE_MAX_DUMPS files.
+cProfile only sees the invocation's own thread; work handed to worker
+threads (concurrent features, batch fan-out) shows up as the wait for it.
+tracemalloc covers every thread.
+
+Off (the default), an invocation pays one attribute check.
+
+Settings (environment):
+    PROFILE_MODE         off, cpu (cProfile), memory (tracemalloc) or all (default off;
+                         cpu when only PROFILE_SAMPLE_RATE is set)
+    PROFILE_SAMPLE_RATE  fraction of invocations profiled (default 1 when PROFILE_MODE is set)
+    PROFILE_TOP_N        functions / allocation sites in the log line (default 10)
+    PROFILE_SORT         cProfile order: tottime (self time) or cumulative (default tottime)
+    PROFILE_DIR          where .prof dumps go (default /tmp/profiles); empty for none
+    PROFILE_MAX_DUMPS    dumps kept in PROFILE_DIR (default 20)
+"""
+
+import os
+import random
+import time
+from functools import wraps
+
+from .logs import log
+
+MODES = {"off": (), "cpu": ("cpu",), "memory": ("memory",), "all": ("cpu", "memory")}
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _short_path(filename):
+    """Path relative to the package or site-packages, so log lines stay short."""
+    for marker in ("/site-packages/", "/lambda_common/", "/var/task/", "/var/runtime/"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            return filename[index + 1:] if marker == "/lambda_common/" else filename[index + len(marker):]
+    return os.path.basename(filename)
+
+
+class Profiler:
+    """Wraps selected invocations in cProfile / tracemalloc. One per container."""
+
+    def __init__(self, mode=None, sample_rate=None, top_n=None, sort=None, dump_dir=None, max_dumps=None):
+        if mode is None:
+            mode = os.environ.get("PROFILE_MODE", "").lower() or ("cpu" if os.environ.get("PROFILE_SAMPLE_RATE") else "off")
+        if mode not in MODES:
+            # A typo in a diagnostics setting must not take the function down
+            log.warning("Unknown PROFILE_MODE, profiling is off", mode=mode, modes=list(MODES))
+            mode = "off"
+        self.modes = MODES[mode]
+        self.sample_rate = _env_float("PROFILE_SAMPLE_RATE", 1.0) if sample_rate is None else sample_rate
+        self.top_n = _env_int("PROFILE_TOP_N", 10) if top_n is None else top_n
+        self.sort = sort or os.environ.get("PROFILE_SORT", "tottime")
+        self.dump_dir = os.environ.get("PROFILE_DIR", "/tmp/profiles") if dump_dir is None else dump_dir
+        self.max_dumps = _env_int("PROFILE_MAX_DUMPS", 20) if max_dumps is None else max_dumps
+        self.enabled = bool(self.modes) and self.sample_rate > 0
+
+    def run(self, handler, event, context):
+        """handler(event, context), profiled when this invocation is selected."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return handler(event, context)
+
+        profile = None
+        if "cpu" in self.modes:
+            import cProfile
+            profile = cProfile.Profile()
+        tracing = False
+        if "memory" in self.modes:
+            import tracemalloc
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+
+        started = time.perf_counter()
+        try:
+            if profile is not None:
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiler (a debugger, an outer cProfile) already owns the hook
+                    profile = None
+            return handler(event, context)
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            fields = {"profileMs": round(elapsed_ms, 3)}
+            if "memory" in self.modes:
+                fields["memory"] = self._memory(tracemalloc, before)
+                if tracing:
+                    tracemalloc.stop()
+            if profile is not None:
+                fields["cpu"] = self._cpu(profile)
+                dump = self._dump(profile, context)
+                if dump:
+                    fields["dump"] = dump
+            log.info("Profile", **fields)
+
+    def instrument(self, handler):
+        """Decorator for Lambda entry points that do not go through lambda_common.api.Api."""
+        if not self.enabled:
+            return handler
+
+        @wraps(handler)
+        def wrapper(event, context):
+            return self.run(handler, event, context)
+        return wrapper
+
+    def _cpu(self, profile):
+        import pstats
+
+        stats = pstats.Stats(profile)
+        key = 3 if self.sort == "cumulative" else 2  # (calls, primitive calls, tottime, cumtime, callers)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:self.top_n]
+        return [
+            {
+                "fn": name if filename == "~" else f"{_short_path(filename)}:{line}({name})",
+                "calls": calls,
+                "selfMs": round(tottime * 1000, 3),
+                "cumMs": round(cumtime * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+        ]
+
+    def _memory(self, tracemalloc, before):
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        # Still allocated at the end of the invocation, by line
+        grown = [d for d in after.compare_to(before, "lineno") if d.size_diff > 0]
+        return {
+            "peakKb": round(peak / 1024, 1),
+            "allocatedKb": round(sum(d.size_diff for d in grown) / 1024, 1),
+            "top": [
+                {"at": f"{_short_path(d.traceback[0].filename)}:{d.traceback[0].lineno}",
+                 "kb": round(d.size_diff / 1024, 1), "blocks": d.count_diff}
+                for d in grown[:self.top_n]
+            ],
+        }
+
+    def _dump(self, profile, context):
+        if not self.dump_dir:
+            return None
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            name = getattr(context, "function_name", None) or "lambda"
+            request_id = getattr(context, "aws_request_id", None) or f"{time.time():.0f}"
+            path = os.path.join(self.dump_dir, f"{name}-{request_id}.prof")
+            profile.dump_stats(path)
+            self._prune()
+            return path
+        except OSError as e:
+            log.warning("Could not write profile dump", error=str(e))
+            return None
+
+    def _prune(self):
+        dumps = [os.path.join(self.dump_dir, f) for f in os.listdir(self.dump_dir) if f.endswith(".prof")]
+        if len(dumps) <= self.max_dumps:
+            return
+        dumps.sort(key=os.path.getmtime)
+        for path in dumps[:len(dumps) - self.max_dumps]:
+            os.remove(path)
+
+
+profiler = Profiler()
@@ -0,0 +1,331 @@
+"""
+Deadline-aware calls to downstream AWS services.
+
+Every client handed out by get_client() is wrapped in a GuardedClient. Each
+API call through it:
+
+- is refused up front (CircuitOpenError, 503) while the service's circuit
+  breaker is open, i.e. after CIRCUIT_FAILURE_THRESHOLD consecutive
+  throttles / server errors / timeouts, until CIRCUIT_RESET_SECONDS pass and
+  a single probe call succeeds;
+- uses a client whose read timeout fits the remaining invocation budget
+  (context.get_remaining_time_in_millis() minus DEADLINE_RESERVE_MS kept
+  for building the response), picked from a few fixed timeout tiers so the
+  number of clients stays small;
+- is retried on throttling, 5xx and timeouts with full-jitter exponential
+  backoff, but only while the backoff plus another attempt still fits the
+  budget and the per-service retry quota (drained by retries, refilled by
+  successes) has tokens left. Out of budget raises DeadlineExceededError
+  (504).
+
+botocore's own retries are turned off (see lambda_common.clients) so this is
+the single retry layer.
+
+Settings (environment):
+    DEADLINE_RESERVE_MS          budget kept back for the response (default 500)
+    DEADLINE_MIN_CALL_MS         smallest budget worth starting a call with (default 250)
+    RETRY_MAX_ATTEMPTS           attempts per call, including the first (default 3)
+    RETRY_BASE_MS / RETRY_MAX_BACKOFF_MS   backoff base and cap (default 50 / 2000)
+    RETRY_QUOTA                  retry tokens per service (default 20)
+    CIRCUIT_FAILURE_THRESHOLD    consecutive failures that open a breaker (default 5)
+    CIRCUIT_RESET_SECONDS        how long a breaker stays open (default 15)
+"""
+
+import os
+import random
+import threading
+import time
+
+from .logs import log
+from .metrics import metrics
+
+# Read timeouts (seconds) a budget is rounded down to
+TIMEOUT_TIERS = (0.25, 0.5, 1, 2, 3, 5, 10, 15, 30)
+
+THROTTLING_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "SlowDown",
+    "LimitExceededException",
+}
+TRANSIENT_CODES = {
+    "InternalFailure",
+    "InternalError",
+    "InternalServerError",
+    "InternalServerException",
+    "ServiceUnavailable",
+    "ServiceUnavailableException",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+# Client methods that never hit the network, and non-callable client attributes
+LOCAL_METHODS = {"generate_presigned_url", "generate_presigned_post", "get_paginator", "get_waiter", "can_paginate", "close"}
+CLIENT_ATTRIBUTES = {"meta", "exceptions"}
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class DownstreamError(Exception):
+    """Base class for errors that map to a specific HTTP status."""
+
+    status_code = 502
+
+    def __init__(self, service, message):
+        super().__init__(message)
+        self.service = service
+
+
+class CircuitOpenError(DownstreamError):
+    status_code = 503
+
+    def __init__(self, service, retry_after):
+        super().__init__(service, f"{service} is temporarily unavailable")
+        self.retry_after = retry_after
+
+
+class ThrottledError(DownstreamError):
+    status_code = 503
+    retry_after = 1
+
+    def __init__(self, service, error):
+        super().__init__(service, f"{service} is throttling requests: {error}")
+
+
+class DeadlineExceededError(DownstreamError):
+    status_code = 504
+
+    def __init__(self, service, message=None):
+        super().__init__(service, message or f"Not enough time left to call {service}")
+
+
+class Deadline:
+    """Remaining time of the current invocation. Lambda runs one invocation per container at a time."""
+
+    def __init__(self):
+        self._deadline = None
+
+    def start(self, context=None):
+        remaining = getattr(context, "get_remaining_time_in_millis", None)
+        self._deadline = time.monotonic() + remaining() / 1000.0 if remaining else None
+
+    def remaining_ms(self):
+        """Milliseconds left for downstream calls, or None outside an invocation with a context."""
+        if self._deadline is None:
+            return None
+        reserve = _env_float("DEADLINE_RESERVE_MS", 500)
+        return (self._deadline - time.monotonic()) * 1000 - reserve
+
+
+deadline = Deadline()
+
+
+def classify(error):
+    """'throttle', 'transient', 'timeout' or None (not retryable) for an exception from botocore."""
+    name = type(error).__name__
+    if name in ("ReadTimeoutError", "ConnectTimeoutError"):
+        return "timeout"
+    if name in ("EndpointConnectionError", "ConnectionClosedError", "ConnectionError"):
+        return "transient"
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    code = response.get("Error", {}).get("Code")
+    if code in THROTTLING_CODES:
+        return "throttle"
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+    if code in TRANSIENT_CODES or status >= 500:
+        return "transient"
+    return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one probe) -> closed."""
+
+    def __init__(self, service, failure_threshold=None, reset_seconds=None):
+        self.service = service
+        self.failure_threshold = int(failure_threshold or _env_float("CIRCUIT_FAILURE_THRESHOLD", 5))
+        self.reset_seconds = reset_seconds or _env_float("CIRCUIT_RESET_SECONDS", 15)
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            waited = time.monotonic() - self.opened_at
+            if self.state == "open" and waited >= self.reset_seconds:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.service, retry_after=max(1, int(self.reset_seconds - waited + 0.5)))
+
+    def success(self):
+        if self.state == "closed" and not self.failures:
+            return
+        with self._lock:
+            if self.state != "closed":
+                log.info("Circuit closed", service=self.service)
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    log.warning("Circuit opened", service=self.service, failures=self.failures)
+                    metrics.increment("CircuitOpened")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class RetryQuota:
+    """Per-service retry tokens, so a struggling service is not hit with a retry storm."""
+
+    def __init__(self, capacity=None):
+        self.capacity = int(capacity or _env_float("RETRY_QUOTA", 20))
+        self.tokens = self.capacity
+        self._lock = threading.Lock()
+
+    def acquire(self, cost):
+        with self._lock:
+            if self.tokens < cost:
+                return False
+            self.tokens -= cost
+            return True
+
+    def refill(self, amount=1):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+_breakers = {}
+_quotas = {}
+_state_lock = threading.Lock()
+
+
+def breaker_for(service):
+    breaker = _breakers.get(service)
+    if breaker is None:
+        with _state_lock:
+            breaker = _breakers.setdefault(service, CircuitBreaker(service))
+    return breaker
+
+
+def quota_for(service):
+    quota = _quotas.get(service)
+    if quota is None:
+        with _state_lock:
+            quota = _quotas.setdefault(service, RetryQuota())
+    return quota
+
+
+def reset_state():
+    """Forget all breaker and quota state (tests / benchmarks)."""
+    with _state_lock:
+        _breakers.clear()
+        _quotas.clear()
+
+
+def timeout_tier(budget_ms, configured_timeout):
+    """Largest tier that fits both the budget and the configured read timeout."""
+    limit = min(budget_ms / 1000.0, configured_timeout or TIMEOUT_TIERS[-1])
+    fitting = [t for t in TIMEOUT_TIERS if t <= limit]
+    return fitting[-1] if fitting else None
+
+
+def call_with_deadline(registry, service, operation, params):
+    """Run one API call under the breaker, deadline and retry policy described above."""
+    breaker = breaker_for(service)
+    quota = quota_for(service)
+    max_attempts = int(_env_float("RETRY_MAX_ATTEMPTS", 3))
+    base_ms = _env_float("RETRY_BASE_MS", 50)
+    cap_ms = _env_float("RETRY_MAX_BACKOFF_MS", 2000)
+    min_call_ms = _env_float("DEADLINE_MIN_CALL_MS", 250)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        budget = deadline.remaining_ms()
+        read_timeout = None
+        if budget is not None:
+            if budget >= min_call_ms:
+                read_timeout = timeout_tier(budget, registry.options_for(service).get("read_timeout"))
+            if read_timeout is None:
+                raise DeadlineExceededError(service)
+        breaker.allow()
+
+        try:
+            client = registry.get(service, read_timeout=read_timeout)
+        except Exception:
+            # Nothing reached the service, but a half-open probe must be settled
+            # or the breaker would refuse every call from now on
+            breaker.failure()
+            raise
+        try:
+            result = getattr(client, operation)(**params)
+        except Exception as e:
+            kind = classify(e)
+            if kind is None:
+                # Caller errors (validation, 404, access denied) say nothing about service health
+                breaker.success()
+                raise
+            breaker.failure()
+
+            backoff_ms = random.uniform(0, min(cap_ms, base_ms * (4 if kind == "throttle" else 1) * 2 ** (attempt - 1)))
+            budget = deadline.remaining_ms()
+            fits = budget is None or budget - backoff_ms >= min_call_ms
+            if attempt < max_attempts and fits and quota.acquire(5 if kind == "timeout" else 1):
+                log.warning("Retrying service call", service=service, operation=operation, attempt=attempt, kind=kind, error=str(e))
+                metrics.increment("ServiceRetries")
+                time.sleep(backoff_ms / 1000.0)
+                continue
+
+            log.error("Service call failed", service=service, operation=operation, attempts=attempt, kind=kind, error=str(e))
+            if kind == "timeout":
+                raise DeadlineExceededError(service, f"{service} did not respond in time") from e
+            if kind == "throttle":
+                raise ThrottledError(service, e) from e
+            raise DownstreamError(service, f"{service} failed: {e}") from e
+        breaker.success()
+        quota.refill()
+        return result
+
+
+class GuardedClient:
+    """
+    Proxy over the registry's client for `service` that routes API calls
+    through call_with_deadline. Operations are looked up on the client that
+    makes the call (the one for the call's timeout tier), so a proxy never
+    builds a client of its own; an unknown operation raises AttributeError
+    when called.
+    """
+
+    def __init__(self, registry, service):
+        self._registry = registry
+        self._service = service
+
+    def __getattr__(self, name):
+        if name in LOCAL_METHODS or name in CLIENT_ATTRIBUTES or name.startswith("_"):
+            return getattr(self._registry.any_variant(self._service), name)
+
+        def call(**params):
+            return call_with_deadline(self._registry, self._service, name, params)
+        return call
@@ -0,0 +1,98 @@
+"""
+Shared API Gateway response factory.
+
+Headers are built once per container, constant bodies (preflight, fixed
+validation errors) are encoded once, and JSON encoding uses orjson when it is
+installed, falling back to the standard library.
+
+Returned dicts are fresh per call but share the header dicts, so callers that
+need extra headers must copy (see with_headers) rather than mutate.
+"""
+
+import json
+import os
+
+from .metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment package
+    orjson = None
+
+CORS_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Amz-Date, X-Api-Key, X-Amz-Security-Token, If-None-Match",
+    "Access-Control-Expose-Headers": "ETag",
+}
+
+# How long browsers may reuse a preflight answer. Chromium caps this at 7200
+# seconds, Firefox at 86400.
+CORS_MAX_AGE = os.environ.get("CORS_MAX_AGE", "7200")
+PREFLIGHT_HEADERS = dict(CORS_HEADERS, **{"Access-Control-Max-Age": CORS_MAX_AGE})
+
+if orjson is not None:
+    JSON_ENCODER = "orjson"
+
+    def dumps(data):
+        return orjson.dumps(data).decode("utf-8")
+else:
+    JSON_ENCODER = "json"
+    _encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def dumps(data):
+        return _encode(data)
+
+
+def json_response(status_code, data, headers=CORS_HEADERS):
+    with metrics.timer("SerializeMs"):
+        body = dumps(data)
+    return {"statusCode": status_code, "headers": headers, "body": body}
+
+
+def error_response(status_code, message, headers=CORS_HEADERS):
+    return {"statusCode": status_code, "headers": headers, "body": dumps({"error": message})}
+
+
+def exception_response(error, headers=CORS_HEADERS):
+    """
+    Error response for an exception raised by a handler. Errors that carry a
+    status_code (see lambda_common.resilience) keep it, with Retry-After when
+    they know one; anything else is a 500.
+    """
+    response = error_response(getattr(error, "status_code", 500), str(error), headers)
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        response = with_headers(response, Retry_After=str(retry_after))
+    return response
+
+
+def with_headers(response, **extra):
+    """Copy of `response` with additional headers (header names use '-' for '_')."""
+    headers = dict(response["headers"])
+    headers.update({name.replace("_", "-"): value for name, value in extra.items()})
+    response = dict(response)
+    response["headers"] = headers
+    return response
+
+
+class StaticResponse:
+    """A response whose body is encoded once and reused for every request."""
+
+    __slots__ = ("status_code", "body", "headers")
+
+    def __init__(self, status_code, data, headers=CORS_HEADERS):
+        self.status_code = status_code
+        self.body = data if isinstance(data, str) else dumps(data)
+        self.headers = headers
+
+    def __call__(self):
+        return {"statusCode": self.status_code, "headers": self.headers, "body": self.body}
+
+
+PREFLIGHT = StaticResponse(200, {"message": "CORS preflight successful"}, PREFLIGHT_HEADERS)
+INVALID_JSON = StaticResponse(400, {"error": "Invalid JSON in request body"})
+MISSING_TEXT = StaticResponse(400, {"error": "Missing text parameter"})
+MISSING_TEXTS = StaticResponse(400, {"error": "Missing texts parameter"})
+MISSING_BUCKET_OR_KEY = StaticResponse(400, {"error": "Missing bucket or key"})
@@ -0,0 +1,130 @@
+"""
+Declarative route table for API Gateway proxy events.
+
+Routes are compiled once (normally at import time) into a dict for exact
+paths plus a segment trie for templated paths such as /ai/jobs/{jobId}.
+Dispatch cost depends on the path depth, not on the number of routes.
+"""
+
+
+class RouteNotFound(LookupError):
+    pass
+
+
+class MethodNotAllowed(LookupError):
+    def __init__(self, path, allowed):
+        super().__init__(f"Method not allowed for {path}")
+        self.allowed = sorted(allowed)
+
+
+class RouteMatch:
+    __slots__ = ("handler", "params", "template")
+
+    def __init__(self, handler, params, template):
+        self.handler = handler
+        self.params = params
+        self.template = template
+
+
+class _Node:
+    __slots__ = ("children", "param_name", "param_child", "methods", "template")
+
+    def __init__(self):
+        self.children = {}
+        self.param_name = None
+        self.param_child = None
+        self.methods = None
+        self.template = None
+
+
+def _split(path):
+    return [segment for segment in path.split("/") if segment]
+
+
+def _is_param(segment):
+    return segment.startswith("{") and segment.endswith("}")
+
+
+class Router:
+    def __init__(self, routes=(), base_path=""):
+        self.base_path = "/" + "/".join(_split(base_path)) if _split(base_path) else ""
+        self._static = {}
+        self._root = _Node()
+        for method, template, handler in routes:
+            self.add(method, template, handler)
+
+    def add(self, method, template, handler):
+        segments = _split(template)
+        method = method.upper()
+
+        if not any(_is_param(s) for s in segments):
+            key = "/" + "/".join(segments)
+            entry = self._static.setdefault(key, ({}, key))
+            entry[0][method] = handler
+            return
+
+        node = self._root
+        for segment in segments:
+            if _is_param(segment):
+                name = segment[1:-1]
+                if node.param_child is None:
+                    node.param_child = _Node()
+                    node.param_name = name
+                elif node.param_name != name:
+                    raise ValueError(f"Conflicting parameter names at {template}: {node.param_name} / {name}")
+                node = node.param_child
+            else:
+                node = node.children.setdefault(segment, _Node())
+        if node.methods is None:
+            node.methods = {}
+            node.template = template
+        node.methods[method] = handler
+
+    def match(self, method, path):
+        """Return a RouteMatch or raise RouteNotFound / MethodNotAllowed."""
+        if self.base_path and path.startswith(self.base_path + "/"):
+            path = path[len(self.base_path):]
+        method = method.upper()
+
+        entry = self._static.get(path.rstrip("/") or "/")
+        if entry is not None:
+            methods, template = entry
+            params = {}
+        else:
+            methods, template, params = self._walk(path)
+            if methods is None:
+                raise RouteNotFound(path)
+
+        handler = methods.get(method)
+        if handler is None:
+            raise MethodNotAllowed(path, methods)
+        return RouteMatch(handler, params, template)
+
+    def _walk(self, path):
+        node = self._root
+        params = {}
+        for segment in _split(path):
+            child = node.children.get(segment)
+            if child is not None:
+                node = child
+            elif node.param_child is not None:
+                params[node.param_name] = segment
+                node = node.param_child
+            else:
+                return None, None, None
+        return node.methods, node.template, params
+
+    def routes(self):
+        """List of (method, template) pairs, mainly for logging and tests."""
+        found = [(m, template) for methods, template in self._static.values() for m in methods]
+
+        def visit(node):
+            if node.methods:
+                found.extend((m, node.template) for m in node.methods)
+            for child in node.children.values():
+                visit(child)
+            if node.param_child is not None:
+                visit(node.param_child)
+
+        visit(self._root)
+        return sorted(found, key=lambda r: (r[1], r[0]))
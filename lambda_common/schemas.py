@@ -0,0 +1,116 @@
+"""
+Request schemas for the API routes (see lambda_common.validation).
+
+Text limits follow the service behind each route, so a request that the
+service would refuse is answered with a 400 before any call is made:
+
+    Comprehend   5,000 UTF-8 bytes per document (sentiment, dominant language)
+    Translate    /ai/translate splits texts into TranslateText-sized chunks,
+                 up to TRANSLATE_MAX_TEXT_BYTES (default 100,000) in total,
+                 for up to TRANSLATE_MAX_TARGETS (default 10) languages
+    Polly        texts are split into POLLY_CHUNK_CHARS chunks, up to
+                 POLLY_MAX_TEXT_BYTES (default 50,000) in total
+    S3           bucket names up to 63 characters, keys up to 1,024 bytes
+
+Batch items are not validated here: the batch handlers report a bad item in
+its result slot instead of failing the whole batch.
+
+This module is imported by the entry points at cold start, so it must not
+import the handler or service modules.
+"""
+
+import os
+
+from .validation import ListOf, Number, Object, Schema, Text
+
+COMPREHEND_MAX_TEXT_BYTES = 5000
+TRANSLATE_MAX_TEXT_BYTES = int(os.environ.get("TRANSLATE_MAX_TEXT_BYTES", "100000"))
+POLLY_MAX_TEXT_BYTES = int(os.environ.get("POLLY_MAX_TEXT_BYTES", "50000"))
+# Target languages in one /ai/translate request (targetLanguages)
+TRANSLATE_MAX_TARGETS = int(os.environ.get("TRANSLATE_MAX_TARGETS", "10"))
+S3_BUCKET_MAX_BYTES = 63
+S3_KEY_MAX_BYTES = 1024
+
+# Lambda's synchronous invocation payload limit
+REQUEST_MAX_BODY_BYTES = int(os.environ.get("REQUEST_MAX_BODY_BYTES", str(6 * 1024 * 1024)))
+# JSON may escape every character as \uXXXX, so a body can be up to 6x its text
+JSON_ESCAPE_FACTOR = 6
+BATCH_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+# Same values as lambda_common.vision.FEATURES and handlers.pipeline.PIPELINE_STAGES,
+# repeated so that this module stays cheap to import
+IMAGE_FEATURES = ("labels", "text", "moderation")
+PIPELINE_STAGES = ("detect-language", "translate", "sentiment")
+
+LANGUAGE_CODE = r"^[a-z]{2,3}(-[A-Za-z]{2,4})?$"
+# Translate's SourceLanguageCode also takes "auto" (detect per request)
+SOURCE_LANGUAGE_CODE = r"^(auto|[a-z]{2,3}(-[A-Za-z]{2,4})?)$"
+
+
+def language(required=False):
+    return Text(required=required, max_bytes=10, pattern=LANGUAGE_CODE)
+
+
+def source_language():
+    return Text(max_bytes=10, pattern=SOURCE_LANGUAGE_CODE)
+
+
+TEXT_ANALYSIS = Schema({
+    "text": Text(required=True, max_bytes=COMPREHEND_MAX_TEXT_BYTES),
+}, max_body_bytes=COMPREHEND_MAX_TEXT_BYTES * JSON_ESCAPE_FACTOR + 1024)
+
+LANGUAGE_DETECTION = TEXT_ANALYSIS
+
+COMPREHEND_BATCH = Schema({
+    "texts": ListOf(required=True),
+}, max_body_bytes=BATCH_MAX_BODY_BYTES)
+
+TRANSLATION = Schema({
+    "text": Text(required=True, max_bytes=TRANSLATE_MAX_TEXT_BYTES),
+    "targetLanguage": language(),
+    "targetLanguages": ListOf(language(), max_items=TRANSLATE_MAX_TARGETS),
+    "sourceLanguage": source_language(),
+}, max_body_bytes=TRANSLATE_MAX_TEXT_BYTES * JSON_ESCAPE_FACTOR + 1024)
+
+TRANSLATION_BATCH = Schema({
+    "texts": ListOf(required=True),
+    "targetLanguage": language(),
+}, max_body_bytes=BATCH_MAX_BODY_BYTES)
+
+PIPELINE = Schema({
+    "text": Text(required=True, max_bytes=TRANSLATE_MAX_TEXT_BYTES),
+    "stages": ListOf(Text(choices=PIPELINE_STAGES), max_items=len(PIPELINE_STAGES)),
+    "targetLanguage": language(),
+    "sourceLanguage": source_language(),
+}, max_body_bytes=TRANSLATE_MAX_TEXT_BYTES * JSON_ESCAPE_FACTOR + 1024)
+
+SPEECH = Schema({
+    "text": Text(required=True, max_bytes=POLLY_MAX_TEXT_BYTES),
+    "language": language(),
+    "voiceId": Text(max_bytes=32),
+    "engine": Text(choices=("standard", "neural", "long-form", "generative")),
+    "format": Text(choices=("mp3", "ogg_vorbis", "pcm")),
+}, max_body_bytes=POLLY_MAX_TEXT_BYTES * JSON_ESCAPE_FACTOR + 1024)
+
+_IMAGE_OPTIONS = {
+    "maxLabels": Number(minimum=1, maximum=1000, integer=True),
+    "minConfidence": Number(minimum=0, maximum=100),
+}
+
+# Either bucket + key or an inline base64 image (bounded by the body limit);
+# handle_image_analysis checks that one of them is present
+IMAGE_ANALYSIS = Schema(dict({
+    "bucket": Text(max_bytes=S3_BUCKET_MAX_BYTES),
+    "key": Text(max_bytes=S3_KEY_MAX_BYTES),
+    "image": Text(),
+    "features": ListOf(Text(choices=IMAGE_FEATURES), max_items=len(IMAGE_FEATURES)),
+}, **_IMAGE_OPTIONS), max_body_bytes=REQUEST_MAX_BODY_BYTES)
+
+IMAGE_JOB = Schema(dict({
+    "objects": ListOf(Object({
+        "bucket": Text(required=True, max_bytes=S3_BUCKET_MAX_BYTES),
+        "key": Text(required=True, max_bytes=S3_KEY_MAX_BYTES),
+    })),
+    "bucket": Text(max_bytes=S3_BUCKET_MAX_BYTES),
+    "prefix": Text(max_bytes=S3_KEY_MAX_BYTES),
+}, **_IMAGE_OPTIONS), max_body_bytes=REQUEST_MAX_BODY_BYTES)
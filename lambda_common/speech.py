@@ -0,0 +1,140 @@
+"""
+Polly text-to-speech with a content-addressed S3 audio cache.
+
+Audio is stored under a key derived from a hash of (text, voice, language,
+engine, format). If the object already exists a presigned URL is returned
+without calling Polly. Long texts are split at sentence boundaries,
+synthesized in parallel and concatenated, so latency stays close to that of
+the longest chunk instead of growing with the text length.
+
+Settings (environment):
+    POLLY_BUCKET        S3 bucket for generated audio (required)
+    POLLY_PREFIX        key prefix (default "polly/")
+    POLLY_ENGINE        "neural" (default) or "standard"
+    POLLY_FORMAT        "mp3" (default), "ogg_vorbis" or "pcm"
+    POLLY_URL_EXPIRES   presigned URL lifetime in seconds (default 3600)
+    POLLY_CHUNK_CHARS   max characters per synthesize_speech call (default 2500)
+    POLLY_WORKERS       parallel synthesize_speech calls (default 4)
+"""
+
+import hashlib
+import os
+
+from .clients import get_client
+from .concurrency import map_bounded
+from .logs import log
+from .text import split_text
+
+# Default voice per language code (all available for the neural engine)
+VOICES = {
+    "en": "Joanna",
+    "es": "Lucia",
+    "fr": "Lea",
+    "de": "Vicki",
+    "it": "Bianca",
+    "pt": "Ines",
+    "ja": "Takumi",
+    "ko": "Seoyeon",
+    "zh": "Zhiyu",
+    "nl": "Laura",
+}
+
+CONTENT_TYPES = {
+    "mp3": "audio/mpeg",
+    "ogg_vorbis": "audio/ogg",
+    "pcm": "audio/pcm",
+}
+
+EXTENSIONS = {
+    "mp3": "mp3",
+    "ogg_vorbis": "ogg",
+    "pcm": "pcm",
+}
+
+
+class SpeechConfigError(Exception):
+    pass
+
+
+def audio_key(text, voice_id, language, engine, output_format, prefix="polly/"):
+    digest = hashlib.sha256(
+        "\x1f".join([text, voice_id, language, engine, output_format]).encode("utf-8")
+    ).hexdigest()
+    return f"{prefix}{digest}.{EXTENSIONS.get(output_format, output_format)}"
+
+
+def _object_exists(s3, bucket, key):
+    from botocore.exceptions import ClientError
+
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+
+
+def synthesize_chunks(chunks, voice_id, engine, output_format, max_workers=4):
+    """Synthesize chunks concurrently and return the audio concatenated in order."""
+    def synthesize(chunk):
+        polly = get_client("polly")
+        response = polly.synthesize_speech(
+            Text=chunk,
+            VoiceId=voice_id,
+            Engine=engine,
+            OutputFormat=output_format,
+        )
+        return response["AudioStream"].read()
+
+    outcomes = map_bounded(synthesize, chunks, max_workers=max_workers)
+    for outcome in outcomes:
+        if not outcome.ok:
+            raise outcome.error
+    return b"".join(outcome.value for outcome in outcomes)
+
+
+def text_to_speech_url(text, language="en", voice_id=None, engine=None, output_format=None):
+    """
+    Return {"audioUrl", "cached", "voiceId", "key", "chunks"} for `text`,
+    synthesizing and uploading the audio only if it is not already in S3.
+    """
+    bucket = os.environ.get("POLLY_BUCKET")
+    if not bucket:
+        raise SpeechConfigError("POLLY_BUCKET is not configured")
+
+    prefix = os.environ.get("POLLY_PREFIX", "polly/")
+    engine = engine or os.environ.get("POLLY_ENGINE", "neural")
+    output_format = output_format or os.environ.get("POLLY_FORMAT", "mp3")
+    voice_id = voice_id or VOICES.get(language.split("-")[0].lower(), VOICES["en"])
+    expires = int(os.environ.get("POLLY_URL_EXPIRES", "3600"))
+
+    key = audio_key(text, voice_id, language, engine, output_format, prefix=prefix)
+    s3 = get_client("s3")
+
+    cached = _object_exists(s3, bucket, key)
+    chunks = 0
+    if not cached:
+        pieces = split_text(text, int(os.environ.get("POLLY_CHUNK_CHARS", "2500")))
+        chunks = len(pieces)
+        audio = synthesize_chunks(
+            pieces,
+            voice_id,
+            engine,
+            output_format,
+            max_workers=int(os.environ.get("POLLY_WORKERS", "4")),
+        )
+        s3.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=audio,
+            ContentType=CONTENT_TYPES.get(output_format, "application/octet-stream"),
+        )
+        log.info("Synthesized speech", key=key, chunks=chunks, audioBytes=len(audio))
+
+    url = s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=expires,
+    )
+    return {"audioUrl": url, "cached": cached, "voiceId": voice_id, "key": key, "chunks": chunks}
@@ -0,0 +1,81 @@
+"""
+Text chunking helpers.
+
+Services such as Polly and Translate cap the size of a single request. These
+helpers split text at paragraph, then sentence, then word boundaries so every
+chunk fits a budget while staying as natural as possible for the service.
+"""
+
+import re
+
+_PARAGRAPH_RE = re.compile(r"(\n\s*\n)")
+# Full-width sentence ends (Chinese, Japanese) are not followed by a space
+_SENTENCE_RE = re.compile(r"((?<=[.!?])\s+|(?<=[。！？])\s*)")
+_WORD_RE = re.compile(r"(\s+)")
+
+
+def utf8_len(text):
+    return len(text.encode("utf-8"))
+
+
+def _pieces(text, pattern):
+    """Split on `pattern` keeping the separators attached to the preceding piece."""
+    parts = pattern.split(text)
+    pieces = []
+    for i in range(0, len(parts), 2):
+        piece = parts[i] + (parts[i + 1] if i + 1 < len(parts) else "")
+        if piece:
+            pieces.append(piece)
+    return pieces
+
+
+def _hard_split(text, max_size, measure):
+    chunks = []
+    current = ""
+    for char in text:
+        if current and measure(current + char) > max_size:
+            chunks.append(current)
+            current = ""
+        current += char
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split(text, max_size, measure, patterns):
+    if measure(text) <= max_size:
+        return [text]
+    if not patterns:
+        return _hard_split(text, max_size, measure)
+
+    chunks = []
+    current = ""
+    for piece in _pieces(text, patterns[0]):
+        if measure(piece) > max_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split(piece, max_size, measure, patterns[1:]))
+        elif measure(current + piece) > max_size:
+            chunks.append(current)
+            current = piece
+        else:
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text(text, max_size, measure=len):
+    """
+    Split `text` into chunks whose `measure` is at most `max_size`.
+
+    Chunks are cut at paragraph breaks first, then sentence ends, then
+    whitespace, and only mid-word as a last resort. Concatenating the chunks
+    gives back the original text.
+    """
+    if max_size <= 0:
+        raise ValueError("max_size must be positive")
+    if not text:
+        return []
+    return _split(text, max_size, measure, (_PARAGRAPH_RE, _SENTENCE_RE, _WORD_RE))
@@ -0,0 +1,109 @@
+"""
+Amazon Translate helpers: memoized single calls plus a chunked path for long texts.
+
+TranslateText rejects documents over 10,000 UTF-8 bytes, and one big call
+has poor tail latency. Long inputs are split at paragraph / sentence
+boundaries within TRANSLATE_CHUNK_BYTES (default 9000), translated
+concurrently (TRANSLATE_CHUNK_WORKERS, default 6) and reassembled in order.
+iter_translated_chunks yields chunks as soon as they finish for callers that
+can stream.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .cache import ai_cache, make_key
+from .clients import get_client
+from .concurrency import map_bounded
+from .text import split_text, utf8_len
+
+TRANSLATE_MAX_BYTES = 10000
+TRANSLATE_CHUNK_BYTES = int(os.environ.get("TRANSLATE_CHUNK_BYTES", "9000"))
+TRANSLATE_CHUNK_WORKERS = int(os.environ.get("TRANSLATE_CHUNK_WORKERS", "6"))
+
+
+def translate_text(text, target_language, source_language="auto", translate=None):
+    """Translate one string (memoized). Must fit in a single TranslateText request."""
+    def call_translate():
+        client = translate or get_client("translate")
+        response = client.translate_text(
+            Text=text,
+            SourceLanguageCode=source_language,
+            TargetLanguageCode=target_language
+        )
+        return {"translatedText": response["TranslatedText"]}
+
+    key = make_key("translate", text, source_language=source_language, target_language=target_language)
+    return ai_cache.get_or_compute(key, call_translate)
+
+
+def _split_whitespace(chunk):
+    """(leading whitespace, core text, trailing whitespace) so spacing survives translation."""
+    core = chunk.strip()
+    if not core:
+        return chunk, "", ""
+    start = chunk.index(core)
+    return chunk[:start], core, chunk[start + len(core):]
+
+
+def split_for_translation(text, max_bytes=None):
+    return split_text(text, max_bytes or TRANSLATE_CHUNK_BYTES, measure=utf8_len)
+
+
+def _translate_chunk(chunk, target_language, source_language, translate):
+    leading, core, trailing = _split_whitespace(chunk)
+    if not core:
+        return chunk
+    translated = translate_text(core, target_language, source_language=source_language, translate=translate)
+    return leading + translated["translatedText"] + trailing
+
+
+def translate_long_text(text, target_language, source_language="auto", max_bytes=None, max_workers=None, translate=None):
+    """
+    Translate text of any length. Returns {"translatedText", "chunks"}.
+    Inputs that fit in one request go straight through translate_text.
+    """
+    max_bytes = max_bytes or TRANSLATE_CHUNK_BYTES
+    if utf8_len(text) <= max_bytes:
+        result = dict(translate_text(text, target_language, source_language=source_language, translate=translate))
+        result["chunks"] = 1
+        return result
+
+    chunks = split_for_translation(text, max_bytes)
+    outcomes = map_bounded(
+        lambda chunk: _translate_chunk(chunk, target_language, source_language, translate),
+        chunks,
+        max_workers=max_workers or TRANSLATE_CHUNK_WORKERS,
+    )
+    for outcome in outcomes:
+        if not outcome.ok:
+            raise outcome.error
+    return {"translatedText": "".join(o.value for o in outcomes), "chunks": len(chunks)}
+
+
+def iter_translated_chunks(text, target_language, source_language="auto", max_bytes=None, max_workers=None,
+                           translate=None, ordered=False):
+    """
+    Generator over {"index", "translatedText"} for each chunk of `text`.
+
+    With ordered=False chunks are yielded as soon as they finish; the index
+    tells the caller where each belongs. With ordered=True chunks are yielded
+    in input order, each as soon as it and all earlier chunks are done.
+    """
+    chunks = split_for_translation(text, max_bytes)
+    if not chunks:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers or TRANSLATE_CHUNK_WORKERS, len(chunks))) as pool:
+        futures = {
+            pool.submit(_translate_chunk, chunk, target_language, source_language, translate): i
+            for i, chunk in enumerate(chunks)
+        }
+        if not ordered:
+            for future in as_completed(futures):
+                yield {"index": futures[future], "translatedText": future.result()}
+            return
+
+        by_index = {i: future for future, i in futures.items()}
+        for i in range(len(chunks)):
+            yield {"index": i, "translatedText": by_index[i].result()}
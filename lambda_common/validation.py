@@ -0,0 +1,177 @@
+"""
+Declarative request validation, compiled once per route.
+
+A route's Schema lists its body fields with the limits of the service behind
+them (e.g. Comprehend's 5,000-byte documents, see lambda_common.schemas).
+The field tree is compiled into plain closures when the entry point is
+imported, so a request is validated in a single pass over the body, and
+every problem comes back together in one structured 400:
+
+    {"error": "Missing text parameter",
+     "errors": [{"field": "text", "message": "Missing text parameter"}]}
+
+Schema.max_body_bytes is enforced by lambda_common.api before the body is
+decoded or parsed, so an oversized request is answered with 413 for the
+cost of a length check.
+"""
+
+import math
+import re
+
+from .responses import CORS_HEADERS, json_response
+
+_MISSING = object()
+# Problems listed in one 400; the count in "error" still covers all of them
+MAX_REPORTED_ERRORS = 20
+
+
+def utf8_len_over(text, limit):
+    """True when `text` encodes to more than `limit` UTF-8 bytes, encoding only when the length alone cannot tell."""
+    length = len(text)
+    if length > limit:
+        return True
+    if length * 4 <= limit:
+        return False
+    return len(text.encode("utf-8")) > limit
+
+
+class Field:
+    """Base class: compile() returns check(value, path, errors) for one value."""
+
+    description = "valid"
+
+    def __init__(self, required=False):
+        self.required = required
+
+    def compile(self):
+        raise NotImplementedError
+
+
+class Text(Field):
+    description = "a string"
+
+    def __init__(self, required=False, max_bytes=None, choices=None, pattern=None):
+        super().__init__(required)
+        self.max_bytes = max_bytes
+        self.choices = tuple(choices) if choices else None
+        self.pattern = re.compile(pattern) if pattern else None
+
+    def compile(self):
+        max_bytes, choices, pattern = self.max_bytes, self.choices, self.pattern
+        choice_set = frozenset(choices) if choices else None
+
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                errors.append((path, f"{path} must be a string"))
+            elif choice_set is not None and value not in choice_set:
+                errors.append((path, f"{path} must be one of {', '.join(choices)}"))
+            elif max_bytes is not None and utf8_len_over(value, max_bytes):
+                errors.append((path, f"{path} is longer than {max_bytes} bytes"))
+            elif pattern is not None and not pattern.match(value):
+                errors.append((path, f"{path} is not valid"))
+        return check
+
+
+class Number(Field):
+    description = "a number"
+
+    def __init__(self, required=False, minimum=None, maximum=None, integer=False):
+        super().__init__(required)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.integer = integer
+
+    def compile(self):
+        minimum, maximum, integer = self.minimum, self.maximum, self.integer
+        kind = "an integer" if integer else "a number"
+
+        def check(value, path, errors):
+            # Numeric strings are accepted if the handlers' int() / float() conversion takes them
+            # ("5.0" is a number but int("5.0") raises)
+            if isinstance(value, str):
+                try:
+                    value = int(value) if integer else float(value)
+                except ValueError:
+                    pass
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append((path, f"{path} must be {kind}"))
+            # inf / nan (1e999 in JSON, ?maxLabels=inf) would break int() and the range checks
+            elif isinstance(value, float) and not math.isfinite(value) or (integer and value != int(value)):
+                errors.append((path, f"{path} must be {kind}"))
+            elif (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+                errors.append((path, f"{path} must be between {minimum} and {maximum}"))
+        return check
+
+
+class ListOf(Field):
+    description = "a list"
+
+    def __init__(self, item=None, required=False, min_items=1, max_items=None):
+        super().__init__(required)
+        self.item = item
+        self.min_items = min_items
+        self.max_items = max_items
+
+    def compile(self):
+        check_item = self.item.compile() if self.item is not None else None
+        min_items, max_items = self.min_items, self.max_items
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append((path, f"{path} must be a list"))
+            elif len(value) < min_items:
+                errors.append((path, f"Missing {path} parameter"))
+            elif max_items is not None and len(value) > max_items:
+                errors.append((path, f"Too many {path} (max {max_items})"))
+            elif check_item is not None:
+                for i, item in enumerate(value):
+                    check_item(item, f"{path}[{i}]", errors)
+        return check
+
+
+class Object(Field):
+    description = "an object"
+
+    def __init__(self, fields, required=False):
+        super().__init__(required)
+        self.fields = fields
+
+    def compile(self):
+        compiled = tuple((name, field.required, field.compile()) for name, field in self.fields.items())
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path or "body", f"{path or 'Request body'} must be {self.description}"))
+                return
+            prefix = f"{path}." if path else ""
+            for name, required, check_field in compiled:
+                field_value = value.get(name, _MISSING)
+                if field_value is _MISSING or field_value is None or (required and field_value == ""):
+                    if required:
+                        errors.append((prefix + name, f"Missing {prefix + name} parameter"))
+                    continue
+                check_field(field_value, prefix + name, errors)
+        return check
+
+
+class Schema:
+    """Request body schema for one route: {name: Field} plus an optional body size limit."""
+
+    def __init__(self, fields, max_body_bytes=None):
+        self.fields = fields
+        self.max_body_bytes = max_body_bytes
+        self._check = Object(fields).compile()
+
+    def validate(self, body):
+        """List of (field, message) problems, empty when the body is valid."""
+        errors = []
+        self._check(body, "", errors)
+        return errors
+
+
+def validation_error_response(errors, headers=CORS_HEADERS):
+    messages = [message for _, message in errors]
+    return json_response(400, {
+        "error": messages[0] if len(messages) == 1 else f"{len(messages)} invalid parameters: {'; '.join(messages[:5])}",
+        "errors": [{"field": field, "message": message} for field, message in errors[:MAX_REPORTED_ERRORS]],
+    }, headers)
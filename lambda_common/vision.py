@@ -0,0 +1,136 @@
+"""
+Rekognition image analysis with an ETag-validated result cache.
+
+analyze_image runs the requested features (labels, text, moderation)
+concurrently against the same S3 object, so latency is close to the slowest
+call rather than the sum, and reports per-feature timings and errors.
+
+Results are keyed on bucket, key, the object's current ETag, the feature and
+its parameters. One cheap head_object call per request checks freshness, so
+overwriting an image under the same key invalidates its cached results.
+Inline uploads (image_bytes, see lambda_common.imaging) skip S3 entirely and
+are keyed on a SHA-256 of the bytes sent to Rekognition.
+
+The cache reads IMAGE_CACHE_* settings (same names as AI_CACHE_* in
+lambda_common.cache); the persisted /tmp tier can be turned off with
+IMAGE_CACHE_FILE_ENABLED=false.
+"""
+
+import hashlib
+import time
+
+from .cache import cache_from_env, make_key
+from .clients import get_client
+from .concurrency import map_bounded
+from .logs import log
+
+image_cache = cache_from_env(prefix="IMAGE_CACHE", default_path="/tmp/image-cache.sqlite3")
+
+
+def format_labels(response):
+    return [
+        {"Name": label["Name"], "Confidence": f"{label['Confidence']:.2f}%"}
+        for label in response["Labels"]
+    ]
+
+
+def object_etag(s3, bucket, key):
+    """Current ETag of the object, or None if it cannot be read."""
+    try:
+        return s3.head_object(Bucket=bucket, Key=key)["ETag"].strip('"')
+    except Exception as e:
+        log.warning("head_object failed, skipping image cache", bucket=bucket, key=key, error=str(e))
+        return None
+
+
+def format_text(response):
+    """(joined LINE detections, [{text, confidence}] per line)."""
+    lines = [
+        {"text": d["DetectedText"], "confidence": f"{d['Confidence']:.2f}%"}
+        for d in response.get("TextDetections", [])
+        if d.get("Type") == "LINE"
+    ]
+    return {"text": "\n".join(line["text"] for line in lines), "textLines": lines}
+
+
+def format_moderation(response):
+    return [
+        {"Name": label["Name"], "ParentName": label.get("ParentName", ""), "Confidence": f"{label['Confidence']:.2f}%"}
+        for label in response.get("ModerationLabels", [])
+    ]
+
+
+FEATURES = ("labels", "text", "moderation")
+
+
+def _feature_call(rekognition, feature, image, max_labels, min_confidence):
+    """(cache parameters, function returning the formatted result) for one feature."""
+    if feature == "labels":
+        def call():
+            return format_labels(rekognition.detect_labels(Image=image, MaxLabels=max_labels, MinConfidence=min_confidence))
+        return {"max_labels": max_labels, "min_confidence": min_confidence}, call
+    if feature == "text":
+        return {}, lambda: format_text(rekognition.detect_text(Image=image))
+    if feature == "moderation":
+        def call():
+            return format_moderation(rekognition.detect_moderation_labels(Image=image, MinConfidence=min_confidence))
+        return {"min_confidence": min_confidence}, call
+    raise ValueError(f"Unknown image feature: {feature}")
+
+
+def analyze_image(bucket, key, features=("labels",), max_labels=5, min_confidence=70, rekognition=None, s3=None,
+                  image_bytes=None):
+    """
+    Run `features` concurrently on one S3 image, or on `image_bytes` when
+    given (bucket and key are then ignored). Returns
+    {"results": {feature: value}, "errors": {feature: exception},
+     "cached": {feature: bool}, "timingsMs": {feature: ms}}.
+
+    `rekognition` / `s3` default to the shared registry clients.
+    """
+    rekognition = rekognition or get_client("rekognition")
+    if image_bytes is not None:
+        image = {"Bytes": image_bytes}
+        identity = {"sha256": hashlib.sha256(image_bytes).hexdigest()} if image_cache.enabled else None
+    else:
+        image = {"S3Object": {"Bucket": bucket, "Name": key}}
+        etag = object_etag(s3 or get_client("s3"), bucket, key) if image_cache.enabled else None
+        identity = {"bucket": bucket, "key": key, "etag": etag} if etag is not None else None
+
+    def run(feature):
+        started = time.perf_counter()
+        params, call = _feature_call(rekognition, feature, image, max_labels, min_confidence)
+        if identity is None:
+            value, cached = call(), False
+        else:
+            cache_key = make_key(f"detect-{feature}", "", **identity, **params)
+            value = image_cache.get(cache_key)
+            cached = value is not None
+            if not cached:
+                value = call()
+                image_cache.set(cache_key, value)
+        return value, cached, round((time.perf_counter() - started) * 1000, 3)
+
+    outcomes = map_bounded(run, list(features), max_workers=len(features))
+    analysis = {"results": {}, "errors": {}, "cached": {}, "timingsMs": {}}
+    for feature, outcome in zip(features, outcomes):
+        if outcome.ok:
+            value, cached, elapsed = outcome.value
+            analysis["results"][feature] = value
+            analysis["cached"][feature] = cached
+            analysis["timingsMs"][feature] = elapsed
+        else:
+            log.error("Image feature failed", feature=feature, bucket=bucket, key=key, error=str(outcome.error))
+            analysis["errors"][feature] = outcome.error
+
+    if identity is not None:
+        image_cache.log_stats("image-analysis")
+    return analysis
+
+
+def detect_labels(bucket, key, max_labels=5, min_confidence=70, rekognition=None, s3=None):
+    """Return {"labels": [...], "cached": bool} for an S3 image."""
+    analysis = analyze_image(bucket, key, ("labels",), max_labels, min_confidence, rekognition=rekognition, s3=s3)
+    if "labels" in analysis["errors"]:
+        raise analysis["errors"]["labels"]
+    return {"labels": analysis["results"]["labels"], "cached": analysis["cached"]["labels"]}
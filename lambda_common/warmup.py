@@ -0,0 +1,87 @@
+"""
+Init-phase preloading for provisioned concurrency and SnapStart.
+
+Entry points stay lazy by default: an on-demand cold start imports only the
+shared plumbing (lambda_common.api), and each route's handler module,
+boto3 and the service clients load with the first request that needs them.
+When the init phase is not on any request's path, that work is better done
+up front:
+
+- provisioned concurrency (AWS_LAMBDA_INITIALIZATION_TYPE=
+  provisioned-concurrency): import every route module and create the
+  service clients.
+- SnapStart (AWS_LAMBDA_INITIALIZATION_TYPE=snap-start): import every route
+  module and boto3 and run the warm-up hooks (e.g. building the language
+  profiles) before the snapshot is taken. Clients are not created, since
+  open connections and credentials do not survive a restore; after restore
+  the random generator is reseeded and the client registry is cleared.
+
+INIT_PRELOAD overrides the detection: "all" (modules and clients),
+"modules" or "none".
+"""
+
+import importlib
+import os
+import random
+import time
+
+from .api import resolve
+from .clients import client_registry
+from .logs import log
+from .resilience import timeout_tier
+
+_DEFAULT_MODES = {"provisioned-concurrency": "all", "snap-start": "modules"}
+
+
+def preload_mode():
+    mode = os.environ.get("INIT_PRELOAD")
+    if mode:
+        return mode.lower()
+    return _DEFAULT_MODES.get(os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand"), "none")
+
+
+def preload(api, services=(), warm=(), clients=True):
+    """
+    Import every route target of `api`, boto3 and the `warm` hooks
+    (callables or "module:function" strings) now; with `clients`, also
+    create the clients for `services`. Returns the elapsed milliseconds.
+    """
+    started = time.perf_counter()
+    for handler in api.handlers:
+        getattr(handler, "function", handler)
+    try:
+        importlib.import_module("boto3")
+    except ImportError:
+        pass
+    for hook in warm:
+        resolve(hook)()
+    if clients:
+        for service in services:
+            # The variant a call with a full invocation budget uses (see lambda_common.resilience)
+            read_timeout = timeout_tier(float("inf"), client_registry.options_for(service).get("read_timeout"))
+            client_registry.get(service, read_timeout=read_timeout)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log.info("Preloaded init phase", routes=len(api.handlers), clients=len(services) if clients else 0, elapsedMs=round(elapsed_ms, 3))
+    return elapsed_ms
+
+
+def _after_restore():
+    # Every restored sandbox would otherwise share the snapshot's random state
+    random.seed()
+    client_registry.reset()
+    log.info("Restored from snapshot")
+
+
+def init_phase(api, services=(), warm=()):
+    """Call at module level of an entry point; does nothing for on-demand cold starts unless INIT_PRELOAD says so."""
+    mode = preload_mode()
+    if mode not in ("all", "modules"):
+        return None
+    elapsed_ms = preload(api, services, warm, clients=mode == "all")
+    try:
+        from snapshot_restore_py import register_after_restore
+    except ImportError:
+        pass
+    else:
+        register_after_restore(_after_restore)
+    return elapsed_ms
@@ -0,0 +1,406 @@
+"""
+Local API Gateway emulator for the Lambda handlers in this repo.
+
+Turns HTTP requests into API Gateway proxy events (httpMethod, path,
+resource, headers, queryStringParameters, body / isBase64Encoded) and
+dispatches them to a pool of warm "containers": worker processes that each
+import the handler module once and then serve one request at a time, like
+Lambda execution environments.
+
+- Containers start on demand up to --containers per function; the first
+  request on a new container pays the real module import (cold start), plus
+  any extra --cold-start-ms you want to simulate.
+- Idle containers are reaped after --idle-seconds.
+- A container whose handler fails to import, or that exits, answers 502 with
+  the error, like a failed Lambda init, and is dropped from the pool.
+- HTTP/1.1 keep-alive is supported, so a load generator can reuse connections.
+- --stub-aws swaps boto3 for the benchmark fakes (benchmarks/_stub_aws.py)
+  with --latency-ms simulated service latency, for offline load tests.
+  Add --replay FIXTURE to answer with responses and latencies recorded from
+  real AWS by benchmarks/record_aws.py (scaled by --latency-scale).
+
+Usage:
+    python local-api-gateway.py --port 3000 --containers 8 --stub-aws
+    python local-api-gateway.py --stub-aws --replay benchmarks/fixtures/aws.json.gz --latency-scale 1
+    python local-api-gateway.py --route /ai/image-analyze=lambda-image-analyze.py:lambda_handler
+
+Point the Angular app's apiUrl at http://localhost:3000 to exercise the real
+routing and response code.
+"""
+
+import argparse
+import base64
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+TEXT_CONTENT_TYPES = ("application/json", "text/", "application/x-www-form-urlencoded", "application/xml")
+
+
+class LambdaContext:
+    def __init__(self, function_name, timeout_ms):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid.uuid4())
+        self.memory_limit_in_mb = 512
+        self._deadline = time.monotonic() + timeout_ms / 1000.0
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def container_main(conn, handler_spec, options):
+    """Worker process: import the handler once, then serve events from the pipe."""
+    sys.path.insert(0, REPO_ROOT)
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    init_start = time.perf_counter()
+
+    try:
+        if options["stub_aws"]:
+            sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+            import _stub_aws
+            _stub_aws.install(latency_ms=options["latency_ms"])
+            if options["replay"]:
+                import _replay_aws
+                _replay_aws.replay(options["replay"], latency_scale=options["latency_scale"])
+
+        filename, function_name = handler_spec.split(":")
+        spec = importlib.util.spec_from_file_location(
+            os.path.splitext(os.path.basename(filename))[0].replace("-", "_"),
+            os.path.join(REPO_ROOT, filename),
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        handler = getattr(module, function_name)
+    except BaseException as e:  # a failed init is reported like Lambda's Runtime.* errors
+        conn.send({"errorMessage": f"{handler_spec}: {e}", "errorType": type(e).__name__})
+        return
+
+    if options["cold_start_ms"]:
+        time.sleep(options["cold_start_ms"] / 1000.0)
+    conn.send({"initMs": (time.perf_counter() - init_start) * 1000})
+
+    while True:
+        try:
+            event = conn.recv()
+        except EOFError:
+            return
+        if event is None:
+            return
+        context = LambdaContext(handler_spec, options["timeout_ms"])
+        try:
+            response = handler(event, context)
+        except Exception as e:  # an unhandled error is a 502 at API Gateway
+            response = {"errorMessage": str(e), "errorType": type(e).__name__}
+        conn.send(response)
+
+
+class ContainerError(Exception):
+    """The container process failed to initialise or died mid-invocation."""
+
+    def __init__(self, message, error_type="Runtime.ExitError"):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class Container:
+    def __init__(self, mp, handler_spec, options):
+        self.id = uuid.uuid4().hex[:8]
+        self.conn, child = mp.Pipe()
+        self.process = mp.Process(target=container_main, args=(child, handler_spec, options), daemon=True)
+        self.process.start()
+        self.init_ms = None
+        self.last_used = time.monotonic()
+        self.invocations = 0
+
+    def invoke(self, event, timeout_s):
+        """
+        Returns (response, cold, init_ms). Raises TimeoutError if the container
+        does not answer, and ContainerError if its init failed or it exited.
+        """
+        cold = self.init_ms is None
+        try:
+            if cold:
+                if not self.conn.poll(timeout_s):
+                    raise TimeoutError("container init timed out")
+                init = self.conn.recv()
+                if "initMs" not in init:
+                    raise ContainerError(init["errorMessage"], init["errorType"])
+                self.init_ms = init["initMs"]
+            self.conn.send(event)
+            if not self.conn.poll(timeout_s):
+                raise TimeoutError("invocation timed out")
+            response = self.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            self.process.join(timeout=1)
+            raise ContainerError(f"container exited with code {self.process.exitcode}") from None
+        self.invocations += 1
+        self.last_used = time.monotonic()
+        return response, cold, self.init_ms
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class ContainerPool:
+    """Up to `size` containers for one handler; each serves one request at a time."""
+
+    def __init__(self, mp, handler_spec, size, options):
+        self.mp = mp
+        self.handler_spec = handler_spec
+        self.options = options
+        self.idle = []
+        self.all = set()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.stats = {"invocations": 0, "coldStarts": 0, "timeouts": 0, "crashes": 0}
+
+    def invoke(self, event):
+        timeout_s = self.options["timeout_ms"] / 1000.0
+        with self.slots:
+            with self.lock:
+                container = self.idle.pop() if self.idle else None
+                if container is None:
+                    container = Container(self.mp, self.handler_spec, self.options)
+                    self.all.add(container)
+            try:
+                response, cold, init_ms = container.invoke(event, timeout_s)
+            except (TimeoutError, ContainerError) as e:
+                with self.lock:
+                    self.all.discard(container)
+                    self.stats["timeouts" if isinstance(e, TimeoutError) else "crashes"] += 1
+                container.process.kill()
+                raise
+            with self.lock:
+                self.idle.append(container)
+                self.stats["invocations"] += 1
+                self.stats["coldStarts"] += int(cold)
+        return response, cold, init_ms, container.id
+
+    def reap(self, idle_seconds):
+        cutoff = time.monotonic() - idle_seconds
+        with self.lock:
+            expired = [c for c in self.idle if c.last_used < cutoff]
+            self.idle = [c for c in self.idle if c.last_used >= cutoff]
+            self.all.difference_update(expired)
+        for container in expired:
+            container.stop()
+
+    def shutdown(self):
+        with self.lock:
+            containers, self.all, self.idle = list(self.all), set(), []
+        for container in containers:
+            container.stop()
+
+
+def build_event(method, raw_path, headers, body_bytes, stage):
+    url = urlsplit(raw_path)
+    query = parse_qs(url.query, keep_blank_values=True)
+    content_type = headers.get("Content-Type", "")
+
+    body, is_base64 = None, False
+    if body_bytes:
+        if not content_type or content_type.startswith(TEXT_CONTENT_TYPES):
+            try:
+                body = body_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                body, is_base64 = base64.b64encode(body_bytes).decode("ascii"), True
+        else:
+            body, is_base64 = base64.b64encode(body_bytes).decode("ascii"), True
+
+    multi_headers = {}
+    for name, value in headers.items():
+        multi_headers.setdefault(name, []).append(value)
+
+    return {
+        "resource": url.path,
+        "path": url.path,
+        "httpMethod": method,
+        "headers": dict(headers.items()),
+        "multiValueHeaders": multi_headers,
+        "queryStringParameters": {k: v[-1] for k, v in query.items()} or None,
+        "multiValueQueryStringParameters": query or None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "requestId": str(uuid.uuid4()),
+            "stage": stage,
+            "httpMethod": method,
+            "path": f"/{stage}{url.path}",
+            "requestTimeEpoch": int(time.time() * 1000),
+            "identity": {"sourceIp": "127.0.0.1", "userAgent": headers.get("User-Agent")},
+        },
+        "body": body,
+        "isBase64Encoded": is_base64,
+    }
+
+
+def make_handler_class(gateway):
+    class GatewayRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, format, *args):
+            if gateway.verbose:
+                super().log_message(format, *args)
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            event = build_event(self.command, self.path, self.headers, body, gateway.stage)
+            pool = gateway.pool_for(event["path"])
+
+            started = time.perf_counter()
+            try:
+                response, cold, init_ms, container_id = pool.invoke(event)
+            except TimeoutError:
+                return self._send(504, {"Content-Type": "application/json"}, b'{"message": "Endpoint request timed out"}')
+            except ContainerError as e:
+                # API Gateway answers a failed Lambda init with a 502; the error goes to the container's log
+                print(f"❌ {e.error_type}: {e}", file=sys.stderr, flush=True)
+                payload = {"message": "Internal server error", "errorType": e.error_type, "errorMessage": str(e)}
+                return self._send(502, {"Content-Type": "application/json"}, json.dumps(payload).encode("utf-8"))
+
+            extra = {
+                "X-Container-Id": container_id,
+                "X-Cold-Start": "true" if cold else "false",
+                "X-Gateway-Latency-Ms": f"{(time.perf_counter() - started) * 1000:.2f}",
+            }
+            if cold:
+                extra["X-Init-Duration-Ms"] = f"{init_ms:.2f}"
+
+            if not isinstance(response, dict) or "statusCode" not in response:
+                return self._send(502, dict(extra, **{"Content-Type": "application/json"}),
+                                  b'{"message": "Internal server error"}')
+
+            headers = dict(response.get("headers") or {})
+            for name, values in (response.get("multiValueHeaders") or {}).items():
+                headers[name] = ", ".join(values)
+            headers.update(extra)
+
+            payload = response.get("body") or ""
+            if response.get("isBase64Encoded"):
+                payload = base64.b64decode(payload)
+            elif not isinstance(payload, bytes):
+                payload = payload.encode("utf-8")
+            self._send(int(response["statusCode"]), headers, payload)
+
+        def _send(self, status, headers, payload):
+            self.send_response(status)
+            for name, value in headers.items():
+                if name.lower() not in ("content-length", "connection"):
+                    self.send_header(name, str(value))
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = do_HEAD = _handle
+
+    return GatewayRequestHandler
+
+
+class Gateway:
+    def __init__(self, routes, default_handler, options, containers, stage="Dev", verbose=False, start_method="spawn"):
+        self.mp = multiprocessing.get_context(start_method)
+        self.options = options
+        self.stage = stage
+        self.verbose = verbose
+        self.routes = sorted(routes.items(), key=lambda r: len(r[0]), reverse=True)
+        self.default_handler = default_handler
+        self.pools = {}
+        for spec in {default_handler, *routes.values()}:
+            self.pools[spec] = ContainerPool(self.mp, spec, containers, options)
+
+    def pool_for(self, path):
+        for prefix, spec in self.routes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return self.pools[spec]
+        return self.pools[self.default_handler]
+
+    def stats(self):
+        return {spec: dict(pool.stats, containers=len(pool.all)) for spec, pool in self.pools.items()}
+
+    def reap_forever(self, idle_seconds):
+        while True:
+            time.sleep(min(idle_seconds, 5))
+            for pool in self.pools.values():
+                pool.reap(idle_seconds)
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+def parse_route(value):
+    prefix, _, spec = value.partition("=")
+    if not prefix.startswith("/") or ":" not in spec:
+        raise argparse.ArgumentTypeError("routes look like /ai/translate=lambda-translate-fixed.py:lambda_handler")
+    return prefix, spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--handler", default="fixed-lambda.py:lambda_handler", help="default function (file:function)")
+    parser.add_argument("--route", type=parse_route, action="append", default=[], help="path prefix routed to another function")
+    parser.add_argument("--containers", type=int, default=4, help="max warm containers per function")
+    parser.add_argument("--cold-start-ms", type=float, default=0.0, help="extra simulated init delay per new container")
+    parser.add_argument("--idle-seconds", type=float, default=300.0, help="reap containers idle this long")
+    parser.add_argument("--timeout-ms", type=int, default=29000, help="invocation timeout (API Gateway caps at 29s)")
+    parser.add_argument("--stage", default="Dev")
+    parser.add_argument("--stub-aws", action="store_true", help="use the benchmark fakes instead of real AWS")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated AWS latency with --stub-aws")
+    parser.add_argument("--replay", metavar="FIXTURE", help="with --stub-aws, answer from a benchmarks/record_aws.py fixture")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for replayed latencies")
+    parser.add_argument("--start-method", default="spawn", choices=("spawn", "fork", "forkserver"))
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    if args.replay and not args.stub_aws:
+        parser.error("--replay needs --stub-aws")
+
+    options = {
+        "stub_aws": args.stub_aws,
+        "replay": os.path.abspath(args.replay) if args.replay else None,
+        "latency_scale": args.latency_scale,
+        "latency_ms": args.latency_ms,
+        "cold_start_ms": args.cold_start_ms,
+        "timeout_ms": args.timeout_ms,
+    }
+    gateway = Gateway(dict(args.route), args.handler, options, args.containers,
+                      stage=args.stage, verbose=args.verbose, start_method=args.start_method)
+    threading.Thread(target=gateway.reap_forever, args=(args.idle_seconds,), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler_class(gateway))
+    server.daemon_threads = True
+    print(f"🚀 Local API Gateway on http://{args.host}:{args.port} (stage {args.stage})", flush=True)
+    print(f"   default function: {args.handler}")
+    for prefix, spec in args.route:
+        print(f"   {prefix} -> {spec}")
+    print(f"   up to {args.containers} containers per function{' (replayed AWS)' if args.replay else ' (stubbed AWS)' if args.stub_aws else ''}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 {json.dumps(gateway.stats(), indent=2)}")
+        gateway.shutdown()
+
+
+if __name__ == "__main__":
+    main()
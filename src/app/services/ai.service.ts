@@ -1,10 +1,13 @@
 import { Injectable } from "@angular/core"
-import { HttpClient } from "@angular/common/http"
+import { HttpClient, HttpParams } from "@angular/common/http"
 import type { Observable } from "rxjs"
 import { catchError, timeout, map } from "rxjs/operators"
 import { throwError } from "rxjs"
 import type { AIInsights } from "../models/task.model"
 
+// Longest query string sent as a GET; longer texts go in a POST body
+const MAX_GET_QUERY_LENGTH = 2000
+
 /**
  * AI Service - Handles all AI-related API calls to the backend
  * 
@@ -17,8 +20,43 @@ import type { AIInsights } from "../models/task.model"
  * 6. Use AWS SDK for service integrations
  */
 
+export type ImageFeature = "labels" | "text" | "moderation";
+
 export interface ImageLabels {
   labels: { Name: string; Confidence: string }[];
+  text?: string;
+  textLines?: { text: string; confidence: string }[];
+  moderation?: { Name: string; ParentName: string; Confidence: string }[];
+  cached?: boolean;
+  timingsMs?: Partial<Record<ImageFeature, number>>;
+  errors?: Partial<Record<ImageFeature, string>>;
+  image?: { originalBytes: number; bytes: number; format: string | null; resized: boolean; width?: number; height?: number };
+}
+
+export interface TranslationBatchResponse {
+  results: ({ translatedText: string; targetLanguage: string } | { error: string })[];
+  succeeded: number;
+  failed: number;
+}
+
+export interface MultiTranslationResponse {
+  sourceLanguage: string;
+  translations: Record<string, { translatedText: string; chunks: number }>;
+  skipped: string[];
+  errors: Record<string, string>;
+  timingsMs: Record<string, number>;
+}
+
+export type PipelineStage = "detect-language" | "translate" | "sentiment";
+
+export interface PipelineResponse {
+  results: {
+    "detect-language"?: { language: string; languageCode: string; confidence: number };
+    translate?: { translatedText: string; sourceLanguage: string; targetLanguage: string; chunks: number };
+    sentiment?: { sentiment: string; sentimentScore: Record<string, number>; languageCode: string };
+  };
+  errors: Partial<Record<PipelineStage, string>>;
+  timingsMs: Partial<Record<PipelineStage, number>>;
 }
 
 @Injectable({
@@ -37,10 +75,26 @@ export class AIService {
   constructor(private http: HttpClient) {}
 
 
-  analyzeImage(bucket: string, key: string): Observable<ImageLabels> {
+  /**
+   * Runs the requested Rekognition features (labels by default) on an S3 image in one request.
+   * Features run concurrently; one that fails is listed in errors while the others still return.
+   */
+  analyzeImage(bucket: string, key: string, features: ImageFeature[] = ["labels"]): Observable<ImageLabels> {
     return this.http.post<ImageLabels>(`${this.apiUrl}/ai/image-analyze`, {
       bucket,
       key,
+      features,
+    }).pipe(catchError(this.handleError))
+  }
+
+  /**
+   * Same as analyzeImage for an image that is not in S3. `image` is base64 or a data URL
+   * (FileReader.readAsDataURL); large photos are downscaled server-side before analysis.
+   */
+  analyzeImageData(image: string, features: ImageFeature[] = ["labels"]): Observable<ImageLabels> {
+    return this.http.post<ImageLabels>(`${this.apiUrl}/ai/image-analyze`, {
+      image,
+      features,
     }).pipe(catchError(this.handleError))
   }
 
@@ -114,8 +168,8 @@ export class AIService {
   /**
    * Translates text to target language
    * 
-   * BACKEND ENDPOINT REQUIRED: POST /ai/translate
-   * Request body: { text: string, targetLanguage: string }
+   * BACKEND ENDPOINT REQUIRED: GET or POST /ai/translate
+   * Request: ?text=&targetLanguage= (short texts, cacheable) or body { text: string, targetLanguage: string }
    * Response: { translatedText: string }
    * 
    * AWS IMPLEMENTATION:
@@ -131,10 +185,7 @@ export class AIService {
     console.log('🌐 AI Service: Calling endpoint:', `${this.apiUrl}/ai/translate`)
     console.log('🌐 AI Service: Request payload:', { text, targetLanguage })
     
-    return this.http.post<{ translatedText: string }>(`${this.apiUrl}/ai/translate`, {
-      text,
-      targetLanguage,
-    }).pipe(
+    return this.getOrPost<{ translatedText: string }>("/ai/translate", { text, targetLanguage }).pipe(
       map((response) => {
         console.log('🌐 AI Service: Translation response:', response)
         return response
@@ -146,6 +197,41 @@ export class AIService {
     )
   }
 
+  /**
+   * Translates one text into several languages in a single request
+   *
+   * BACKEND ENDPOINT REQUIRED: GET or POST /ai/translate
+   * Request: ?text=&targetLanguages=es&targetLanguages=fr or body { text: string, targetLanguages: string[], sourceLanguage?: string }
+   * Response: { sourceLanguage, translations, skipped, errors, timingsMs } keyed by language
+   *
+   * The source language is detected once and all targets are translated concurrently;
+   * targets equal to the source come back in skipped, failed ones in errors.
+   */
+  translateTextMulti(text: string, targetLanguages: string[]): Observable<MultiTranslationResponse> {
+    return this.getOrPost<MultiTranslationResponse>("/ai/translate", { text, targetLanguages }).pipe(
+      catchError(this.handleError),
+    )
+  }
+
+  /**
+   * Translates many texts in a single request
+   *
+   * BACKEND ENDPOINT REQUIRED: POST /ai/translate/batch
+   * Request body: { texts: (string | { text: string, targetLanguage?: string })[], targetLanguage: string }
+   * Response: { results: ({ translatedText: string, targetLanguage: string } | { error: string })[] }
+   *
+   * Results come back in input order; failed items carry an error instead of a translation.
+   */
+  translateBatch(
+    texts: (string | { text: string; targetLanguage?: string })[],
+    targetLanguage: string,
+  ): Observable<TranslationBatchResponse> {
+    return this.http.post<TranslationBatchResponse>(`${this.apiUrl}/ai/translate/batch`, {
+      texts,
+      targetLanguage,
+    }).pipe(catchError(this.handleError))
+  }
+
   /**
    * Generates audio from text using text-to-speech
    * 
@@ -171,8 +257,8 @@ export class AIService {
   /**
    * Detects the language of input text
    * 
-   * BACKEND ENDPOINT REQUIRED: POST /ai/detect-language
-   * Request body: { text: string }
+   * BACKEND ENDPOINT REQUIRED: GET or POST /ai/detect-language
+   * Request: ?text= (short texts, cacheable) or body { text: string }
    * Response: { language: string, languageCode: string, confidence: number }
    * 
    * AWS IMPLEMENTATION:
@@ -183,13 +269,48 @@ export class AIService {
    * - Cache results in ElastiCache for repeated text
    */
   detectLanguage(text: string): Observable<{ language: string; languageCode: string; confidence: number }> {
-    return this.http.post<{ language: string; languageCode: string; confidence: number }>(
-      `${this.apiUrl}/ai/detect-language`,
+    return this.getOrPost<{ language: string; languageCode: string; confidence: number }>(
+      "/ai/detect-language",
       { text },
     ).pipe(catchError(this.handleError))
   }
 
 
+  /**
+   * Runs language detection, translation and sentiment for one text in a single request
+   *
+   * BACKEND ENDPOINT REQUIRED: POST /ai/pipeline
+   * Request body: { text: string, stages?: PipelineStage[], targetLanguage?: string, sourceLanguage?: string }
+   * Response: { results, errors, timingsMs } keyed by stage
+   *
+   * The detected language is reused as the translation source and the sentiment language;
+   * a stage that fails is reported in errors while the others still return results.
+   */
+  runPipeline(
+    text: string,
+    targetLanguage: string,
+    stages: PipelineStage[] = ["detect-language", "translate", "sentiment"],
+  ): Observable<PipelineResponse> {
+    return this.http.post<PipelineResponse>(`${this.apiUrl}/ai/pipeline`, {
+      text,
+      targetLanguage,
+      stages,
+    }).pipe(catchError(this.handleError))
+  }
+
+  /**
+   * GET with query parameters when they fit comfortably in a URL, so the browser
+   * can reuse cached responses (Cache-Control / ETag) and skip the CORS preflight;
+   * POST otherwise.
+   */
+  private getOrPost<T>(path: string, params: Record<string, string | string[]>): Observable<T> {
+    const url = `${this.apiUrl}${path}`
+    const query = new HttpParams({ fromObject: params })
+    if (query.toString().length <= MAX_GET_QUERY_LENGTH) {
+      return this.http.get<T>(url, { params: query })
+    }
+    return this.http.post<T>(url, params)
+  }
 
   private handleError(error: any) {
     console.error('AI Service Error:', error)
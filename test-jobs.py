@@ -0,0 +1,149 @@
+"""
+Offline tests for the bulk image-analysis job queue (lambda_common/jobs.py).
+
+SQS is replaced with a botocore Stubber and the analysis step with a plain
+function, so no AWS account is needed:
+
+    python test-jobs.py
+"""
+
+import json
+import os
+import sys
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common.clients import client_registry
+from lambda_common.jobs import JobStore, SqsQueue, SqsTrigger, process_messages
+
+QUEUE_URL = "https://sqs.us-east-1.amazonaws.com/123456789012/image-jobs"
+OBJECTS = [{"bucket": "tasks", "key": f"img/{i}.jpg"} for i in range(3)]
+
+
+def analyze(bucket, key, params):
+    if key == "img/1.jpg":
+        raise RuntimeError("Rekognition failed")
+    return {"labels": [{"name": key}]}
+
+
+def sqs_event(job_id, count):
+    """An SQS event-source mapping event with one record per task."""
+    return {"Records": [
+        {
+            "messageId": f"message-{seq}",
+            "receiptHandle": f"receipt-{seq}",
+            "body": json.dumps({"jobId": job_id, "seq": seq}),
+            "eventSource": "aws:sqs",
+        }
+        for seq in range(count)
+    ]}
+
+
+def stubbed_sqs():
+    sqs = boto3.client("sqs", region_name="us-east-1")
+    client_registry.register("sqs", sqs)
+    return sqs
+
+
+def test_trigger_reports_only_failed_messages():
+    store = JobStore()
+    job_id = store.create_job(OBJECTS)
+    trigger = SqsTrigger(sqs_event(job_id, len(OBJECTS))["Records"])
+
+    # No responses queued: any SQS call (e.g. deleting by messageId) fails the test
+    with Stubber(stubbed_sqs()) as sqs_stub:
+        outcome = process_messages(store, trigger, trigger.messages, analyze, max_workers=2)
+        sqs_stub.assert_no_pending_responses()
+
+    assert outcome["succeeded"] == 2, outcome
+    assert [message_id for _, _, message_id in outcome["retry"]] == ["message-1"], outcome["retry"]
+    assert store.job(job_id)["completed"] == 2
+
+
+def test_redelivered_finished_task_is_not_run_again():
+    store = JobStore()
+    job_id = store.create_job(OBJECTS[:1])
+    trigger = SqsTrigger(sqs_event(job_id, 1)["Records"])
+    process_messages(store, trigger, trigger.messages, analyze)
+
+    calls = []
+    outcome = process_messages(store, trigger, trigger.messages, lambda *args: calls.append(args))
+    assert calls == []
+    assert outcome["succeeded"] == 1 and outcome["retry"] == [], outcome
+
+
+def test_polling_queue_deletes_finished_messages_by_receipt_handle():
+    store = JobStore()
+    job_id = store.create_job(OBJECTS)
+    queue = SqsQueue(store, QUEUE_URL)
+
+    with Stubber(stubbed_sqs()) as sqs_stub:
+        sqs_stub.add_response(
+            "receive_message",
+            {"Messages": [
+                {"MessageId": record["messageId"], "ReceiptHandle": record["receiptHandle"], "Body": record["body"]}
+                for record in sqs_event(job_id, len(OBJECTS))["Records"]
+            ]},
+            expected_params={"QueueUrl": QUEUE_URL, "MaxNumberOfMessages": 10},
+        )
+        for seq in (0, 2):
+            sqs_stub.add_response(
+                "delete_message", {}, expected_params={"QueueUrl": QUEUE_URL, "ReceiptHandle": f"receipt-{seq}"}
+            )
+
+        # One worker so the deletes happen in the order stubbed above
+        outcome = process_messages(store, queue, queue.get(10), analyze, max_workers=1)
+        sqs_stub.assert_no_pending_responses()
+
+    assert outcome["succeeded"] == 2, outcome
+    assert [receipt for _, _, receipt in outcome["retry"]] == ["receipt-1"], outcome["retry"]
+
+
+def test_failed_delete_does_not_retry_a_finished_task():
+    store = JobStore()
+    job_id = store.create_job(OBJECTS[:1])
+    queue = SqsQueue(store, QUEUE_URL)
+    message = (job_id, 0, "receipt-0")
+
+    with Stubber(stubbed_sqs()) as sqs_stub:
+        sqs_stub.add_client_error("delete_message", service_error_code="ReceiptHandleIsInvalid", http_status_code=400)
+        outcome = process_messages(store, queue, [message], analyze)
+        sqs_stub.assert_no_pending_responses()
+
+    assert outcome["succeeded"] == 1 and outcome["retry"] == [], outcome
+    assert store.job(job_id)["status"] == "completed"
+
+
+def main():
+    print("🧪 Testing the image-analysis job queue offline (botocore Stubber)\n")
+    tests = [
+        test_trigger_reports_only_failed_messages,
+        test_redelivered_finished_task_is_not_run_again,
+        test_polling_queue_deletes_finished_messages_by_receipt_handle,
+        test_failed_delete_does_not_retry_a_finished_task,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            client_registry.reset()
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
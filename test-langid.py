@@ -0,0 +1,127 @@
+"""
+Offline tests for the local language identifier (lambda_common/langid.py)
+and its fallback to Comprehend in /ai/detect-language. Comprehend is
+replaced with a botocore Stubber, so no AWS account is needed:
+
+    python test-langid.py
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common.clients import client_registry
+from lambda_common.langid import detect_language_locally, identifier
+
+SUPPORTED = [
+    ("en", "Send the invoice to the accounting department"),
+    ("es", "Pedir sillas nuevas para la oficina y preguntar cuándo las pueden entregar"),
+    ("fr", "Commander de nouvelles chaises pour le bureau et demander quand elles seront livrées"),
+    ("de", "Die Datenbank am Wochenende auf den neuen Server umziehen"),
+    ("it", "Inviare la fattura all'ufficio contabilità"),
+    ("pt", "Falar com a Sara sobre a renovação do contrato"),
+    ("nl", "Nieuwe stoelen voor het kantoor bestellen en vragen wanneer ze geleverd worden"),
+]
+
+# Close neighbours of supported languages; none of these are in the samples
+UNSUPPORTED = [
+    ("ro", "Trimite factura la departamentul de contabilitate înainte de vineri."),
+    ("ro", "Trimite factura la departamentul de contabilitate inainte de vineri."),
+    ("ro", "Comandă scaune noi pentru birou și întreabă când pot fi livrate"),
+    ("af", "Stuur die faktuur na die rekeningafdeling voor Vrydag"),
+    ("af", "Bestel nuwe stoele vir die kantoor en vra wanneer hulle afgelewer kan word"),
+    ("af", "Skuif die databasis hierdie naweek na die nuwe bediener"),
+    ("ca", "Envia la factura al departament de comptabilitat abans de divendres"),
+    ("ca", "Demana cadires noves per a l'oficina i pregunta quan les poden lliurar"),
+    ("gl", "Enviar a factura ao departamento de contabilidade antes do venres"),
+    ("gl", "Corrixir o erro de escritura na páxina principal"),
+    ("tl", "Ipadala ang invoice sa departamento ng accounting bago mag-Biyernes"),
+    ("tl", "Kausapin si Sara tungkol sa pag-renew ng kontrata"),
+]
+
+
+def load_fixed_lambda():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixed-lambda.py")
+    spec = importlib.util.spec_from_file_location("fixed_lambda", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_supported_languages_are_answered_locally():
+    for language, text in SUPPORTED:
+        result = detect_language_locally(text)
+        assert result is not None and result["languageCode"] == language, (language, result)
+
+
+def test_close_unsupported_languages_fall_back():
+    for language, text in UNSUPPORTED:
+        assert language not in identifier.supported
+        result = detect_language_locally(text)
+        assert result is None, (language, text, result)
+
+
+def test_fallbacks_do_not_depend_on_the_confidence_threshold():
+    # Even a permissive threshold must not name a supported look-alike
+    for language, text in UNSUPPORTED:
+        result = detect_language_locally(text, threshold=0.5)
+        assert result is None, (language, text, result)
+
+
+def test_rejected_text_is_detected_by_comprehend():
+    handler = load_fixed_lambda()
+    text = UNSUPPORTED[0][1]
+    comprehend = boto3.client("comprehend", region_name="us-east-1")
+    client_registry.register("comprehend", comprehend)
+
+    with Stubber(comprehend) as stub:
+        stub.add_response(
+            "detect_dominant_language",
+            {"Languages": [{"LanguageCode": "ro", "Score": 0.99}]},
+            expected_params={"Text": text},
+        )
+        event = {"httpMethod": "POST", "path": "/ai/detect-language", "body": json.dumps({"text": text})}
+        response = handler.lambda_handler(event, None)
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    assert json.loads(response["body"])["languageCode"] == "ro", response["body"]
+
+
+def main():
+    print("🧪 Testing the local language identifier offline (botocore Stubber)\n")
+    tests = [
+        test_supported_languages_are_answered_locally,
+        test_close_unsupported_languages_fall_back,
+        test_fallbacks_do_not_depend_on_the_confidence_threshold,
+        test_rejected_text_is_detected_by_comprehend,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            client_registry.reset()
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Offline tests for /ai/pipeline (lambda_common/handlers/pipeline.py) and
+multi-target /ai/translate, which share its source language detection.
+Comprehend and Translate are replaced with botocore Stubbers, so no AWS
+account is needed:
+
+    python test-pipeline.py
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common import schemas
+from lambda_common.clients import client_registry
+from lambda_common.handlers import text as text_handlers
+from lambda_common.handlers import translate as translate_handlers
+
+# Romanian is not in the local identifier's samples, so it goes to Comprehend
+ROMANIAN = "Trimite factura la departamentul de contabilitate înainte de vineri. "
+
+SCORES = {"Positive": 0.1, "Negative": 0.1, "Neutral": 0.7, "Mixed": 0.1}
+
+
+def load_fixed_lambda():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixed-lambda.py")
+    spec = importlib.util.spec_from_file_location("fixed_lambda", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pipeline(handler, body):
+    event = {"httpMethod": "POST", "path": "/ai/pipeline", "body": json.dumps(body)}
+    return handler.lambda_handler(event, None)
+
+
+def translate_multi(handler, body):
+    event = {"httpMethod": "POST", "path": "/ai/translate", "body": json.dumps(body)}
+    return handler.lambda_handler(event, None)
+
+
+def stubbed(service):
+    client = boto3.client(service, region_name="us-east-1")
+    client_registry.register(service, client)
+    return client
+
+
+@contextmanager
+def local_guess(code):
+    """Make the local identifier answer code, confidently and wrongly."""
+    original = text_handlers.detect_language_locally
+    text_handlers.detect_language_locally = lambda text, **kwargs: {"language": code, "languageCode": code, "confidence": 0.99}
+    try:
+        yield
+    finally:
+        text_handlers.detect_language_locally = original
+
+
+def long_text(sentence):
+    text = sentence * (schemas.COMPREHEND_MAX_TEXT_BYTES // len(sentence.encode("utf-8")) + 2)
+    assert schemas.COMPREHEND_MAX_TEXT_BYTES < len(text.encode("utf-8")) <= schemas.TRANSLATE_MAX_TEXT_BYTES
+    return text
+
+
+def test_long_text_is_cut_to_comprehend_limit_for_detection(handler):
+    text = long_text(ROMANIAN)
+    sample = text.encode("utf-8")[:schemas.COMPREHEND_MAX_TEXT_BYTES].decode("utf-8", errors="ignore")
+
+    with Stubber(stubbed("comprehend")) as stub:
+        stub.add_response(
+            "detect_dominant_language",
+            {"Languages": [{"LanguageCode": "ro", "Score": 0.99}]},
+            expected_params={"Text": sample},
+        )
+        response = pipeline(handler, {"text": text, "stages": ["detect-language"]})
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    assert json.loads(response["body"])["results"]["detect-language"]["languageCode"] == "ro"
+
+
+def test_long_text_is_cut_to_comprehend_limit_for_sentiment(handler):
+    # A multi-byte character straddles the limit; the cut must not split it
+    text = "a" * (schemas.COMPREHEND_MAX_TEXT_BYTES - 1) + "é" + long_text("The meeting went well. ")
+
+    with Stubber(stubbed("comprehend")) as stub:
+        stub.add_response(
+            "detect_sentiment",
+            {"Sentiment": "NEUTRAL", "SentimentScore": SCORES},
+            expected_params={"Text": "a" * (schemas.COMPREHEND_MAX_TEXT_BYTES - 1), "LanguageCode": "en"},
+        )
+        response = pipeline(handler, {"text": text, "stages": ["sentiment"], "sourceLanguage": "en"})
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    assert json.loads(response["body"])["results"]["sentiment"]["sentiment"] == "NEUTRAL"
+
+
+def test_same_language_is_one_untranslated_chunk(handler):
+    text = "Pedir sillas nuevas para la oficina"
+    body = {"text": text, "stages": ["translate"], "sourceLanguage": "es", "targetLanguage": "es"}
+    response = pipeline(handler, body)
+
+    assert response["statusCode"] == 200, response
+    result = json.loads(response["body"])["results"]["translate"]
+    assert result["translatedText"] == text and result["chunks"] == 1, result
+    assert client_registry.stats()["created"] == 0
+
+
+def test_local_guess_is_not_the_translation_source(handler):
+    with local_guess("it"), Stubber(stubbed("translate")) as stub:
+        stub.add_response(
+            "translate_text",
+            {"TranslatedText": "Send the invoice", "SourceLanguageCode": "ro", "TargetLanguageCode": "en"},
+            expected_params={"Text": ROMANIAN, "SourceLanguageCode": "auto", "TargetLanguageCode": "en"},
+        )
+        body = {"text": ROMANIAN, "stages": ["detect-language", "translate"], "targetLanguage": "en"}
+        response = pipeline(handler, body)
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    results = json.loads(response["body"])["results"]
+    assert results["detect-language"]["languageCode"] == "it", results
+    assert results["translate"]["sourceLanguage"] == "auto", results
+
+
+def test_sentiment_language_comes_from_comprehend(handler):
+    with local_guess("it"), Stubber(stubbed("comprehend")) as stub:
+        stub.add_response(
+            "detect_dominant_language",
+            {"Languages": [{"LanguageCode": "es", "Score": 0.99}]},
+            expected_params={"Text": ROMANIAN},
+        )
+        stub.add_response(
+            "detect_sentiment",
+            {"Sentiment": "NEUTRAL", "SentimentScore": SCORES},
+            expected_params={"Text": ROMANIAN, "LanguageCode": "es"},
+        )
+        response = pipeline(handler, {"text": ROMANIAN, "stages": ["sentiment"]})
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    assert json.loads(response["body"])["results"]["sentiment"]["languageCode"] == "es"
+
+
+def test_local_guess_skips_no_targets(handler):
+    with local_guess("it"), Stubber(stubbed("translate")) as stub:
+        for target in ("en", "it"):
+            stub.add_response(
+                "translate_text",
+                {"TranslatedText": f"({target})", "SourceLanguageCode": "ro", "TargetLanguageCode": target},
+                expected_params={"Text": ROMANIAN, "SourceLanguageCode": "auto", "TargetLanguageCode": target},
+            )
+        # One target at a time, so the stubbed responses are consumed in order
+        workers, translate_handlers.TRANSLATE_TARGET_WORKERS = translate_handlers.TRANSLATE_TARGET_WORKERS, 1
+        try:
+            response = translate_multi(handler, {"text": ROMANIAN, "targetLanguages": ["en", "it"]})
+        finally:
+            translate_handlers.TRANSLATE_TARGET_WORKERS = workers
+        stub.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    body = json.loads(response["body"])
+    assert body["sourceLanguage"] == "auto" and body["skipped"] == [], body
+    assert sorted(body["translations"]) == ["en", "it"], body
+
+
+def test_comprehend_detection_skips_the_source(handler):
+    with Stubber(stubbed("comprehend")) as comprehend, Stubber(stubbed("translate")) as translate:
+        comprehend.add_response(
+            "detect_dominant_language",
+            {"Languages": [{"LanguageCode": "ro", "Score": 0.99}]},
+            expected_params={"Text": ROMANIAN},
+        )
+        translate.add_response(
+            "translate_text",
+            {"TranslatedText": "(en)", "SourceLanguageCode": "ro", "TargetLanguageCode": "en"},
+            expected_params={"Text": ROMANIAN, "SourceLanguageCode": "ro", "TargetLanguageCode": "en"},
+        )
+        response = translate_multi(handler, {"text": ROMANIAN, "targetLanguages": ["en", "ro"]})
+        comprehend.assert_no_pending_responses()
+        translate.assert_no_pending_responses()
+
+    assert response["statusCode"] == 200, response
+    body = json.loads(response["body"])
+    assert body["sourceLanguage"] == "ro" and body["skipped"] == ["ro"], body
+
+
+def main():
+    print("🧪 Testing /ai/pipeline and multi-target /ai/translate offline (botocore Stubber)\n")
+    handler = load_fixed_lambda()
+    tests = [
+        test_long_text_is_cut_to_comprehend_limit_for_detection,
+        test_long_text_is_cut_to_comprehend_limit_for_sentiment,
+        test_same_language_is_one_untranslated_chunk,
+        test_local_guess_is_not_the_translation_source,
+        test_sentiment_language_comes_from_comprehend,
+        test_local_guess_skips_no_targets,
+        test_comprehend_detection_skips_the_source,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test(handler)
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            client_registry.reset()
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
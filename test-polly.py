@@ -0,0 +1,196 @@
+"""
+Offline tests for the /ai/polly endpoint in fixed-lambda.py.
+
+S3 and Polly are replaced with botocore Stubber instances (plus a small fake
+Polly client for the parallel chunking test), so no AWS account is needed:
+
+    python test-polly.py
+"""
+
+import importlib.util
+import io
+import json
+import os
+import sys
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["POLLY_BUCKET"] = "test-audio-bucket"
+os.environ["AI_CACHE_FILE_ENABLED"] = "false"
+
+import boto3
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common.clients import client_registry
+from lambda_common.speech import audio_key
+
+
+def load_fixed_lambda():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixed-lambda.py")
+    spec = importlib.util.spec_from_file_location("fixed_lambda", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def polly_event(text, language="en"):
+    return {
+        "httpMethod": "POST",
+        "path": "/ai/polly",
+        "body": json.dumps({"text": text, "language": language}),
+    }
+
+
+def audio_stream(data):
+    return StreamingBody(io.BytesIO(data), len(data))
+
+
+class FakePolly:
+    """Returns the chunk text as 'audio' so concatenation order can be checked."""
+
+    def __init__(self):
+        self.calls = []
+
+    def synthesize_speech(self, **params):
+        self.calls.append(params)
+        data = params["Text"].encode("utf-8")
+        return {"AudioStream": audio_stream(data), "ContentType": "audio/mpeg"}
+
+
+def test_cache_miss_synthesizes_and_uploads(handler):
+    text = "Hello, this is a test for text to speech."
+    key = audio_key(text, "Joanna", "en", "neural", "mp3")
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    polly = boto3.client("polly", region_name="us-east-1")
+    client_registry.register("s3", s3)
+    client_registry.register("polly", polly)
+
+    with Stubber(s3) as s3_stub, Stubber(polly) as polly_stub:
+        s3_stub.add_client_error(
+            "head_object",
+            service_error_code="404",
+            http_status_code=404,
+            expected_params={"Bucket": "test-audio-bucket", "Key": key},
+        )
+        polly_stub.add_response(
+            "synthesize_speech",
+            {"AudioStream": audio_stream(b"ID3-audio"), "ContentType": "audio/mpeg", "RequestCharacters": len(text)},
+            expected_params={"Text": text, "VoiceId": "Joanna", "Engine": "neural", "OutputFormat": "mp3"},
+        )
+        s3_stub.add_response(
+            "put_object",
+            {},
+            expected_params={"Bucket": "test-audio-bucket", "Key": key, "Body": ANY, "ContentType": "audio/mpeg"},
+        )
+
+        response = handler.lambda_handler(polly_event(text), None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 200, response
+        assert body["cached"] is False
+        assert body["chunks"] == 1
+        assert key in body["audioUrl"]
+        s3_stub.assert_no_pending_responses()
+        polly_stub.assert_no_pending_responses()
+
+
+def test_cache_hit_skips_polly(handler):
+    text = "Hello again."
+    key = audio_key(text, "Lucia", "es", "neural", "mp3")
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    polly = FakePolly()
+    client_registry.register("s3", s3)
+    client_registry.register("polly", polly)
+
+    with Stubber(s3) as s3_stub:
+        s3_stub.add_response(
+            "head_object",
+            {"ContentLength": 1234, "ContentType": "audio/mpeg"},
+            expected_params={"Bucket": "test-audio-bucket", "Key": key},
+        )
+
+        response = handler.lambda_handler(polly_event(text, language="es"), None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 200, response
+        assert body["cached"] is True
+        assert body["voiceId"] == "Lucia"
+        assert polly.calls == []
+        s3_stub.assert_no_pending_responses()
+
+
+def test_long_text_is_chunked_in_order(handler):
+    os.environ["POLLY_CHUNK_CHARS"] = "40"
+    try:
+        sentences = [f"This is sentence number {i}." for i in range(12)]
+        text = " ".join(sentences)
+        key = audio_key(text, "Joanna", "en", "neural", "mp3")
+
+        s3 = boto3.client("s3", region_name="us-east-1")
+        polly = FakePolly()
+        client_registry.register("s3", s3)
+        client_registry.register("polly", polly)
+
+        uploaded = {}
+
+        def capture_body(params, **kwargs):
+            if "Body" in params:
+                uploaded["body"] = params["Body"]
+
+        s3.meta.events.register("provide-client-params.s3.PutObject", capture_body)
+
+        with Stubber(s3) as s3_stub:
+            s3_stub.add_client_error("head_object", service_error_code="404", http_status_code=404)
+            s3_stub.add_response("put_object", {}, expected_params={
+                "Bucket": "test-audio-bucket", "Key": key, "Body": ANY, "ContentType": "audio/mpeg",
+            })
+
+            response = handler.lambda_handler(polly_event(text), None)
+            body = json.loads(response["body"])
+
+            assert response["statusCode"] == 200, response
+            assert body["chunks"] == len(polly.calls) > 1
+            assert all(len(call["Text"]) <= 40 for call in polly.calls)
+            assert uploaded["body"] == text.encode("utf-8"), "chunks were not concatenated in order"
+    finally:
+        del os.environ["POLLY_CHUNK_CHARS"]
+
+
+def test_missing_text(handler):
+    response = handler.lambda_handler(polly_event(""), None)
+    assert response["statusCode"] == 400
+
+
+def main():
+    print("🧪 Testing /ai/polly offline (botocore Stubber)\n")
+    handler = load_fixed_lambda()
+    tests = [
+        test_cache_miss_synthesizes_and_uploads,
+        test_cache_hit_skips_polly,
+        test_long_text_is_chunked_in_order,
+        test_missing_text,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test(handler)
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            client_registry.reset()
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
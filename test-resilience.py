@@ -0,0 +1,174 @@
+"""
+Offline tests for deadline-aware calls, retries and circuit breakers
+(lambda_common/resilience.py) over the client registry.
+
+The registry's clients are real boto3 clients with a botocore Stubber
+attached, so calls never leave the process:
+
+    python test-resilience.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["RETRY_BASE_MS"] = "1"
+os.environ["CIRCUIT_FAILURE_THRESHOLD"] = "3"
+os.environ["CIRCUIT_RESET_SECONDS"] = "0.05"
+
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common import resilience
+from lambda_common.clients import ClientRegistry
+from lambda_common.resilience import CircuitOpenError, DeadlineExceededError, ThrottledError, breaker_for, deadline
+
+LANGUAGES = {"Languages": [{"LanguageCode": "en", "Score": 0.99}]}
+
+
+class FakeContext:
+    def __init__(self, remaining_ms=30000):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+class StubbedRegistry(ClientRegistry):
+    """Registry whose clients answer from a shared script of responses / errors."""
+
+    def __init__(self, script=(), fail_create=False):
+        super().__init__()
+        self.script = list(script)
+        self.fail_create = fail_create
+        self.stubs = []
+
+    def create(self, service, read_timeout=None):
+        if self.fail_create:
+            raise RuntimeError("could not create client")
+        client = super().create(service, read_timeout)
+        stub = Stubber(client)
+        for item in self.script:
+            if isinstance(item, str):
+                stub.add_client_error("detect_dominant_language", service_error_code=item, http_status_code=400)
+            else:
+                stub.add_response("detect_dominant_language", item)
+        stub.activate()
+        self.stubs.append(stub)
+        return client
+
+
+def detect(registry):
+    return registry.guarded("comprehend").detect_dominant_language(Text="hello")
+
+
+def test_one_client_per_service():
+    registry = StubbedRegistry([LANGUAGES, LANGUAGES])
+    deadline.start(FakeContext())
+    assert detect(registry) == LANGUAGES
+    assert detect(registry) == LANGUAGES
+    # Attribute lookup must not build a default client next to the timeout-tier one
+    assert registry.stats()["services"]["comprehend"]["created"] == 1, registry.stats()
+    assert list(registry._clients) == [("comprehend", 5)], list(registry._clients)
+
+
+def test_throttles_are_retried_then_succeed():
+    registry = StubbedRegistry(["ThrottlingException", LANGUAGES])
+    deadline.start(FakeContext())
+    assert detect(registry) == LANGUAGES
+    assert breaker_for("comprehend").state == "closed"
+
+
+def test_breaker_opens_and_refuses_calls():
+    os.environ["RETRY_MAX_ATTEMPTS"] = "1"
+    try:
+        registry = StubbedRegistry(["ThrottlingException"] * 3)
+        deadline.start(FakeContext())
+        for _ in range(3):
+            try:
+                detect(registry)
+                raise AssertionError("expected ThrottledError")
+            except ThrottledError:
+                pass
+        assert breaker_for("comprehend").state == "open"
+        try:
+            detect(registry)
+            raise AssertionError("expected CircuitOpenError")
+        except CircuitOpenError as e:
+            assert e.status_code == 503 and e.retry_after >= 1
+        registry.stubs[0].assert_no_pending_responses()
+    finally:
+        del os.environ["RETRY_MAX_ATTEMPTS"]
+
+
+def test_half_open_probe_is_settled_when_client_creation_fails():
+    breaker = breaker_for("comprehend")
+    for _ in range(breaker.failure_threshold):
+        breaker.failure()
+    time.sleep(breaker.reset_seconds)
+
+    deadline.start(FakeContext())
+    try:
+        resilience.call_with_deadline(StubbedRegistry(fail_create=True), "comprehend", "detect_dominant_language", {"Text": "hello"})
+        raise AssertionError("expected RuntimeError")
+    except RuntimeError:
+        pass
+    assert breaker.state == "open" and not breaker._probing
+
+    # After the reset period the next call is let through as a new probe
+    time.sleep(breaker.reset_seconds)
+    assert detect(StubbedRegistry([LANGUAGES])) == LANGUAGES
+    assert breaker.state == "closed"
+
+
+def test_no_call_without_budget():
+    registry = StubbedRegistry([LANGUAGES])
+    deadline.start(FakeContext(remaining_ms=600))
+    try:
+        detect(registry)
+        raise AssertionError("expected DeadlineExceededError")
+    except DeadlineExceededError as e:
+        assert e.status_code == 504
+    assert registry.stats()["created"] == 0
+
+
+def test_timeout_tier_follows_the_budget():
+    registry = StubbedRegistry([LANGUAGES])
+    deadline.start(FakeContext(remaining_ms=2000))
+    detect(registry)
+    assert list(registry._clients) == [("comprehend", 1)], list(registry._clients)
+
+
+def main():
+    print("🧪 Testing deadlines, retries and circuit breakers offline (botocore Stubber)\n")
+    tests = [
+        test_one_client_per_service,
+        test_throttles_are_retried_then_succeed,
+        test_breaker_opens_and_refuses_calls,
+        test_half_open_probe_is_settled_when_client_creation_fails,
+        test_no_call_without_budget,
+        test_timeout_tier_follows_the_budget,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            resilience.reset_state()
+            deadline.start(None)
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
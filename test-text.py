@@ -0,0 +1,127 @@
+"""
+Offline tests for the text splitter (lambda_common/text.py) and chunked
+translation (lambda_common/translation.py). Translate is replaced with a
+botocore Stubber, so no AWS account is needed:
+
+    python test-text.py
+"""
+
+import os
+import sys
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common.text import split_text, utf8_len
+from lambda_common.translation import split_for_translation, translate_long_text
+
+JAPANESE = [
+    "今日は朝から雨が降っています。",
+    "明日は休みですので、家族と一緒に出かける予定です！",
+    "来週の会議の資料はもう準備できましたか？",
+    "プロジェクトの報告書を金曜日までに提出してください。",
+]
+CHINESE = ["我们明天开会。", "请把报告发给团队！", "你准备好了吗？"]
+
+
+def check_chunks(text, chunks, max_bytes):
+    assert "".join(chunks) == text, "chunks do not add up to the text"
+    assert all(utf8_len(chunk) <= max_bytes for chunk in chunks), [utf8_len(c) for c in chunks]
+
+
+def test_japanese_splits_at_sentence_ends():
+    text = "".join(JAPANESE * 3)
+    max_bytes = 200
+    assert utf8_len(text) > max_bytes
+    chunks = split_for_translation(text, max_bytes)
+    check_chunks(text, chunks, max_bytes)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.endswith(("。", "！", "？")), f"chunk cut mid-sentence: {chunk[-10:]!r}"
+
+
+def test_chinese_splits_at_sentence_ends():
+    text = "".join(CHINESE * 5)
+    chunks = split_for_translation(text, 60)
+    check_chunks(text, chunks, 60)
+    assert all(chunk.endswith(("。", "！", "？")) for chunk in chunks), chunks
+
+
+def test_full_width_sentence_keeps_following_space():
+    text = "第一句。 第二句。\n第三句。"
+    chunks = split_text(text, 14, measure=utf8_len)
+    check_chunks(text, chunks, 14)
+    assert chunks[0] == "第一句。 ", chunks
+
+
+def test_latin_text_needs_whitespace_after_punctuation():
+    text = "Version 2.5 is out. See example.com for details! Ready?"
+    chunks = split_text(text, 25)
+    check_chunks(text, chunks, 25)
+    assert chunks[0] == "Version 2.5 is out. ", chunks
+    assert "example.com" in chunks[1], chunks
+
+
+def test_paragraphs_first_and_hard_split_last():
+    text = "First paragraph here.\n\nSecond one." + " " + "x" * 30
+    chunks = split_text(text, 24)
+    check_chunks(text, chunks, 24)
+    assert chunks[0] == "First paragraph here.\n\n", chunks
+
+
+def test_long_japanese_translation_keeps_sentences_together():
+    text = "".join(JAPANESE * 3)
+    chunks = split_for_translation(text, 200)
+    translate = boto3.client("translate", region_name="us-east-1")
+
+    with Stubber(translate) as stub:
+        # Chunks run concurrently, so responses are not tied to a particular chunk
+        for _ in chunks:
+            stub.add_response("translate_text", {
+                "TranslatedText": "[en]", "SourceLanguageCode": "ja", "TargetLanguageCode": "en",
+            })
+        seen = []
+        translate.meta.events.register(
+            "provide-client-params.translate.TranslateText", lambda params, **kwargs: seen.append(params["Text"])
+        )
+        result = translate_long_text(text, "en", source_language="ja", max_bytes=200, max_workers=1, translate=translate)
+        stub.assert_no_pending_responses()
+
+    assert result["chunks"] == len(chunks)
+    assert sorted(seen) == sorted(chunk.strip() for chunk in chunks)
+    assert all(text.endswith(("。", "！", "？")) for text in seen), seen
+
+
+def main():
+    print("🧪 Testing the text splitter and chunked translation offline (botocore Stubber)\n")
+    tests = [
+        test_japanese_splits_at_sentence_ends,
+        test_chinese_splits_at_sentence_ends,
+        test_full_width_sentence_keeps_following_space,
+        test_latin_text_needs_whitespace_after_punctuation,
+        test_paragraphs_first_and_hard_split_last,
+        test_long_japanese_translation_keeps_sentences_together,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Offline tests for request validation (lambda_common/validation.py and the
+route schemas in lambda_common/schemas.py), through fixed-lambda.py where
+the request never reaches AWS:
+
+    python test-validation.py
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["AI_CACHE_FILE_ENABLED"] = "false"
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_common import schemas
+from lambda_common.clients import client_registry
+from lambda_common.validation import ListOf, Number, Object, Schema, Text
+
+
+def load_fixed_lambda():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixed-lambda.py")
+    spec = importlib.util.spec_from_file_location("fixed_lambda", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def post(path, body):
+    return {"httpMethod": "POST", "path": path, "body": body if isinstance(body, str) else json.dumps(body)}
+
+
+def fields(errors):
+    return [field for field, _ in errors]
+
+
+def test_fields_report_every_problem(handler):
+    schema = Schema({
+        "text": Text(required=True, max_bytes=5),
+        "mode": Text(choices=("a", "b")),
+        "items": ListOf(Object({"key": Text(required=True)}), max_items=2),
+    })
+    assert schema.validate({"text": "short", "mode": "a", "items": [{"key": "k"}]}) == []
+    errors = schema.validate({"text": "ünïcödé", "mode": "c", "items": [{"key": "k"}, {}]})
+    assert fields(errors) == ["text", "mode", "items[1].key"], errors
+    assert fields(schema.validate({"items": [{}, {}, {}]})) == ["text", "items"]
+
+
+def test_numbers_reject_non_finite_values(handler):
+    schema = Schema({"count": Number(minimum=1, maximum=10, integer=True), "ratio": Number()})
+    assert schema.validate({"count": "3", "ratio": 0.5}) == []
+    for value in (float("inf"), float("-inf"), float("nan"), "inf", "nan", "1e999"):
+        assert fields(schema.validate({"count": value})) == ["count"], value
+        assert fields(schema.validate({"ratio": value})) == ["ratio"], value
+    assert fields(schema.validate({"count": 10 ** 400})) == ["count"]
+    assert fields(schema.validate({"count": True})) == ["count"]
+
+
+def test_non_finite_number_is_a_400(handler):
+    for raw in ("1e999", "-1e999", "NaN", "Infinity"):
+        response = handler.lambda_handler(post("/ai/image-analyze", f'{{"bucket": "b", "key": "k.jpg", "maxLabels": {raw}}}'), None)
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 400, (raw, response)
+        assert body["errors"][0]["field"] == "maxLabels", body
+
+
+def test_integer_strings_must_convert_with_int(handler):
+    schema = Schema({"count": Number(integer=True)})
+    for value in ("5", " 5 ", 5.0):
+        assert schema.validate({"count": value}) == [], value
+    for value in ("5.0", "5.5", "1e2"):
+        assert fields(schema.validate({"count": value})) == ["count"], value
+
+    # The same strings reach image.py's int(maxLabels) from a JSON body and from a raw upload's query
+    upload = {
+        "httpMethod": "POST",
+        "path": "/ai/image-analyze",
+        "headers": {"Content-Type": "image/jpeg"},
+        "isBase64Encoded": True,
+        "body": "/9j/4AAQSkZJRg==",
+        "queryStringParameters": {"maxLabels": "5.0"},
+    }
+    for event in (post("/ai/image-analyze", {"bucket": "b", "key": "k.jpg", "maxLabels": "5.0"}), upload):
+        response = handler.lambda_handler(event, None)
+        assert response["statusCode"] == 400, response
+        assert json.loads(response["body"])["errors"][0]["field"] == "maxLabels", response
+    assert client_registry.stats()["created"] == 0
+
+
+def test_oversized_text_is_a_400_before_any_call(handler):
+    text = "x" * (schemas.COMPREHEND_MAX_TEXT_BYTES + 1)
+    response = handler.lambda_handler(post("/ai/analyze", {"text": text}), None)
+    assert response["statusCode"] == 400, response
+    assert client_registry.stats()["created"] == 0
+
+
+def test_oversized_body_is_a_413(handler):
+    body = json.dumps({"text": "x" * schemas.TEXT_ANALYSIS.max_body_bytes})
+    response = handler.lambda_handler(post("/ai/analyze", body), None)
+    assert response["statusCode"] == 413, response
+
+
+def test_binary_upload_query_is_validated(handler):
+    event = {
+        "httpMethod": "POST",
+        "path": "/ai/image-analyze",
+        "headers": {"Content-Type": "image/jpeg"},
+        "isBase64Encoded": True,
+        "body": "/9j/4AAQSkZJRg==",
+    }
+    for query, field in (({"maxLabels": "abc"}, "maxLabels"), ({"minConfidence": "inf"}, "minConfidence"),
+                         ({"features": "labels,faces"}, "features[1]")):
+        response = handler.lambda_handler(dict(event, queryStringParameters=query), None)
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 400, (query, response)
+        assert body["errors"][0]["field"] == field, body
+    assert client_registry.stats()["created"] == 0
+
+
+def test_oversized_batch_item_fails_alone(handler):
+    texts = ["Great work on the report.", "x" * (schemas.COMPREHEND_MAX_TEXT_BYTES + 1), "Thanks for the help."]
+    comprehend = boto3.client("comprehend", region_name="us-east-1")
+    client_registry.register("comprehend", comprehend)
+
+    with Stubber(comprehend) as stub:
+        stub.add_response(
+            "batch_detect_sentiment",
+            {"ResultList": [
+                {"Index": i, "Sentiment": "POSITIVE", "SentimentScore": {"Positive": 0.9, "Negative": 0.0, "Neutral": 0.1, "Mixed": 0.0}}
+                for i in range(2)
+            ], "ErrorList": []},
+            expected_params={"TextList": [texts[0], texts[2]], "LanguageCode": "en"},
+        )
+        response = handler.lambda_handler(post("/ai/analyze/batch", {"texts": texts}), None)
+        stub.assert_no_pending_responses()
+
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200, response
+    assert (body["succeeded"], body["failed"]) == (2, 1), body
+    assert "error" in body["results"][1] and "error" not in body["results"][0], body
+
+
+def test_language_codes(handler):
+    assert schemas.TRANSLATION.validate({"text": "hola", "targetLanguage": "zh-TW"}) == []
+    assert fields(schemas.TRANSLATION.validate({"text": "hola", "targetLanguage": "spanish"})) == ["targetLanguage"]
+    # "auto" is a valid source (Translate detects it) but not a target
+    for schema in (schemas.TRANSLATION, schemas.PIPELINE):
+        assert schema.validate({"text": "hola", "sourceLanguage": "auto"}) == []
+    assert fields(schemas.TRANSLATION.validate({"text": "hola", "targetLanguage": "auto"})) == ["targetLanguage"]
+
+
+def main():
+    print("🧪 Testing request validation offline\n")
+    handler = load_fixed_lambda()
+    tests = [
+        test_fields_report_every_problem,
+        test_numbers_reject_non_finite_values,
+        test_non_finite_number_is_a_400,
+        test_integer_strings_must_convert_with_int,
+        test_oversized_text_is_a_400_before_any_call,
+        test_oversized_body_is_a_413,
+        test_binary_upload_query_is_validated,
+        test_oversized_batch_item_fails_alone,
+        test_language_codes,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test(handler)
+            print(f"   ✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {type(e).__name__}: {e}")
+        finally:
+            client_registry.reset()
+
+    print(f"\n📊 SUMMARY: {len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())